@@ -0,0 +1,138 @@
+"""
+AGGREGATE CUBE
+Precomputed count/sum cube behind the KPI cards, 9-box grid, bar chart and summary export
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Cube dimensions (all must be FilterIndex columns); box_category stays as the output axis
+CUBE_DIMENSIONS = ['department', 'role_level', 'education_level', 'promoted', 'box_category']
+
+# Equal-width buckets over the potential range
+N_POTENTIAL_BUCKETS = 32
+
+# Measures summed per cell
+MEASURES = ['count', 'promoted', 'potential_sum', 'performance_sum']
+
+
+# ============================================================
+# AGGREGATE CUBE
+# ============================================================
+
+class AggregateCube:
+    """Dense cube of measures keyed by the filter dimensions and a potential bucket"""
+
+    def __init__(self, df, index, n_buckets=N_POTENTIAL_BUCKETS):
+        self.index = index
+        self.box_values = index.values['box_category']
+
+        # Per-row measures, kept for partial buckets and row fallbacks
+        self.row_measures = np.column_stack([
+            np.ones(len(df)),
+            df['promoted'].to_numpy(dtype=np.float64),
+            df['potential'].to_numpy(dtype=np.float64),
+            df['performance_rating'].to_numpy(dtype=np.float64)
+        ])
+
+        # Bucket edges at the stored potential precision
+        low, high = index.range_sorted[0], index.range_sorted[-1]
+        self.edges = np.linspace(low, high, n_buckets + 1).astype(index.range_sorted.dtype)
+        potential = df['potential'].to_numpy()
+        buckets = np.clip(np.searchsorted(self.edges, potential, side='right') - 1, 0, n_buckets - 1)
+
+        # One bincount per measure over the flattened cell id
+        self.shape = tuple(len(index.values[col]) for col in CUBE_DIMENSIONS) + (n_buckets,)
+        cells = np.ravel_multi_index(
+            tuple(index.codes[col] for col in CUBE_DIMENSIONS) + (buckets,), self.shape
+        )
+        n_cells = int(np.prod(self.shape))
+        self.cube = np.stack([
+            np.bincount(cells, weights=self.row_measures[:, k], minlength=n_cells).reshape(self.shape)
+            for k in range(len(MEASURES))
+        ])
+
+    def _to_frame(self, totals):
+        """Wrap a (n_boxes, n_measures) array as the per-box summary frame"""
+        summary = pd.DataFrame(totals, index=pd.Index(self.box_values, name='box_category'), columns=MEASURES)
+        for col in ['count', 'promoted']:
+            summary[col] = np.rint(summary[col]).astype(np.int64)
+        return summary
+
+    def summarize_rows(self, rows):
+        """Per-box measures computed directly from a row-index array"""
+        box_codes = self.index.codes['box_category'][rows]
+        totals = np.column_stack([
+            np.bincount(box_codes, weights=self.row_measures[rows, k], minlength=len(self.box_values))
+            for k in range(len(MEASURES))
+        ])
+        return self._to_frame(totals)
+
+    def summarize(self, conditions, value_range=None, rows=None):
+        """Per-box measures for a filter state, summed from cube cells
+
+        Falls back to row data for filters outside the cube (ID lists) and for
+        the partial buckets at the edges of value_range.
+        """
+        if any(selected for col, selected in conditions.items() if col not in CUBE_DIMENSIONS):
+            if rows is None:
+                rows = self.index.select(conditions, value_range)
+            return self.summarize_rows(rows)
+
+        # Restrict each dimension axis to the selected codes
+        cube = self.cube
+        selected_codes = {}
+        for axis, col in enumerate(CUBE_DIMENSIONS):
+            selected = conditions.get(col)
+            if selected:
+                selected_codes[col] = self.index.value_codes(col, selected)
+                cube = cube.take(selected_codes[col], axis=axis + 1)
+
+        # Buckets fully inside the range come from the cube
+        n_buckets = self.shape[-1]
+        range_sorted = self.index.range_sorted
+        first, last = 0, n_buckets
+        if value_range is not None:
+            low, high = (range_sorted.dtype.type(v) for v in value_range)
+            first = int(np.searchsorted(self.edges, low, side='left'))
+            last = int(np.searchsorted(self.edges[1:], high, side='right'))
+
+        box_axis = len(CUBE_DIMENSIONS)
+        totals = np.zeros((len(self.box_values), len(MEASURES)))
+        if first < last:
+            sub_cube = cube[..., first:last]
+            reduce_axes = tuple(a for a in range(1, sub_cube.ndim) if a != box_axis)
+            box_totals = sub_cube.sum(axis=reduce_axes).T
+            if 'box_category' in selected_codes:
+                totals[selected_codes['box_category']] = box_totals
+            else:
+                totals = box_totals
+
+        if value_range is None:
+            return self._to_frame(totals)
+
+        # Partial buckets at the slider edges come from row data
+        start = np.searchsorted(range_sorted, low, side='left')
+        stop = np.searchsorted(range_sorted, high, side='right')
+        if first < last:
+            segments = [(start, max(start, np.searchsorted(range_sorted, self.edges[first], side='left')))]
+            if last < n_buckets:
+                segments.append((min(stop, np.searchsorted(range_sorted, self.edges[last], side='left')), stop))
+        else:
+            segments = [(start, stop)]
+
+        edge_rows = np.concatenate([self.index.range_order[a:b] for a, b in segments])
+        keep = np.ones(len(edge_rows), dtype=bool)
+        for col, codes in selected_codes.items():
+            keep &= np.isin(self.index.codes[col][edge_rows], codes)
+        totals = totals + self.summarize_rows(edge_rows[keep]).to_numpy(dtype=np.float64)
+
+        return self._to_frame(totals)
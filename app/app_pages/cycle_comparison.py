@@ -0,0 +1,72 @@
+"""
+CYCLE COMPARISON
+Box transitions and employee movement between two stored review cycles
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import load_shared_cache
+from charts import create_transition_heatmap
+from history_store import history_dir, list_cycles, cycle_parts, compare_cycles
+from tracing import fragment
+
+
+@fragment('fragment/cycle_comparison')
+def render_cycle_comparison():
+    """Compare two stored review cycles: transition matrix and employee movement"""
+    root = history_dir()
+    cycles = list_cycles(root)
+    
+    st.subheader("Cycle Comparison")
+    if len(cycles) < 2:
+        st.info(
+            "At least two stored review cycles are needed. After each scoring run, append the snapshot with "
+            "`python app/history_store.py append app/final_data.csv --cycle YYYY-MM-DD`."
+        )
+        return
+    
+    col_before, col_after = st.columns(2)
+    with col_before:
+        before = st.selectbox('Earlier cycle', cycles, index=len(cycles) - 2)
+    with col_after:
+        after = st.selectbox('Later cycle', cycles, index=len(cycles) - 1)
+    
+    # Part file names change whenever a cycle is appended to, so they version the cache entry
+    state = {
+        'before': before,
+        'after': after,
+        'parts': [p.name for p in cycle_parts(before, root) + cycle_parts(after, root)]
+    }
+    comparison = load_shared_cache().get_or_create(
+        'cycle_comparison', state, lambda: compare_cycles(before, after, root)
+    )
+    movement = comparison['movement']
+    moved = movement[movement['box_before'] != movement['box_after']]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(label="In Both Cycles", value=f"{comparison['joined']:,}")
+        st.caption(f"{comparison['left']:,} left, {comparison['joined_new']:,} new")
+    with col2:
+        st.metric(label="Changed Box", value=f"{len(moved):,}")
+        st.caption(f"{len(moved)/max(len(movement), 1)*100:.1f}% of matched EEs")
+    with col3:
+        st.metric(label="Potential Band Up", value=f"{int((movement['potential_move'] > 0).sum()):,}")
+    with col4:
+        st.metric(label="Potential Band Down", value=f"{int((movement['potential_move'] < 0).sum()):,}")
+    
+    st.subheader("Box Transitions")
+    st.plotly_chart(create_transition_heatmap(comparison['matrix']), width='stretch')
+    
+    st.subheader("Employee Movement")
+    max_rows = 1000
+    movers = moved.sort_values('potential_change', key=abs, ascending=False).head(max_rows)
+    st.dataframe(movers, width='stretch', height=400, hide_index=True)
+    if len(moved) > max_rows:
+        st.caption(f"Showing the {max_rows:,} largest potential changes of {len(moved):,} movers")
+
+
+render_cycle_comparison()
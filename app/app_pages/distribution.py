@@ -0,0 +1,25 @@
+"""
+9-BOX DISTRIBUTION
+Employees per 9-box category for the sidebar selection
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import current_selection, box_summary
+from charts import create_box_distribution
+from tracing import span, cache_lookup, figure_bytes
+
+
+selection = current_selection()
+category_counts = box_summary(selection)['count']
+
+st.subheader("9-Box Category Distribution")
+if category_counts.sum() > 0:
+    fig_dist = cache_lookup(selection['cache'], 'fig_dist', selection['state'], lambda: create_box_distribution(category_counts))
+    with span('render/box_distribution', bytes=lambda: figure_bytes(fig_dist)):
+        st.plotly_chart(fig_dist, width='stretch')
+else:
+    st.info("No employees match the current filters.")
@@ -0,0 +1,60 @@
+"""
+EMPLOYEE TABLE
+Sorted, paged employee rows for the sidebar selection
+
+Only the visible page is formatted and sent to the browser. Sorting and
+paging rerun this fragment alone, not the sidebar or the page around it.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import current_selection, load_table_view
+from table_view import COLUMN_LABELS, PAGE_SIZES
+from tracing import span, frame_bytes, fragment
+
+
+@fragment('fragment/employee_table')
+def render_employee_table(snapshot, scoring, rows):
+    """Sort / page controls and the current page of the selected rows"""
+    with span('load_table_view'):
+        table_view = load_table_view(snapshot, scoring)
+    sort_options = ['(none)'] + [COLUMN_LABELS.get(col, col) for col in table_view.columns]
+
+    col_sort, col_dir, col_size, col_page = st.columns([3, 2, 2, 2])
+    with col_sort:
+        sort_label = st.selectbox('Sort by', sort_options)
+    with col_dir:
+        descending = st.toggle('Descending', value=False)
+    with col_size:
+        page_size = st.selectbox('Rows per page', PAGE_SIZES, index=1)
+
+    n_pages = max((len(rows) - 1) // page_size + 1, 1)
+    with col_page:
+        page_number = st.number_input('Page', min_value=1, max_value=n_pages, value=1, step=1)
+
+    sort_by = None if sort_label == '(none)' else table_view.columns[sort_options.index(sort_label) - 1]
+    with span('table/page', rows_in=len(rows)) as table_page:
+        page_styler, column_config = table_view.page(
+            rows,
+            page=page_number - 1,
+            page_size=page_size,
+            sort_by=sort_by,
+            ascending=not descending
+        )
+        table_page.set(rows_out=len(page_styler.data))
+
+    with span('render/table', bytes=lambda: frame_bytes(page_styler.data)):
+        st.dataframe(page_styler, column_config=column_config, width='stretch', height=400)
+    first_row = (page_number - 1) * page_size
+    st.caption(f"Showing {first_row + 1:,}-{min(first_row + page_size, len(rows)):,} of {len(rows):,} employees (page {page_number} of {n_pages})")
+
+
+selection = current_selection()
+st.subheader("Detailed Employee Data")
+if len(selection['rows']):
+    render_employee_table(selection['snapshot'], selection['scoring'], selection['rows'])
+else:
+    st.info("No employees match the current filters.")
@@ -0,0 +1,53 @@
+"""
+EXPORT DATA
+Downloads of the selected employees and of the per-box summary
+
+Files are built only when a button is clicked; switching formats reruns
+this fragment alone.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import current_selection, box_summary
+from export import EXPORT_FORMATS, export_rows, summary_stats_frame
+from tracing import traced, fragment
+
+
+@fragment('fragment/export')
+def render_export(df, rows, summary, file_tag):
+    """Format choice and the two download buttons"""
+    export_format = st.radio('Format', list(EXPORT_FORMATS), horizontal=True)
+    extension, mime = EXPORT_FORMATS[export_format]
+
+    col_export1, col_export2 = st.columns(2)
+
+    with col_export1:
+        # Export filtered data: built in chunks only when the button is clicked
+        st.download_button(
+            label=f"Download Filtered Data ({export_format})",
+            data=traced('export')(lambda: export_rows(df, rows, export_format)),
+            file_name=f"9box_filtered_data_{file_tag}.{extension}",
+            mime=mime,
+            on_click='ignore',
+            help="Download the currently filtered employee data"
+        )
+
+    with col_export2:
+        # Export summary statistics
+        st.download_button(
+            label="Download Summary Stats (CSV)",
+            data=lambda: summary_stats_frame(summary).to_csv(index=False).encode('utf-8'),
+            file_name="9box_summary_statistics.csv",
+            mime="text/csv",
+            on_click='ignore',
+            help="Download aggregated statistics by 9-box category"
+        )
+
+
+selection = current_selection()
+st.subheader("Export Data")
+st.caption(f"{len(selection['rows']):,} employees in the current selection")
+render_export(selection['df'], selection['rows'], box_summary(selection), selection['file_tag'])
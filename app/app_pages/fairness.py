@@ -0,0 +1,84 @@
+"""
+FAIRNESS AUDIT
+Four-fifths ratios, rate tests and calibration gaps for every slice of the whole workforce
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import SNAPSHOT_HASH, current_selection, get_data
+from fairness_audit import AUDIT_DIMENSIONS, FOUR_FIFTHS, SIGNIFICANCE, MIN_REFERENCE_SIZE, fairness_audit
+from tracing import span, fragment
+
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def build_fairness_audit(snapshot, scoring, dimensions):
+    """Run the fairness audit for a scoring variant or extra slice attributes"""
+    return fairness_audit(get_data(snapshot, scoring), dimensions)
+
+def load_fairness_audit(snapshot, scoring=None, dimensions=tuple(AUDIT_DIMENSIONS)):
+    """Fairness audit for the snapshot (and scoring variant / slice attributes)"""
+    if scoring is None and list(dimensions) == AUDIT_DIMENSIONS:
+        return snapshot.audit()
+    return build_fairness_audit(snapshot, scoring, dimensions)
+
+@fragment('fragment/fairness_audit')
+def render_fairness_audit(snapshot, scoring):
+    """Four-fifths ratios, rate tests and calibration gaps for every slice of the whole workforce"""
+    col_extra, col_grouping, col_min, col_flagged = st.columns([3, 3, 1, 1])
+    with col_extra:
+        extra = st.multiselect('Extra slice attributes', snapshot.audit_candidates(), key='audit_extra')
+    audit = load_fairness_audit(snapshot, scoring, tuple(AUDIT_DIMENSIONS + extra))
+    with col_grouping:
+        grouping = st.selectbox('Slices', ['All'] + list(audit['grouping'].unique()), key='audit_grouping')
+    with col_min:
+        min_size = st.number_input('Min size', min_value=1, value=MIN_REFERENCE_SIZE, step=5, key='audit_min_size')
+    with col_flagged:
+        flagged_only = st.toggle('Flagged only', value=True, key='audit_flagged')
+
+    view = audit[audit['n'] >= min_size]
+    if grouping != 'All':
+        view = view[view['grouping'] == grouping]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Slices Audited", f"{len(view):,}")
+    col2.metric("Below Four-Fifths", f"{int(view['four_fifths'].sum()):,}")
+    col3.metric("Rate Differences", f"{int((view['rate_q'] < SIGNIFICANCE).sum()):,}")
+    col4.metric("Calibration Gaps", f"{int((view['gap_q'] < SIGNIFICANCE).sum()):,}")
+    st.caption(
+        f"Whole workforce, not the sidebar filters. Impact ratio: promotion rate over the highest rate in the same "
+        f"grouping (slices of {MIN_REFERENCE_SIZE}+), flagged below {FOUR_FIFTHS:.0%}. Rate differences test each slice "
+        f"against everyone else and calibration gaps test actual promotions against the model's expectation, "
+        f"both at q < {SIGNIFICANCE} (Benjamini-Hochberg)"
+    )
+
+    if flagged_only:
+        view = view[view['flagged']]
+    columns = ['grouping', *audit.columns[1:audit.columns.get_loc('n')], 'n', 'promotion_rate', 'impact_ratio',
+               'predicted_rate', 'predicted_impact_ratio', 'expected_rate', 'gap', 'rate_q', 'gap_q']
+    st.dataframe(
+        view.sort_values('impact_ratio')[columns],
+        column_config={
+            'grouping': 'Grouping',
+            'n': st.column_config.NumberColumn('EEs', format='%d'),
+            'promotion_rate': st.column_config.NumberColumn('Promotion Rate', format='percent'),
+            'impact_ratio': st.column_config.NumberColumn('Impact Ratio', format='%.2f'),
+            'predicted_rate': st.column_config.NumberColumn('Predicted Rate', format='percent'),
+            'predicted_impact_ratio': st.column_config.NumberColumn('Predicted Impact Ratio', format='%.2f'),
+            'expected_rate': st.column_config.NumberColumn('Expected Rate', format='percent'),
+            'gap': st.column_config.NumberColumn('Actual - Expected', format='percent'),
+            'rate_q': st.column_config.NumberColumn('Rate q', format='%.4f'),
+            'gap_q': st.column_config.NumberColumn('Gap q', format='%.4f')
+        },
+        hide_index=True,
+        width='stretch',
+        height=400
+    )
+
+
+selection = current_selection()
+st.subheader("Fairness Audit")
+with span('fairness_audit'):
+    render_fairness_audit(selection['snapshot'], selection['scoring'])
@@ -0,0 +1,73 @@
+"""
+METHODOLOGY
+How the grid is built, the model's validation report and the business case
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import pandas as pd
+import streamlit as st
+
+from dashboard import current_selection
+
+
+def render_model_uncertainty(validation):
+    """Bootstrap coefficient intervals and k-fold metrics from the validation report"""
+    with st.expander("Model Uncertainty"):
+        cv_mean = validation['cv_mean']
+        col1, col2, col3 = st.columns(3)
+        col1.metric("CV Recall", f"{cv_mean['recall']:.1%}")
+        col2.metric("CV Precision", f"{cv_mean['precision']:.1%}")
+        col3.metric("CV F2", f"{cv_mean['f2']:.3f}")
+        st.caption(
+            f"{len(validation['cv_folds'])}-fold cross-validation at the prediction threshold; "
+            f"{validation['ci_level']:.0%} intervals from {validation['n_bootstrap']:,} bootstrap refits"
+        )
+        failed_refits, failed_folds = validation.get('n_bootstrap_failed', 0), validation.get('cv_failed_folds', 0)
+        if failed_refits or failed_folds:
+            st.caption(f"Dropped {failed_refits:,} bootstrap refits and {failed_folds} folds whose fit failed (singular or separated)")
+        intervals = pd.DataFrame(validation['coefficients'])
+        st.dataframe(
+            intervals,
+            column_config={
+                'variable': 'Variable',
+                'estimate': st.column_config.NumberColumn('Estimate', format='%.4f'),
+                'boot_se': st.column_config.NumberColumn('Bootstrap SE', format='%.4f'),
+                'ci_low': st.column_config.NumberColumn('CI Low', format='%.4f'),
+                'ci_high': st.column_config.NumberColumn('CI High', format='%.4f')
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+
+st.markdown("### Methodology")
+st.markdown("""
+**9-Box Classification:** Employees are positioned based on their performance ratings (1-5 scale) 
+and model-predicted promotion potential scores. The grid identifies succession candidates, 
+development priorities, and retention risks across nine distinct talent segments.
+
+**Succession Planning Framework:** This tool enables data-driven succession decisions by 
+highlighting high-potential talent, identifying skill gaps, and prioritizing development 
+investments based on both current performance and future leadership potential.
+""")
+
+validation = current_selection()['snapshot'].validation
+if validation is not None:
+    render_model_uncertainty(validation)
+
+st.markdown("---")
+
+st.markdown("### Business Impact")
+st.markdown("""
+This dashboard enables HR leaders and executives to make data-driven succession planning decisions by:
+
+**🎯 Identifying Leadership Gaps:** Quickly spot critical roles lacking ready successors and prioritize development investments where they matter most.
+
+**📈 Optimizing Talent Development:** Focus coaching and training resources on high-potential employees who will deliver the greatest organizational impact.
+
+**⚠️ Mitigating Succession Risk:** Proactively address potential leadership shortfalls before they become critical business disruptions.
+
+**💡 Strategic Workforce Planning:** Use objective performance and potential data to build robust succession pipelines across all organizational levels.
+""")
@@ -0,0 +1,60 @@
+"""
+ORG DRILL-DOWN
+Whole-org rollups for the selected managers and the managers reporting to them
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import pandas as pd
+import streamlit as st
+
+from dashboard import current_selection
+from scoring import BOX_LABELS
+from tracing import span
+
+
+def render_org_drilldown(org_tree, selected_mgr_ids):
+    """Subtree rollups for the selected managers and the managers reporting to them"""
+    if selected_mgr_ids:
+        sub_managers = set(org_tree.managers())
+        managers = list(selected_mgr_ids) + [
+            report for mgr in selected_mgr_ids for report in org_tree.direct_reports(mgr)
+            if report in sub_managers and report not in selected_mgr_ids
+        ]
+    else:
+        rollup = org_tree.rollup()
+        managers = rollup.loc[rollup['depth'] == 0, 'manager_id'].tolist()
+
+    rollup = org_tree.rollup(managers)
+    headcount = rollup['headcount'].clip(lower=1)
+    high_potential = rollup[[label for label in BOX_LABELS if label.startswith('High Potential')]].sum(axis=1)
+    drilldown = pd.DataFrame({
+        'Manager': rollup['manager_id'],
+        'Reports To': [(org_tree.chain(mgr)[-2:-1] or ['—'])[0] for mgr in rollup['manager_id']],
+        'Direct Reports': rollup['direct_reports'],
+        'Org Headcount': rollup['headcount'],
+        'Promotion Rate': rollup['promotion_rate'],
+        'High Potential': high_potential / headcount,
+        'Stars': rollup['High Potential / High Performance'] / headcount
+    })
+    st.dataframe(
+        drilldown,
+        column_config={
+            'Promotion Rate': st.column_config.NumberColumn(format='percent'),
+            'High Potential': st.column_config.NumberColumn(format='percent'),
+            'Stars': st.column_config.NumberColumn(format='percent')
+        },
+        hide_index=True,
+        width='stretch'
+    )
+    st.caption(
+        "Whole-org rollups (all levels below each manager, before the other filters). "
+        + ("Selected managers first, then managers reporting to them." if selected_mgr_ids else "Top-level organizations shown; select managers in the sidebar to drill down.")
+    )
+
+
+selection = current_selection()
+st.subheader("Org Drill-down")
+with span('org_drilldown'):
+    render_org_drilldown(selection['org_tree'], selection['selected_mgr_ids'])
@@ -0,0 +1,102 @@
+"""
+9-BOX OVERVIEW
+Headline counts and the 9-box grid for the sidebar selection
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import current_selection, box_summary
+from charts import create_9box_grid
+from scoring import BAND_COLUMNS, Q_LOW, Q_HIGH, potential_cutoffs, crosses_cutoff
+from tracing import span, cache_lookup, figure_bytes
+
+
+def count_band_crossings(df, rows, q_low, q_high):
+    """Selected employees whose bootstrap potential band spans a potential cutoff"""
+    cutoffs = potential_cutoffs(df['potential'], q_low, q_high)
+    low = df['potential_low'].to_numpy()[rows]
+    high = df['potential_high'].to_numpy()[rows]
+    return int(crosses_cutoff(low, high, cutoffs).sum())
+
+
+# Header
+st.markdown('<div class="main-header">9-Box Talent Classification Dashboard</div>',
+            unsafe_allow_html=True)
+
+st.markdown("""
+**Interactive tool for exploring promotion model outputs and talent segmentation**
+
+This dashboard visualizes the results of a logistic regression model that predicts 
+promotion probability based on merit-based performance metrics. Employees are classified 
+into a 9-box grid based on **Performance Rating** (x-axis) and **Promotion Potential** (y-axis).
+""")
+st.markdown("---")
+
+selection = current_selection()
+df, rows, cache, state = selection['df'], selection['rows'], selection['cache'], selection['state']
+summary = box_summary(selection)
+category_counts = summary['count']
+total_count = int(category_counts.sum())
+
+# ============================================================
+# SUMMARY METRICS
+# ============================================================
+col1, col2, col3, col4 = st.columns(4)
+selected_total = max(total_count, 1)
+
+with col1:
+    st.metric(
+    label="Total Employees",
+    value=f"{total_count:,}"
+    )
+    st.caption(f"{total_count/len(df)*100:.1f}% of Eligible EEs")
+
+with col2:
+    promoted_count = int(summary['promoted'].sum())
+    st.metric(
+        label="Actually Promoted",
+        value=f"{promoted_count:,}"
+    )
+    st.caption(f"{promoted_count/len(df)*100:.1f}% of Selected EEs")
+
+with col3:
+    high_pot_count = int(category_counts[category_counts.index.str.startswith('High Potential')].sum())
+    st.metric(
+        label="High Potential Talent",
+        value=f"{high_pot_count:,}"
+    )
+    st.caption(f"{high_pot_count/selected_total*100:.1f}% of Selected EEs")
+
+with col4:
+    stars_count = int(category_counts.get('High Potential / High Performance', 0))
+    st.metric(
+        label="Stars (High/High)",
+        value=f"{stars_count:,}"
+    )
+    st.caption(f"{stars_count/selected_total*100:.1f}% of Selected EEs")
+
+st.markdown("---")
+
+# ============================================================
+# 9-BOX GRID
+# ============================================================
+if total_count > 0:
+    st.subheader("9-Box Grid")
+    fig_grid = cache_lookup(cache, 'fig_grid', state, lambda: create_9box_grid(category_counts))
+    with span('render/9box_grid', bytes=lambda: figure_bytes(fig_grid)):
+        st.plotly_chart(fig_grid, width='stretch')
+
+    # Employees whose bootstrap potential band spans a Low/Moderate/High cutoff
+    if all(col in df.columns for col in BAND_COLUMNS):
+        model, scoring = selection['snapshot'].model, selection['scoring']
+        if scoring:
+            q_low, q_high = scoring[1:]
+        else:
+            q_low, q_high = (model['q_low'], model['q_high']) if model else (Q_LOW, Q_HIGH)
+        n_uncertain = cache_lookup(cache, 'band_crossings', state, lambda: count_band_crossings(df, rows, q_low, q_high), rows_in=len(rows))
+        st.caption(f"{n_uncertain:,} of {total_count:,} selected employees have a 95% potential band that crosses a potential cutoff")
+else:
+    st.info("No employees match the current filters.")
@@ -0,0 +1,35 @@
+"""
+SALARY DISTRIBUTION
+Salary quartiles and outliers for the sidebar selection, from the per-cell sketches
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import streamlit as st
+
+from dashboard import current_selection, load_salary_sketches
+from charts import create_salary_box
+from tracing import span, cache_lookup, figure_bytes
+
+
+selection = current_selection()
+snapshot, scoring, rows = selection['snapshot'], selection['scoring'], selection['rows']
+cache, state = selection['cache'], selection['state']
+
+st.subheader("Salary Distribution")
+salary_summary = cache_lookup(
+    cache, 'salary_summary', state,
+    lambda: load_salary_sketches(snapshot, scoring).summarize(selection['conditions'], selection['potential_range'], rows=rows),
+    rows_in=len(rows)
+) if len(rows) else None
+if salary_summary is not None:
+    fig_salary = cache_lookup(cache, 'fig_salary', state, lambda: create_salary_box(salary_summary))
+    with span('render/salary_box', bytes=lambda: figure_bytes(fig_salary)):
+        st.plotly_chart(fig_salary, width='stretch')
+    if salary_summary['approximate']:
+        st.caption(f"Quartiles are approximate: binned over {salary_summary['n']:,} salaries")
+    if salary_summary['n_outliers'] > len(salary_summary['outliers']):
+        st.caption(f"Showing {len(salary_summary['outliers']):,} of {salary_summary['n_outliers']:,} outliers")
+else:
+    st.write("No salary data available for current filters.")
@@ -0,0 +1,92 @@
+"""
+THRESHOLD TUNER
+Precision / recall / F-beta over every threshold for the selected employees
+
+The tuner controls rerun this fragment alone; the sorted confusion curve
+is cached per filter state.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import pandas as pd
+import streamlit as st
+
+from dashboard import current_selection
+from charts import create_threshold_curve
+from threshold_sweep import (
+    F_BETA, UTILITY_WEIGHTS, OBJECTIVES,
+    confusion_curve, segment_curves, curve_metrics, metrics_at, best_threshold,
+    segment_metrics_at, segment_operating_points
+)
+from tracing import span, cache_lookup, fragment
+
+
+@fragment('fragment/threshold_tuner')
+def render_threshold_tuner(df, rows, state, cache, default_threshold):
+    """Sweep every threshold over the selected employees and report the chosen operating point"""
+    col_threshold, col_beta, col_objective, col_segment = st.columns([3, 1, 2, 2])
+    with col_threshold:
+        threshold = st.slider('Threshold', 0.01, 0.99, default_threshold, step=0.005, key='tuner_threshold')
+    with col_beta:
+        beta = st.number_input('F-beta', min_value=0.25, max_value=5.0, value=float(F_BETA), step=0.25)
+    with col_objective:
+        objective = st.selectbox('Optimize', OBJECTIVES)
+    with col_segment:
+        segment_label = st.selectbox('Segment by', ['None', 'Department', 'Role Level'])
+
+    with st.popover("Utility weights"):
+        weights = {
+            outcome: st.number_input(label, value=UTILITY_WEIGHTS[outcome], step=0.05, key=f"utility_{outcome}")
+            for outcome, label in [('tp', 'True positive'), ('fp', 'False positive'), ('fn', 'False negative'), ('tn', 'True negative')]
+        }
+
+    # The sorted confusion curve is cached per filter state; metrics are cheap to recompute
+    scores = df['potential'].to_numpy()
+    labels = df['promoted'].to_numpy()
+    curve = cache_lookup(cache, 'threshold_curve', state, lambda: confusion_curve(scores[rows], labels[rows]), rows_in=len(rows))
+    curve = curve_metrics(curve, beta, weights)
+    chosen = metrics_at(curve, threshold)
+    best = best_threshold(curve, objective)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Precision", f"{chosen['precision']:.1%}")
+    col2.metric("Recall", f"{chosen['recall']:.1%}")
+    col3.metric(f"F{beta:g}", f"{chosen['f_beta']:.3f}")
+    col4.metric("Flagged", f"{int(chosen['tp'] + chosen['fp']):,}")
+    st.caption(
+        f"Best {objective} over the selection: {best[objective]:.3f} at threshold {best['threshold']:.3f} "
+        f"(utility {chosen['utility']:,.1f} at the chosen threshold)"
+    )
+    st.plotly_chart(create_threshold_curve(curve, threshold, best['threshold']), width='stretch')
+
+    if segment_label != 'None':
+        segment_col = 'department' if segment_label == 'Department' else 'role_level'
+        curves = cache_lookup(
+            cache, 'threshold_segments', {**state, 'segment': segment_col},
+            lambda: segment_curves(scores[rows], labels[rows], df[segment_col].to_numpy()[rows]), rows_in=len(rows)
+        )
+        curves = curve_metrics(curves, beta, weights)
+        at_threshold = segment_metrics_at(curves, threshold)
+        best_points = segment_operating_points(curves, objective)
+        segment_table = pd.DataFrame({
+            segment_label: at_threshold['segment'],
+            'Precision': at_threshold['precision'],
+            'Recall': at_threshold['recall'],
+            f"F{beta:g}": at_threshold['f_beta'],
+            'Best Threshold': best_points['threshold'],
+            f"Best {objective}": best_points[objective]
+        })
+        st.dataframe(segment_table.style.format(precision=3), hide_index=True, width='stretch')
+
+
+selection = current_selection()
+model = selection['snapshot'].model
+st.subheader("Threshold Tuner")
+if len(selection['rows']):
+    # Start at the model's threshold, or an even split when no coefficients were published
+    default_threshold = model['threshold'] if model is not None else 0.5
+    with span('threshold_tuner', rows_in=len(selection['rows'])):
+        render_threshold_tuner(selection['df'], selection['rows'], selection['state'], selection['cache'], default_threshold)
+else:
+    st.info("No employees match the current filters.")
@@ -0,0 +1,138 @@
+"""
+WHAT-IF SIMULATION
+Development-intervention scenarios for a cohort, ranked by moves into High Potential
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import streamlit as st
+
+from dashboard import SNAPSHOT_HASH, current_selection, id_typeahead, load_design_matrix
+from charts import create_transition_heatmap
+from table_view import COLUMN_LABELS
+from scoring import MODEL_FILE
+from what_if import MAX_SCENARIOS, WhatIfSimulator, scenario_grid, scenario_summary, transition_frame
+from tracing import span, fragment
+
+
+@st.cache_resource(max_entries=2, hash_funcs=SNAPSHOT_HASH)
+def load_simulator(snapshot):
+    """What-if simulator over the snapshot's design matrix, cutoffs fixed at the model quantiles"""
+    model = snapshot.model
+    return WhatIfSimulator(snapshot.scorer, load_design_matrix(snapshot), snapshot.df['performance_rating'], model['q_low'], model['q_high'])
+
+@st.cache_resource(max_entries=16, hash_funcs=SNAPSHOT_HASH)
+def run_what_if(snapshot, cohort, ranges):
+    """Simulate every combination of the delta ranges over a cohort, both given as hashable tuples"""
+    rows = snapshot.index.select(dict(cohort))
+    result = load_simulator(snapshot).simulate(rows, scenario_grid(dict(ranges)))
+    return rows, result, scenario_summary(result)
+
+@fragment('fragment/what_if')
+def render_what_if(snapshot, employee_ids):
+    """Apply development deltas to a cohort and report how many employees change box"""
+    st.markdown(
+        "Pick a cohort and the development deltas to try. Every combination of the deltas is re-scored with the model "
+        "coefficients and bucketed against the current potential cutoffs, so the grid does not shift with the cohort."
+    )
+    simulator = load_simulator(snapshot)
+    index = snapshot.index
+
+    # Cohort
+    col_dept, col_role, col_box = st.columns(3)
+    with col_dept:
+        departments = st.multiselect('Departments', index.values['department'], key='whatif_departments')
+    with col_role:
+        roles = st.multiselect('Role levels', index.values['role_level'], key='whatif_roles')
+    with col_box:
+        boxes = st.multiselect('Current boxes', index.values['box_category'], key='whatif_boxes')
+    cohort = (('department', tuple(departments)), ('role_level', tuple(roles)),
+              ('box_category', tuple(boxes)), ('employee_id', tuple(employee_ids)))
+
+    # Scenario grid: one delta range per feature
+    adjustable = simulator.adjustable()
+    features = st.multiselect(
+        'Features to change',
+        adjustable,
+        default=adjustable[:2],
+        format_func=lambda feature: COLUMN_LABELS.get(feature, feature),
+        key='whatif_features'
+    )
+    ranges = []
+    columns = st.columns(max(len(features), 1))
+    for column, feature in zip(columns, features):
+        j = simulator.features.index(feature)
+        value_span = float(simulator.upper[j] - simulator.lower[j])
+        step = 1 if value_span <= 20 else 5
+        limit = int(min(value_span, 10 * step))
+        with column:
+            low, high = st.slider(COLUMN_LABELS.get(feature, feature), -limit, limit, (0, min(2 * step, limit)), step=step, key=f"whatif_{feature}")
+        ranges.append((feature, tuple(range(low, high + 1, step))))
+    n_scenarios = int(np.prod([len(deltas) for _, deltas in ranges])) if ranges else 0
+    if not ranges:
+        st.info("Select at least one feature to change.")
+        return
+    if n_scenarios > MAX_SCENARIOS:
+        st.warning(f"{n_scenarios:,} scenarios exceed the batch limit of {MAX_SCENARIOS:,}; narrow the delta ranges.")
+        return
+
+    with span('what_if', scenarios=n_scenarios) as sim:
+        rows, result, summary = run_what_if(snapshot, cohort, tuple(ranges))
+        sim.set(rows_in=len(rows))
+    if len(rows) == 0:
+        st.warning("No employees match the cohort.")
+        return
+
+    best = summary.sort_values(['into_high_potential', 'mean_potential'], ascending=False)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Cohort", f"{len(rows):,}")
+    col2.metric("Scenarios", f"{n_scenarios:,}")
+    col3.metric("High Potential Now", f"{int(result['before'][6:].sum()):,}")
+    col4.metric("Best Scenario Into High Potential", f"{int(best['into_high_potential'].iloc[0]):,}")
+
+    def scenario_label(s):
+        # Features left at a zero delta have no summary column and are not listed
+        deltas = [
+            f"{COLUMN_LABELS.get(feature, feature)} {delta:+g}"
+            for feature, delta in zip(result['features'], result['deltas'][s]) if delta != 0
+        ]
+        return f"#{s}: " + (", ".join(deltas) or "no change")
+
+    max_rows = 1000
+    st.dataframe(
+        best.head(max_rows).rename(columns=COLUMN_LABELS),
+        column_config={
+            'high_potential': 'High Potential',
+            'into_high_potential': 'Into High Potential',
+            'out_of_high_potential': 'Out of High Potential',
+            'changed_box': 'Changed Box',
+            'predicted_promotable': 'Predicted Promotable',
+            'mean_potential': st.column_config.NumberColumn('Mean Potential', format='%.3f')
+        },
+        width='stretch',
+        height=300
+    )
+    if len(best) > max_rows:
+        st.caption(f"Showing the {max_rows:,} best of {len(best):,} scenarios")
+
+    chosen = st.selectbox('Scenario', best.index[:max_rows], format_func=scenario_label, key='whatif_scenario')
+    st.subheader("Box Transitions")
+    st.plotly_chart(create_transition_heatmap(transition_frame(result['transitions'][chosen])), width='stretch')
+
+
+snapshot = current_selection()['snapshot']
+
+st.subheader("What-If Simulation")
+if snapshot.scorer is None:
+    st.info(f"What-if simulation re-scores employees from the model coefficients; publish {MODEL_FILE} with the pipeline to enable it.")
+else:
+    # Sidebar widgets cannot live inside a fragment
+    employee_ids = id_typeahead(
+        "Cohort Employee IDs:",
+        snapshot.id_search['employee_id'],
+        key='whatif_employee_ids',
+        help='Type an ID prefix, then select the employees in the cohort'
+    )
+    render_what_if(snapshot, employee_ids)
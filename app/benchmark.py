@@ -0,0 +1,275 @@
+"""
+BENCHMARK SUITE
+Headless timings and memory peaks for the pipeline and dashboard stages on synthetic workforces
+
+For each size, a synthetic extract (see synthetic) is scored, written to and
+reloaded from the Parquet store, indexed and audited, pushed through a fixed set of
+filter states with the same calls main() makes, charted and exported. Each
+stage runs once under tracemalloc for its peak Python/NumPy allocation
+(Arrow buffers are not traced), then --repeats times for the median wall
+time. Results are compared with benchmark_baseline.json; a stage slower or
+larger than the tolerances allow fails the run with exit code 1. Baselines
+and comparisons need at least MIN_COMPARE_REPEATS timed runs per stage.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from data_store import STORE_FILE, optimize_dtypes, load_frame
+from filter_index import FilterIndex, FILTER_COLUMNS
+from agg_cube import AggregateCube
+from salary_sketch import SalarySketches
+from org_tree import OrgTree, ORG_KEY, select_rows
+from id_search import IdSearch
+from table_view import TableView, PAGE_SIZES
+from fairness_audit import fairness_audit
+from export import EXPORT_FORMATS, export_rows
+from charts import create_9box_grid, create_box_distribution, create_salary_box
+from scoring import load_coefficients
+from synthetic import SIZES, DEFAULT_MODEL, load_profile, generate_workforce, score_workforce, size_rows
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+BASELINE_FILE = Path(__file__).parent / "benchmark_baseline.json"
+
+DEFAULT_SIZES = ['10k', '100k']
+REPEATS = 5
+
+# Fewest timed runs per stage a baseline or comparison accepts
+MIN_COMPARE_REPEATS = 3
+
+# Allowed slowdown / growth over the baseline before a stage fails
+TIME_TOLERANCE = 0.5
+MEMORY_TOLERANCE = 0.25
+
+# Differences below these are timer / allocator noise, never regressions
+MIN_SECONDS = 0.005
+MIN_PEAK_MB = 1.0
+
+# Filter states replayed through the dashboard's filter chain
+FILTER_STATES = ['all', 'department', 'department_role_education', 'promoted_range', 'boxes', 'org', 'employee_ids']
+
+
+# ============================================================
+# MEASUREMENT
+# ============================================================
+
+def measure(fn, repeats=REPEATS):
+    """Peak traced allocation of one run, then the median wall time of repeats more: (result, seconds, peak_mb)"""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # The median shrugs off a single slow or fast outlier run
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        seconds.append(time.perf_counter() - start)
+    return result, float(np.median(seconds)), peak / 2**20
+
+def filter_conditions(df, tree, index, state):
+    """main()'s conditions dict and potential range for a named filter state"""
+    conditions = {col: None for col in FILTER_COLUMNS}
+    conditions[ORG_KEY] = None
+    value_range = (float(df['potential'].min()), float(df['potential'].max()))
+
+    if state == 'department':
+        conditions['department'] = index.values['department'][:1]
+    elif state == 'department_role_education':
+        conditions['department'] = index.values['department'][:1]
+        conditions['role_level'] = index.values['role_level'][:1]
+        conditions['education_level'] = index.values['education_level'][:1]
+    elif state == 'promoted_range':
+        conditions['promoted'] = [1]
+        value_range = tuple(float(q) for q in np.quantile(df['potential'], [0.2, 0.6]))
+    elif state == 'boxes':
+        conditions['box_category'] = [label for label in index.values['box_category'] if label.startswith('High Potential')]
+    elif state == 'org':
+        # Every row under the first few roots (whole org units)
+        conditions[ORG_KEY] = tree.ids[tree.parent < 0][:3].tolist()
+    elif state == 'employee_ids':
+        conditions['employee_id'] = IdSearch(index.values['employee_id']).matches('EMP0000')[0]
+    return conditions, value_range
+
+
+# ============================================================
+# STAGES
+# ============================================================
+
+def run_size(n_rows, profile, model, repeats=REPEATS, seed=42):
+    """Time every stage at one size, as {stage: {'seconds', 'peak_mb'}}"""
+    results = {}
+    def stage(name, fn):
+        result, seconds, peak_mb = measure(fn, repeats)
+        results[name] = {'seconds': seconds, 'peak_mb': peak_mb}
+        print(f"  {name:<36} {seconds * 1000:>10.1f} ms {peak_mb:>10.1f} MB", flush=True)
+        return result
+
+    df_raw = stage('generate', lambda: generate_workforce(n_rows, profile, model, seed))
+    final_data = stage('score', lambda: score_workforce(df_raw, model))
+    del df_raw
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        store_path = Path(store_dir) / STORE_FILE
+        stage('write_store', lambda: optimize_dtypes(final_data).to_parquet(store_path, engine='pyarrow', index=False))
+        df = stage('load_data', lambda: load_frame(store_dir))
+    del final_data
+
+    index = stage('build/filter_index', lambda: FilterIndex(df))
+    cube = stage('build/cube', lambda: AggregateCube(df, index))
+    sketches = stage('build/salary_sketches', lambda: SalarySketches(df, index))
+    tree = stage('build/org_tree', lambda: OrgTree(df))
+    table_view = stage('build/table_view', lambda: TableView(df))
+    stage('build/fairness_audit', lambda: fairness_audit(df))
+
+    # The per-rerun work in main() for each filter state
+    for state in FILTER_STATES:
+        conditions, value_range = filter_conditions(df, tree, index, state)
+        def filter_chain():
+            rows = select_rows(index, tree, conditions, value_range)
+            box_summary = cube.summarize(conditions, value_range, rows=rows)
+            salary_summary = sketches.summarize(conditions, value_range, rows=rows)
+            table_view.page(rows, page=0, page_size=PAGE_SIZES[1], sort_by='potential', ascending=False)
+            return rows, box_summary, salary_summary
+        outputs = stage(f"filter/{state}", filter_chain)
+        if state == 'all':
+            rows, box_summary, salary_summary = outputs
+
+    # Charts import plotly lazily; one throwaway figure keeps that one-off load out of the measured stages
+    create_9box_grid(box_summary['count'])
+
+    stage('chart/9box_grid', lambda: create_9box_grid(box_summary['count']))
+    stage('chart/box_distribution', lambda: create_box_distribution(box_summary['count']))
+    stage('chart/salary_box', lambda: create_salary_box(salary_summary))
+
+    # Full unfiltered selection: the largest download the dashboard offers
+    for export_format, (extension, _) in EXPORT_FORMATS.items():
+        stage(f"export/{extension}", lambda: export_rows(df, rows, export_format))
+
+    return results
+
+
+# ============================================================
+# BASELINE
+# ============================================================
+
+def machine_info():
+    """Where the numbers came from; baselines only compare on like hardware"""
+    return {
+        'platform': platform.platform(),
+        'processor': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__
+    }
+
+def check_repeats(baseline, min_repeats=MIN_COMPARE_REPEATS):
+    """Raise ValueError for a baseline timed with too few (or unrecorded) repeats"""
+    repeats = baseline.get('repeats')
+    if baseline['sizes'] and (repeats or 0) < min_repeats:
+        recorded = f"{repeats} repeats" if repeats is not None else "an unrecorded number of repeats"
+        raise ValueError(
+            f"Baseline was timed with {recorded} per stage; comparisons need at least {min_repeats}. "
+            "Re-record it with --update-baseline"
+        )
+
+def load_baseline(path, min_repeats=MIN_COMPARE_REPEATS):
+    """Stored baseline, or an empty one if none has been recorded"""
+    path = Path(path)
+    if not path.exists():
+        return {'machine': None, 'repeats': None, 'sizes': {}}
+    with open(path) as f:
+        baseline = json.load(f)
+    check_repeats(baseline, min_repeats)
+    return baseline
+
+def compare(results, baseline, time_tolerance=TIME_TOLERANCE, memory_tolerance=MEMORY_TOLERANCE):
+    """Regressions against the baseline, as (size, stage, message) tuples; unrecorded stages count as one"""
+    check_repeats(baseline)
+    regressions = []
+    for size, stages in results.items():
+        for name, current in stages.items():
+            base = baseline['sizes'].get(size, {}).get(name)
+            if base is None:
+                regressions.append((size, name, "no baseline"))
+                continue
+            if current['seconds'] > base['seconds'] * (1 + time_tolerance) and current['seconds'] - base['seconds'] > MIN_SECONDS:
+                regressions.append((size, name, f"time {base['seconds'] * 1000:.1f} -> {current['seconds'] * 1000:.1f} ms"))
+            if current['peak_mb'] > base['peak_mb'] * (1 + memory_tolerance) and current['peak_mb'] - base['peak_mb'] > MIN_PEAK_MB:
+                regressions.append((size, name, f"peak {base['peak_mb']:.1f} -> {current['peak_mb']:.1f} MB"))
+    return regressions
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scoring pipeline and dashboard stages on synthetic data")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES, help=f"sizes to run: {', '.join(SIZES)} or integers")
+    parser.add_argument('--repeats', type=int, default=REPEATS, help=f'timed runs per stage, median is kept (at least {MIN_COMPARE_REPEATS})')
+    parser.add_argument('--seed', type=int, default=42, help='synthetic data seed')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='record these results as the baseline instead of comparing')
+    parser.add_argument('--time-tolerance', type=float, default=TIME_TOLERANCE, help='allowed fractional slowdown per stage')
+    parser.add_argument('--memory-tolerance', type=float, default=MEMORY_TOLERANCE, help='allowed fractional growth of peak memory per stage')
+    parser.add_argument('--output', default=None, help='also write the results JSON here')
+    args = parser.parse_args()
+    if args.repeats < MIN_COMPARE_REPEATS:
+        parser.error(f"--repeats must be at least {MIN_COMPARE_REPEATS} for a median worth comparing")
+
+    profile = load_profile()
+    model = load_coefficients(DEFAULT_MODEL)
+    results = {}
+    for size in args.sizes:
+        print(f"{size} ({size_rows(size):,} rows)")
+        results[size] = run_size(size_rows(size), profile, model, args.repeats, args.seed)
+
+    report = {'machine': machine_info(), 'repeats': args.repeats, 'sizes': results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+    try:
+        baseline = load_baseline(args.baseline, min_repeats=0 if args.update_baseline else MIN_COMPARE_REPEATS)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.update_baseline:
+        # Sizes timed with too few repeats are not kept next to the new ones
+        if (baseline.get('repeats') or 0) < MIN_COMPARE_REPEATS:
+            baseline['sizes'] = {}
+        baseline['machine'] = report['machine']
+        baseline['repeats'] = args.repeats
+        baseline['sizes'].update(results)
+        Path(args.baseline).write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        sys.exit(0)
+
+    if baseline['machine'] and baseline['machine'] != report['machine']:
+        print("Warning: baseline was recorded on a different machine; timings may not be comparable")
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for size, name, message in regressions:
+        print(f"REGRESSION {size} {name}: {message}")
+    if not baseline['sizes']:
+        print("No baseline recorded yet; run with --update-baseline")
+    elif not regressions:
+        print("No regressions against the baseline")
+    sys.exit(1 if regressions else 0)
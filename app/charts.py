@@ -0,0 +1,297 @@
+"""
+DASHBOARD CHARTS
+Plotly figure builders for the dashboard pages
+
+Plotly is imported inside each builder, so pages (and tools such as the
+benchmark suite) that never draw a chart never load it.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+
+from tracing import traced
+from scoring import POTENTIAL_LEVELS, PERFORMANCE_LEVELS
+
+
+# ============================================================
+# 9-BOX CHARTS
+# ============================================================
+
+def get_box_color(box_category):
+    """Return color based on 9-box category"""
+    color_map = {
+        'High Potential / High Performance': '#2ecc71',      # Green - Stars
+        'High Potential / Moderate Performance': '#3498db',  # Blue - Development Ready
+        'High Potential / Low Performance': '#f39c12',       # Orange - Emerging Talent
+        'Moderate Potential / High Performance': '#16a085',  # Teal - Core Contributors
+        'Moderate Potential / Moderate Performance': '#95a5a6', # Gray - Solid Performers
+        'Moderate Potential / Low Performance': '#e67e22',   # Dark Orange - At Risk
+        'Low Potential / High Performance': '#9b59b6',       # Purple - Technical Experts
+        'Low Potential / Moderate Performance': '#7f8c8d',   # Dark Gray - Limited Growth
+        'Low Potential / Low Performance': '#e74c3c'         # Red - Underperformers
+    }
+    return color_map.get(box_category, '#95a5a6')
+
+@traced('chart/9box_grid')
+def create_9box_grid(category_counts):
+    """Create 9-box heatmap grid from per-category counts"""
+    import plotly.graph_objects as go
+    
+    total = category_counts.sum()
+    
+    # Define grid structure (row = potential, col = performance)
+    potential_levels = POTENTIAL_LEVELS
+    performance_levels = PERFORMANCE_LEVELS
+
+    # Create grid data and annotations
+    annotations = []
+    z_values = []
+    
+    for i, potential in enumerate(potential_levels):
+        row_z = []
+        for j, performance in enumerate(performance_levels):
+            category_name = f"{potential} / {performance}"
+            count = category_counts.get(category_name, 0)
+            pct = int((count / total * 100)) if total > 0 else 0
+            
+            # Create annotation text
+            text = f"<b>{count:,}</b><br>({pct}%)<br><br>{potential} /<br>{performance}"
+            
+            annotations.append(dict(
+                x=j, y=i, text=text, showarrow=False,
+                font=dict(size=14, color='black')  # Increased font size
+            ))
+            
+            # Color score based on grid position (top-right = best)
+            color_score = i * 3 + j  # Inverts so top-right is highest
+            row_z.append(color_score)
+        
+        z_values.append(row_z)
+    
+    # High/High = darkest green, Low/Low = darkest red
+    colorscale = [
+        [0.0, '#e74c3c'],   # Red (worst)
+        [0.3, '#f39c12'],   # Orange
+        [0.5, '#f1c40f'],   # Yellow
+        [0.7, '#a9dfbf'],   # Light green
+        [1.0, '#27ae60']    # Dark green (best)
+    ]
+    
+    # Create heatmap
+    fig = go.Figure(data=go.Heatmap(
+        z=z_values,
+        x=['Low Rating', 'Moderate Rating', 'High Rating'],
+        y=potential_levels,
+        colorscale=colorscale,
+        showscale=False,
+        hoverinfo='skip'
+    ))
+    
+    # Add annotations
+    for annotation in annotations:
+        fig.add_annotation(annotation)
+    
+    # Update layout
+    fig.update_layout(
+        # title={'text': '9 Box Grid', 'x': 0.5, 'font': {'size': 18}},
+        xaxis=dict(title='Performance Rating', tickfont=dict(size=14)),
+        yaxis=dict(title='Potential Score', tickfont=dict(size=14)),
+        height=500,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    
+    return fig
+
+@traced('chart/box_distribution')
+def create_box_distribution(category_counts):
+    """Create bar chart with consistent colors and legend labels""" 
+    import plotly.graph_objects as go
+    
+    box_counts = category_counts[category_counts > 0].sort_values(ascending=False).reset_index()
+    box_counts.columns = ['Category', 'Count']
+    
+    # Use gradient colors consistent with 9-box grid
+    color_map = {
+        'High Potential / High Performance': '#27ae60',      # Dark green (best)
+        'High Potential / Moderate Performance': '#a9dfbf',  # Light green
+        'High Potential / Low Performance': '#f1c40f',       # Yellow
+        'Moderate Potential / High Performance': '#a9dfbf',  # Light green
+        'Moderate Potential / Moderate Performance': '#f39c12', # Orange
+        'Moderate Potential / Low Performance': '#f39c12',   # Orange
+        'Low Potential / High Performance': '#f1c40f',       # Yellow
+        'Low Potential / Moderate Performance': '#f39c12',   # Orange
+        'Low Potential / Low Performance': '#e74c3c'         # Red (worst)
+    }
+    
+    # Short legend labels (Stars, etc.)
+    legend_map = {
+        'High Potential / High Performance': 'Consistent Stars',
+        'High Potential / Moderate Performance': 'High Potential', 
+        'High Potential / Low Performance': 'Potential Gems',
+        'Moderate Potential / High Performance': 'High Performers',
+        'Moderate Potential / Moderate Performance': 'Key Players',
+        'Moderate Potential / Low Performance': 'Inconsistent Performers',
+        'Low Potential / High Performance': 'Strong Performers',
+        'Low Potential / Moderate Performance': 'Effective Employees', 
+        'Low Potential / Low Performance': 'Under Performers'
+    }
+    
+    box_counts['Color'] = box_counts['Category'].map(color_map)
+    box_counts['Legend'] = box_counts['Category'].map(legend_map)
+    
+    fig = go.Figure()
+    
+    # Add bars
+    fig.add_trace(go.Bar(
+        x=box_counts['Count'],
+        y=box_counts['Category'],
+        orientation='h',
+        marker=dict(color=box_counts['Color']),
+        text=box_counts['Count'],
+        textposition='auto',
+        showlegend=False,
+    ))
+    
+    # Add legend text on right side
+    max_count = box_counts['Count'].max()
+    fig.add_trace(go.Scatter(
+        x=[max_count * 1.15] * len(box_counts),  # Position further right
+        y=box_counts['Category'],  # Use same y values as bars
+        text=box_counts['Legend'],
+        mode='text',
+        textposition='middle left',
+        showlegend=False,
+        textfont=dict(size=14, color='#333')
+    ))
+        
+    fig.update_layout(
+        title='',
+        xaxis_title='Number of Employees',
+        yaxis_title='',
+        height=500,
+        showlegend=False,
+        margin=dict(r=200),  # CHANGE THIS LINE
+        xaxis=dict(
+            title_font=dict(size=16, family='Arial Black'),
+            tickfont=dict(size=14)
+        ),
+        yaxis=dict(
+            title_font=dict(size=16),
+            tickfont=dict(size=14)
+        )
+    )
+    
+    fig.update_traces(hoverinfo='skip')
+    return fig
+
+@traced('chart/salary_box')
+def create_salary_box(salary_summary):
+    """Create salary box plot from server-side quartiles, fences and capped outliers"""
+    import plotly.graph_objects as go
+    fig = go.Figure()
+    fig.add_trace(go.Box(
+        y=['salary'],
+        q1=[salary_summary['q1']],
+        median=[salary_summary['median']],
+        q3=[salary_summary['q3']],
+        lowerfence=[salary_summary['lowerfence']],
+        upperfence=[salary_summary['upperfence']],
+        orientation='h',
+        marker=dict(color='#27ae60'),
+        boxpoints=False,
+        showlegend=False
+    ))
+    
+    # Outliers as a separate (sampled) trace so no raw salaries are shipped
+    outliers = salary_summary['outliers']
+    if len(outliers) > 0:
+        fig.add_trace(go.Scatter(
+            x=outliers,
+            y=['salary'] * len(outliers),
+            mode='markers',
+            marker=dict(color='#27ae60', size=5),
+            showlegend=False
+        ))
+    
+    fig.update_layout(title="Salary Distribution", xaxis_title='salary', yaxis=dict(showticklabels=False))
+    fig.update_traces(hoverinfo='skip')
+    return fig
+
+
+# ============================================================
+# ANALYSIS CHARTS
+# ============================================================
+
+@traced('chart/threshold_curve')
+def create_threshold_curve(curve, threshold, best):
+    """Create precision / recall / F-beta vs threshold chart with the chosen and best cutoffs"""
+    import plotly.graph_objects as go
+    curve = curve[np.isfinite(curve['threshold'])]
+    fig = go.Figure()
+    for col, name, dash in [('precision', 'Precision', 'dash'), ('recall', 'Recall', 'solid'), ('f_beta', 'F-beta', 'dot')]:
+        fig.add_trace(go.Scatter(x=curve['threshold'], y=curve[col], mode='lines', name=name, line=dict(dash=dash)))
+    fig.add_vline(x=threshold, line_color='red', annotation_text='Chosen')
+    fig.add_vline(x=best, line_color='gray', line_dash='dash', annotation_text='Best', annotation_position='bottom right')
+    fig.update_layout(
+        xaxis_title='Threshold',
+        yaxis_title='Score',
+        height=400,
+        margin=dict(l=50, r=50, t=30, b=50),
+        legend=dict(orientation='h', y=1.1)
+    )
+    return fig
+
+@traced('chart/transition_heatmap')
+def create_transition_heatmap(matrix):
+    """Create box-to-box transition heatmap (rows = earlier cycle, columns = later cycle)"""
+    import plotly.graph_objects as go
+    counts = matrix.to_numpy()
+    fig = go.Figure(data=go.Heatmap(
+        z=counts,
+        x=list(matrix.columns),
+        y=list(matrix.index),
+        text=counts,
+        texttemplate='%{text:,}',
+        colorscale='Greens',
+        showscale=False,
+        hoverinfo='skip'
+    ))
+    fig.update_layout(
+        xaxis=dict(title='Later Cycle', tickangle=-30),
+        yaxis=dict(title='Earlier Cycle', autorange='reversed'),
+        height=650,
+        margin=dict(l=50, r=50, t=50, b=50)
+    )
+    return fig
+
+
+# ============================================================
+# PROFILING
+# ============================================================
+
+def create_flame_chart(flame):
+    """Create flame chart of one rerun: a bar per span at its start offset, one row per nesting depth"""
+    import plotly.graph_objects as go
+    fig = go.Figure(go.Bar(
+        x=flame['ms'],
+        base=flame['start_ms'],
+        y=flame['depth'],
+        orientation='h',
+        text=flame['stage'],
+        textposition='inside',
+        insidetextanchor='start',
+        hovertext=[f"{stage}: {ms:,.1f} ms (self {self_ms:,.1f} ms)" for stage, ms, self_ms in zip(flame['stage'], flame['ms'], flame['self_ms'])],
+        hoverinfo='text',
+        marker=dict(color=flame['self_ms'], colorscale='YlOrRd')
+    ))
+    fig.update_layout(
+        xaxis_title='ms since rerun start',
+        yaxis=dict(title='Depth', autorange='reversed', dtick=1),
+        height=120 + 30 * int(flame['depth'].max() + 1),
+        margin=dict(l=10, r=10, t=10, b=40),
+        bargap=0.05,
+        showlegend=False
+    )
+    return fig
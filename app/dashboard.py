@@ -0,0 +1,387 @@
+"""
+DASHBOARD STATE
+Shared loaders, sidebar and per-run selection for the dashboard pages
+
+Everything here is imported once per process; engines only one page uses
+(fairness audit, what-if simulation) are imported by that page. The entry
+point renders the sidebar (data version, model settings, filters) for the
+page being shown and hands the resulting selection to it through a thread-local: Streamlit runs
+the entry point and the page in the same script thread, so a page reads the
+selection of its own rerun. Fragments get what they need as arguments.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from data_store import STORE_FILE, CSV_FILE
+from filter_index import FilterIndex
+from agg_cube import AggregateCube
+from table_view import TableView
+from shared_cache import SharedCache, DEFAULT_MAX_BYTES
+from salary_sketch import SalarySketches
+from org_tree import OrgTree, ORG_KEY, select_rows
+from refresher import DataRefresher, DataSnapshot, snapshot_key
+from tracing import SINKS, span, cache_lookup, last_trace, flame_frame, admin_allowed, start_metrics_server
+from scoring import BOX_LABELS, potential_cutoffs, classify_boxes
+
+
+# ============================================================
+# LOADERS
+# ============================================================
+
+@st.cache_resource
+def load_refresher():
+    """Build the first data snapshot and start the background refresher, once per process"""
+    ## Fix path issues for deployment!!
+    # Get the app directory (dashboard.py sits next to streamlit_app.py)
+    current_dir = Path(__file__).parent
+    
+    # Prefer the typed Parquet store, fall back to the CSV if it was not built
+    try:
+        return DataRefresher(current_dir).start()
+    except FileNotFoundError as err:
+        st.error(f"File not found: {err.filename}. Path checked: {current_dir / STORE_FILE}, {current_dir / CSV_FILE}")
+        st.stop()
+
+@st.cache_resource
+def load_shared_cache():
+    """One figure/aggregate cache per process, shared by every session"""
+    max_bytes = int(os.environ.get('NINEBOX_CACHE_MB', DEFAULT_MAX_BYTES // 2**20)) * 2**20
+    return SharedCache(max_bytes)
+
+# Snapshots are cache-keyed by version, never hashed
+SNAPSHOT_HASH = {DataSnapshot: snapshot_key}
+
+@st.cache_resource(max_entries=2, hash_funcs=SNAPSHOT_HASH)
+def load_design_matrix(snapshot):
+    """Build the model feature matrix once per snapshot"""
+    return snapshot.scorer.design_matrix(snapshot.df)
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def load_rescored_data(snapshot, threshold, q_low, q_high):
+    """Re-score every employee from the coefficients and re-bucket the 9-box grid"""
+    scorer = snapshot.scorer
+    potential = scorer.score(load_design_matrix(snapshot))
+    low, high = potential_cutoffs(potential, q_low, q_high)
+
+    df = snapshot.df
+    boxes = classify_boxes(df['performance_rating'], potential, low, high)
+    return df.assign(
+        potential=potential.astype(np.float32),
+        prediction_promoted=scorer.predict(potential, threshold),
+        box_category=boxes.reorder_categories(sorted(BOX_LABELS))
+    )
+
+def get_data(snapshot, scoring=None):
+    """Notebook scores as stored, or a live re-scored variant for (threshold, q_low, q_high)"""
+    return snapshot.df if scoring is None else load_rescored_data(snapshot, *scoring)
+
+# Stored scores use the snapshot's prebuilt structures; a re-scored variant
+# builds its own once per process (and snapshot)
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def build_filter_index(snapshot, scoring):
+    """Build the filter bitmaps for a scoring variant"""
+    return FilterIndex(get_data(snapshot, scoring))
+
+def load_filter_index(snapshot, scoring=None):
+    """Filter bitmaps for the snapshot (and scoring variant)"""
+    return snapshot.index if scoring is None else build_filter_index(snapshot, scoring)
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def build_cube(snapshot, scoring):
+    """Build the aggregate cube for a scoring variant"""
+    return AggregateCube(get_data(snapshot, scoring), load_filter_index(snapshot, scoring))
+
+def load_cube(snapshot, scoring=None):
+    """Aggregate cube for the snapshot (and scoring variant)"""
+    return snapshot.cube if scoring is None else build_cube(snapshot, scoring)
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def build_salary_sketches(snapshot, scoring):
+    """Build the per-cell salary sketches for a scoring variant"""
+    return SalarySketches(get_data(snapshot, scoring), load_filter_index(snapshot, scoring))
+
+def load_salary_sketches(snapshot, scoring=None):
+    """Per-cell salary sketches for the snapshot (and scoring variant)"""
+    return snapshot.sketches if scoring is None else build_salary_sketches(snapshot, scoring)
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def build_org_tree(snapshot, scoring):
+    """Build the manager hierarchy and subtree rollups for a scoring variant"""
+    return OrgTree(get_data(snapshot, scoring))
+
+def load_org_tree(snapshot, scoring=None):
+    """Manager hierarchy and subtree rollups for the snapshot (and scoring variant)"""
+    return snapshot.org_tree if scoring is None else build_org_tree(snapshot, scoring)
+
+@st.cache_resource(max_entries=8, hash_funcs=SNAPSHOT_HASH)
+def build_table_view(snapshot, scoring):
+    """Build the per-column sort indexes for a scoring variant"""
+    return TableView(get_data(snapshot, scoring))
+
+def load_table_view(snapshot, scoring=None):
+    """Per-column sort indexes for the snapshot (and scoring variant)"""
+    return snapshot.table_view if scoring is None else build_table_view(snapshot, scoring)
+
+@st.cache_resource
+def load_metrics_server():
+    """Start the OpenMetrics endpoint once per process"""
+    return start_metrics_server()
+
+
+# ============================================================
+# SIDEBAR
+# ============================================================
+
+def id_typeahead(label, search, key, help, format_func=str):
+    """Prefix search box feeding a multiselect of the top matches plus current picks"""
+    query = st.sidebar.text_input(f"Search {label.rstrip(':')}", key=f"{key}_query", placeholder='Type an ID prefix')
+    matches, n_matches = search.matches(query)
+    selected = st.session_state.get(key, [])
+    options = list(selected) + [match for match in matches if match not in selected]
+    chosen = st.sidebar.multiselect(label, options, key=key, format_func=format_func, help=help)
+    if n_matches > len(matches):
+        st.sidebar.caption(f"Showing {len(matches):,} of {n_matches:,} matches; keep typing to narrow")
+    return chosen
+
+def render_data_version():
+    """Current snapshot, with its version line in the sidebar and a toast when it changed"""
+    # One data snapshot for the whole rerun; the refresher swaps in new ones between reruns
+    refresher = load_refresher()
+    snapshot = refresher.current
+    st.sidebar.caption(f"Data {snapshot.label()}")
+    if refresher.last_error:
+        st.sidebar.caption(f"Latest refresh failed, still serving v{snapshot.version}: {refresher.last_error}")
+    seen_version = st.session_state.get('data_version')
+    if seen_version is not None and seen_version != snapshot.version:
+        st.toast(f"Dashboard data refreshed to v{snapshot.version}")
+    st.session_state['data_version'] = snapshot.version
+    return snapshot
+
+def render_model_settings(model):
+    """Live re-scoring controls; returns the scoring variant (None = stored notebook scores)"""
+    with st.sidebar.expander("Model Settings"):
+        live_scoring = st.checkbox(
+            'Re-score live',
+            value=False,
+            help='Recompute potential, predictions and 9-box categories from the stored model coefficients'
+        )
+        threshold = st.slider(
+            'Prediction threshold',
+            0.01, 0.99, model['threshold'],
+            step=0.01,
+            disabled=not live_scoring,
+            help='Probability at or above which an employee is predicted promotable'
+        )
+        q_low, q_high = st.slider(
+            'Potential quantile cutoffs',
+            0.05, 0.95, (model['q_low'], model['q_high']),
+            step=0.05,
+            disabled=not live_scoring,
+            help='Quantiles separating Low / Moderate / High potential'
+        )
+    return (threshold, q_low, q_high) if live_scoring else None
+
+def render_filters(snapshot, scoring):
+    """Sidebar filters resolved to the selected rows, as the selection dict the pages read"""
+    # Load data
+    with span('load_data') as load:
+        df = get_data(snapshot, scoring)
+        index = load_filter_index(snapshot, scoring)
+        load.set(rows_out=len(df))
+
+    st.sidebar.header("Core Filters")
+
+    # Promotion status filter
+    st.sidebar.markdown("#### Promotion Status")
+    promotion_status = st.sidebar.radio(
+        'Select Promotion Status',
+        ['All', 'Promoted', 'Not Promoted'],
+        help='Filter by actual promotion outcome'
+    )
+
+    # Potential score range
+    st.sidebar.markdown("#### Potential Score Range (model probabilities)")
+    potential_range = st.sidebar.slider(
+        'Select range',
+        float(df['potential'].min()),
+        float(df['potential'].max()),
+        (float(df['potential'].min()), float(df['potential'].max())),
+        step=0.01,
+        help='Filter by model-predicted promotion potential'
+    )
+
+    # 9-Box Category filter
+    st.sidebar.markdown("#### 9-Box Category")
+    selected_boxes = st.sidebar.multiselect(
+        'Categories:',
+        options=index.values['box_category'],
+        default=[],
+        help='Select one or more categories'
+    )
+
+    # Employee ID filter
+    st.sidebar.header("Additional Filters")
+    id_search = snapshot.id_search
+    selected_emp_ids = id_typeahead(
+        "Employee IDs:",
+        id_search['employee_id'],
+        key='employee_ids',
+        help='Type an ID prefix, then select one or more employee IDs'
+    )
+
+    # Manager filter: everyone under the manager (recursively) or direct reports only
+    with span('load_org_tree'):
+        org_tree = load_org_tree(snapshot, scoring)
+    selected_mgr_ids = id_typeahead(
+        "Manager IDs:",
+        id_search['manager_id'],
+        key='manager_ids',
+        format_func=lambda mgr: f"{mgr} ({org_tree.org_size(mgr):,} in org)",
+        help='Type an ID prefix, then select one or more managers to see their whole organization'
+    )
+    direct_reports_only = st.sidebar.checkbox(
+        'Direct reports only',
+        value=False,
+        help='Limit the manager filter to direct reports instead of the full org below each manager'
+    )
+
+    # Department filter
+    departments = ['All'] + index.values['department']
+    selected_dept = st.sidebar.selectbox(
+        'Department',
+        departments,
+        help='Filter employees by department'
+    )
+
+    # Role level filter
+    role_levels = ['All'] + index.values['role_level']
+    selected_role = st.sidebar.selectbox(
+        'Role Level',
+        role_levels,
+        help='Filter employees by organizational level'
+    )
+
+    # Education level filter
+    education_levels = ['All'] + index.values['education_level']
+    selected_edu = st.sidebar.selectbox(
+        'Education Level',
+        education_levels,
+        help='Filter employees by education background'
+    )
+
+    st.sidebar.markdown("---")
+
+    # Apply filters: one bitmap AND per column, one take at the end
+    promoted_values = {'All': None, 'Promoted': [1], 'Not Promoted': [0]}[promotion_status]
+    conditions = {
+        'department': [selected_dept] if selected_dept != 'All' else None,
+        'role_level': [selected_role] if selected_role != 'All' else None,
+        'education_level': [selected_edu] if selected_edu != 'All' else None,
+        'promoted': promoted_values,
+        'employee_id': selected_emp_ids,
+        'manager_id': selected_mgr_ids if direct_reports_only else None,
+        ORG_KEY: selected_mgr_ids if not direct_reports_only else None,
+        'box_category': selected_boxes
+    }
+    # Rows, aggregates and figures are shared across sessions by filter state
+    cache = load_shared_cache()
+    state = {'version': snapshot.version, 'scoring': scoring, 'conditions': conditions, 'potential_range': potential_range}
+    rows = cache_lookup(
+        cache, 'rows', state, lambda: select_rows(index, org_tree, conditions, potential_range), rows_in=len(df), rows_out=len
+    )
+
+    return {
+        'snapshot': snapshot,
+        'scoring': scoring,
+        'df': df,
+        'org_tree': org_tree,
+        'conditions': conditions,
+        'potential_range': potential_range,
+        'selected_mgr_ids': selected_mgr_ids,
+        'file_tag': f"{selected_dept}_{selected_role}",
+        'cache': cache,
+        'state': state,
+        'rows': rows
+    }
+
+def box_summary(selection):
+    """Per-box counts and sums of the selection from the cube (row data only for slider edges / ID filters)"""
+    snapshot, scoring, rows = selection['snapshot'], selection['scoring'], selection['rows']
+    return cache_lookup(
+        selection['cache'], 'box_summary', selection['state'],
+        lambda: load_cube(snapshot, scoring).summarize(selection['conditions'], selection['potential_range'], rows=rows),
+        rows_in=len(rows)
+    )
+
+def render_cache_stats(placeholder):
+    """Shared cache statistics, for sizing NINEBOX_CACHE_MB"""
+    cache_stats = load_shared_cache().stats()
+    placeholder.caption(
+        f"Hits: {cache_stats['hits']:,} | Misses: {cache_stats['misses']:,} | "
+        f"Hit rate: {cache_stats['hit_rate']*100:.1f}%  \n"
+        f"Entries: {cache_stats['entries']:,} | Evictions: {cache_stats['evictions']:,}  \n"
+        f"Memory: {cache_stats['bytes']/2**20:.1f} / {cache_stats['max_bytes']/2**20:.0f} MB"
+    )
+
+
+# ============================================================
+# SELECTION
+# ============================================================
+
+_local = threading.local()
+
+def set_selection(selection):
+    """Publish this rerun's selection to the page about to run"""
+    _local.selection = selection
+
+def current_selection():
+    """The selection the entry point built for this rerun"""
+    return _local.selection
+
+
+# ============================================================
+# FOOTER AND PROFILING
+# ============================================================
+
+def render_footer():
+    """Render the page footer"""
+    st.markdown("---")
+    st.markdown("""
+    <div style='text-align: center; color: gray; padding: 2rem 0;'>
+        <p><strong>9-Box Talent Classification Dashboard</strong></p>
+        <p>Built with Streamlit | Data powered by logistic regression model</p>
+        <p>Author: Tanya Gampert, PHR, CAPM | MSDA Capstone Project</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_profiling_panel():
+    """Admin-only sidebar summary of where the rerun that just finished spent its time"""
+    trace = last_trace()
+    if 'panel' not in SINKS or trace is None or not trace.spans or not admin_allowed(st.query_params.get('admin')):
+        return
+
+    from charts import create_flame_chart
+
+    flame = flame_frame(trace)
+    with st.sidebar.expander("Profiling (last rerun)", expanded=True):
+        st.caption(f"{trace.seconds * 1000:,.0f} ms across {len(flame)} spans")
+        st.plotly_chart(create_flame_chart(flame), width='stretch')
+        table = flame.assign(stage=['  ' * depth + stage for depth, stage in zip(flame['depth'], flame['stage'])])
+        st.dataframe(
+            table[['stage', 'ms', 'self_ms', 'rows_in', 'rows_out', 'bytes', 'cache']],
+            column_config={
+                'ms': st.column_config.NumberColumn(format='%.1f'),
+                'self_ms': st.column_config.NumberColumn('self ms', format='%.1f')
+            },
+            hide_index=True,
+            width='stretch'
+        )
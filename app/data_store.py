@@ -0,0 +1,157 @@
+"""
+COLUMNAR DATA STORE
+Build step that turns the notebook output (final_data.csv) into a typed Parquet file
+
+The store records the size and hash of the CSV it was built from. When the
+CSV next to it no longer matches, the store is stale: it is rebuilt, or the
+CSV is served if the directory is read-only.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import argparse
+import hashlib
+import json
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# SCHEMA
+# ============================================================
+
+# String columns stored as categorical dictionaries
+CATEGORY_COLUMNS = [
+    'employee_id',
+    'manager_id',
+    'department',
+    'role_level',
+    'education_level',
+    'box_category'
+]
+
+# Float columns where float32 precision is plenty
+FLOAT32_COLUMNS = ['potential', 'potential_low', 'potential_high']
+
+STORE_FILE = "final_data.parquet"
+CSV_FILE = "final_data.csv"
+
+# Parquet metadata key holding the fingerprint of the source CSV
+SOURCE_KEY = b'ninebox.source'
+
+log = logging.getLogger("ninebox.data")
+
+
+# ============================================================
+# HELPER FUNCTIONS
+# ============================================================
+
+def optimize_dtypes(df):
+    """Convert strings to categoricals, downcast ints and float32 potential"""
+    df = df.copy()
+
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+
+    return df
+
+
+def read_csv_typed(csv_path):
+    """Read a final_data CSV and apply the compact dtypes"""
+    dtypes = {col: 'category' for col in CATEGORY_COLUMNS}
+    return optimize_dtypes(pd.read_csv(csv_path, dtype=dtypes))
+
+
+def source_fingerprint(csv_path, block_size=1 << 20):
+    """Size and content hash of a source CSV"""
+    digest = hashlib.sha256()
+    with open(csv_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return {'size': Path(csv_path).stat().st_size, 'sha256': digest.hexdigest()}
+
+
+def build_store(csv_path, store_path):
+    """Write the typed Parquet store for a final_data CSV, stamped with the CSV's fingerprint"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    df = read_csv_typed(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), SOURCE_KEY: json.dumps(source_fingerprint(csv_path)).encode()}
+
+    # Written under a temporary name so readers never see a partial store
+    store_path = Path(store_path)
+    partial_path = store_path.with_suffix('.partial')
+    pq.write_table(table.replace_schema_metadata(metadata), partial_path)
+    partial_path.replace(store_path)
+    return df
+
+
+def store_is_current(store_path, csv_path):
+    """True when the store was built from the CSV as it is now"""
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_schema(store_path).metadata or {}
+    if SOURCE_KEY not in metadata:
+        return False
+    built_from = json.loads(metadata[SOURCE_KEY])
+    # The size check spares hashing a CSV that has obviously changed
+    if built_from['size'] != Path(csv_path).stat().st_size:
+        return False
+    return built_from == source_fingerprint(csv_path)
+
+
+def read_store(store_path, columns=None):
+    """Open the Parquet store (memory-mapped) as a typed DataFrame"""
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(store_path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+def load_frame(data_dir):
+    """Load the Parquet store from data_dir, falling back to the CSV if it is missing or stale"""
+    data_dir = Path(data_dir)
+    store_path = data_dir / STORE_FILE
+    csv_path = data_dir / CSV_FILE
+
+    if store_path.exists():
+        # A store with no CSV beside it is the only copy of the data
+        if not csv_path.exists() or store_is_current(store_path, csv_path):
+            return read_store(store_path)
+        log.warning("%s was not built from the current %s; rebuilding it", store_path, CSV_FILE)
+        try:
+            return build_store(csv_path, store_path)
+        except OSError as exc:
+            log.warning("could not rebuild %s (%s); serving %s", store_path, exc, csv_path)
+
+    return read_csv_typed(csv_path)
+
+
+# ============================================================
+# BUILD STEP
+# ============================================================
+
+if __name__ == "__main__":
+    app_dir = Path(__file__).parent
+
+    parser = argparse.ArgumentParser(description="Build the typed Parquet store for the dashboard")
+    parser.add_argument('csv', nargs='?', default=app_dir / CSV_FILE, help='final_data CSV from the notebook')
+    parser.add_argument('store', nargs='?', default=app_dir / STORE_FILE, help='output Parquet path')
+    args = parser.parse_args()
+
+    df = build_store(args.csv, args.store)
+    print(f"Wrote {len(df):,} rows to {args.store}")
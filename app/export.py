@@ -0,0 +1,109 @@
+"""
+DATA EXPORT
+Chunked, on-demand CSV / gzip / Parquet export of the filtered employee rows
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+
+from table_view import display_columns, COLUMN_LABELS, YES_NO_COLUMNS, YES_NO
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Rows formatted per chunk; bounds the working set of an export
+EXPORT_CHUNK_ROWS = 50_000
+
+# Label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'CSV (gzip)': ('csv.gz', 'application/gzip'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+
+
+# ============================================================
+# CHUNKED WRITERS
+# ============================================================
+
+def format_chunk(df, rows):
+    """Display-formatted frame for one chunk of row indices"""
+    chunk = df.take(rows)[display_columns(df)]
+    for col in YES_NO_COLUMNS:
+        chunk[col] = chunk[col].map(YES_NO)
+    return chunk.rename(columns=COLUMN_LABELS)
+
+def iter_chunks(df, rows, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield formatted frames for consecutive slices of rows"""
+    for start in range(0, len(rows), chunk_rows):
+        yield format_chunk(df, rows[start:start + chunk_rows])
+
+def write_csv(df, rows, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write rows as UTF-8 CSV to a binary file object, one chunk at a time"""
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='', write_through=True)
+    header = True
+    for chunk in iter_chunks(df, rows, chunk_rows):
+        chunk.to_csv(text, index=False, header=header)
+        header = False
+    if header:
+        # No rows: still write the header line
+        format_chunk(df, rows[:0]).to_csv(text, index=False)
+    text.detach()
+
+def write_parquet(df, rows, fileobj, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Write rows as Parquet row groups, one chunk at a time"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    for chunk in iter_chunks(df, rows, chunk_rows):
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if writer is None:
+            writer = pq.ParquetWriter(fileobj, table.schema)
+        writer.write_table(table)
+    if writer is None:
+        table = pa.Table.from_pandas(format_chunk(df, rows[:0]), preserve_index=False)
+        writer = pq.ParquetWriter(fileobj, table.schema)
+    writer.close()
+
+def export_rows(df, rows, export_format='CSV', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Build an export file for the selected rows; call only when a download is requested"""
+    rows = np.asarray(rows)
+    buffer = io.BytesIO()
+
+    if export_format == 'CSV':
+        write_csv(df, rows, buffer, chunk_rows)
+    elif export_format == 'CSV (gzip)':
+        with gzip.GzipFile(fileobj=buffer, mode='wb') as gz:
+            write_csv(df, rows, gz, chunk_rows)
+    elif export_format == 'Parquet':
+        write_parquet(df, rows, buffer, chunk_rows)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    buffer.seek(0)
+    return buffer
+
+
+# ============================================================
+# SUMMARY EXPORT
+# ============================================================
+
+def summary_stats_frame(box_summary):
+    """Per-category export table from the cube's per-box summary"""
+    observed = box_summary[box_summary['count'] > 0]
+    return pd.DataFrame({
+        'Category': observed.index,
+        'Count': observed['count'].to_numpy(),
+        'Promoted': observed['promoted'].to_numpy(),
+        'Avg Potential': (observed['potential_sum'] / observed['count']).to_numpy(),
+        'Avg Performance': (observed['performance_sum'] / observed['count']).to_numpy()
+    })
@@ -0,0 +1,211 @@
+"""
+FAIRNESS AUDIT
+Adverse-impact and actual-vs-predicted checks over every department / role / education slice at once
+
+Rows are reduced once to sums per occupied cell of the full cross of the
+audit dimensions. Every grouping set (each dimension alone, each pair, the
+full cross, ...) is then a regrouping of those cells, so thousands of slices
+cost one pass over the rows plus work proportional to the number of cells.
+
+Per slice:
+- four-fifths rule: selection rate over the highest rate in the same
+  grouping set (among slices of at least MIN_REFERENCE_SIZE), for actual
+  promotions and for the model's predicted promotions
+- rate test: two-proportion z-test of the slice against everyone else
+  (the notebook's 2x2 chi-square without continuity correction, z^2 = chi2)
+- calibration gap: actual promotions minus the model's expected count
+  (sum of potentials), z-scored with the Poisson-binomial variance
+p-values carry Benjamini-Hochberg q-values across all slices of a test.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+AUDIT_DIMENSIONS = ['department', 'role_level', 'education_level']
+
+# Outcome, decision and score columns
+ACTUAL_COL = 'promoted'
+PREDICTED_COL = 'prediction_promoted'
+SCORE_COL = 'potential'
+
+# Selection-rate ratio below which a slice shows adverse impact
+FOUR_FIFTHS = 0.8
+
+# Smallest slice that can set the reference (highest) selection rate
+MIN_REFERENCE_SIZE = 30
+
+# q-value below which a difference is reported as significant
+SIGNIFICANCE = 0.05
+
+# Extra slice attributes offered: columns with at most this many values
+MAX_SLICE_LEVELS = 20
+
+# Full crosses up to this many cells are counted densely (no sort)
+DENSE_CELL_LIMIT = 1 << 22
+
+# Label for a dimension a grouping set does not split on
+ALL = '(all)'
+
+_ERFC = np.frompyfunc(math.erfc, 1, 1)
+
+
+# ============================================================
+# STATISTICS
+# ============================================================
+
+def two_sided_p(z):
+    """Two-sided normal p-values (NaN stays NaN)"""
+    z = np.asarray(z, dtype=np.float64)
+    return _ERFC(np.abs(z) / math.sqrt(2)).astype(np.float64)
+
+def benjamini_hochberg(p):
+    """Benjamini-Hochberg q-values over the non-NaN p-values"""
+    p = np.asarray(p, dtype=np.float64)
+    q = np.full(len(p), np.nan)
+    valid = np.flatnonzero(~np.isnan(p))
+    if not len(valid):
+        return q
+    order = valid[np.argsort(p[valid], kind='stable')]
+    ranked = p[order] * len(order) / np.arange(1, len(order) + 1)
+    q[order] = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    return q
+
+
+# ============================================================
+# GROUPED SUMS
+# ============================================================
+
+def grouping_sets(n_dimensions):
+    """Every non-empty combination of dimension positions, coarsest first"""
+    return [combo for size in range(1, n_dimensions + 1) for combo in itertools.combinations(range(n_dimensions), size)]
+
+def _mixed_radix(codes, radices):
+    """One int64 key per row of a (rows, k) code matrix"""
+    key = np.zeros(len(codes), dtype=np.int64)
+    for j, radix in enumerate(radices):
+        key = key * radix + codes[:, j]
+    return key
+
+def _decode(keys, radices):
+    """(len(keys), k) code matrix of mixed-radix keys"""
+    codes = np.empty((len(keys), len(radices)), dtype=np.int64)
+    for j in range(len(radices) - 1, -1, -1):
+        keys, codes[:, j] = np.divmod(keys, radices[j])
+    return codes
+
+def cell_sums(df, dimensions):
+    """One pass over the rows: codes, labels and measure sums of every occupied cell of the full cross"""
+    labels = []
+    codes = np.empty((len(df), len(dimensions)), dtype=np.int64)
+    for j, dim in enumerate(dimensions):
+        # Missing values are a level of their own
+        codes[:, j], uniques = pd.factorize(df[dim], sort=True, use_na_sentinel=False)
+        labels.append(np.array(['Missing' if pd.isna(u) else str(u) for u in uniques], dtype=object))
+    radices = [len(level) for level in labels]
+
+    score = df[SCORE_COL].to_numpy(dtype=np.float64)
+    measures = {
+        'n': None,
+        'promoted': df[ACTUAL_COL].to_numpy(dtype=np.float64),
+        'predicted': df[PREDICTED_COL].to_numpy(dtype=np.float64),
+        'expected': score,
+        'variance': score * (1.0 - score)
+    }
+
+    key = _mixed_radix(codes, radices)
+    if math.prod(radices) <= DENSE_CELL_LIMIT:
+        size = math.prod(radices)
+        occupied = np.flatnonzero(np.bincount(key, minlength=size))
+        sums = {name: np.bincount(key, weights=w, minlength=size)[occupied] for name, w in measures.items()}
+        cells = occupied
+    else:
+        cells, inverse = np.unique(key, return_inverse=True)
+        sums = {name: np.bincount(inverse, weights=w, minlength=len(cells)) for name, w in measures.items()}
+    return _decode(cells, radices), labels, sums
+
+
+# ============================================================
+# AUDIT
+# ============================================================
+
+def fairness_audit(df, dimensions=AUDIT_DIMENSIONS):
+    """One row per slice of every grouping set of the dimensions, with impact ratios, tests and q-values"""
+    dimensions = list(dimensions)
+    cell_codes, labels, sums = cell_sums(df, dimensions)
+    radices = [len(level) for level in labels]
+
+    frames = []
+    for combo in grouping_sets(len(dimensions)):
+        sub_radices = [radices[j] for j in combo]
+        groups, inverse = np.unique(_mixed_radix(cell_codes[:, combo], sub_radices), return_inverse=True)
+        group_codes = _decode(groups, sub_radices)
+        frame = {'grouping': ' × '.join(dimensions[j] for j in combo)}
+        for j, dim in enumerate(dimensions):
+            frame[dim] = labels[j][group_codes[:, combo.index(j)]] if j in combo else ALL
+        for name, values in sums.items():
+            frame[name] = np.bincount(inverse, weights=values, minlength=len(groups))
+        frame = pd.DataFrame(frame)
+
+        # Four-fifths rule within the grouping set
+        n = frame['n'].to_numpy()
+        for col, rate_col, ratio_col in [('promoted', 'promotion_rate', 'impact_ratio'), ('predicted', 'predicted_rate', 'predicted_impact_ratio')]:
+            rate = frame[col].to_numpy() / n
+            reference = rate[n >= MIN_REFERENCE_SIZE].max() if (n >= MIN_REFERENCE_SIZE).any() else rate.max()
+            frame[rate_col] = rate
+            frame[ratio_col] = rate / reference if reference > 0 else np.nan
+        frames.append(frame)
+
+    audit = pd.concat(frames, ignore_index=True)
+    n = audit['n'].to_numpy()
+    promoted = audit['promoted'].to_numpy()
+    total_n = sums['n'].sum()
+    total_promoted = sums['promoted'].sum()
+
+    # Slice vs everyone else: two-proportion z-test with the pooled rate
+    rest_n = total_n - n
+    pooled = total_promoted / total_n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rest_rate = (total_promoted - promoted) / rest_n
+        se = np.sqrt(pooled * (1 - pooled) * (1 / n + 1 / rest_n))
+        rate_z = np.where((rest_n > 0) & (se > 0), (promoted / n - rest_rate) / se, np.nan)
+
+        # Actual vs the model's expectation
+        expected = audit['expected'].to_numpy()
+        variance = audit['variance'].to_numpy()
+        gap_z = np.where(variance > 0, (promoted - expected) / np.sqrt(variance), np.nan)
+
+    audit = audit.assign(
+        expected_rate=expected / n,
+        gap=(promoted - expected) / n,
+        rate_z=rate_z,
+        rate_p=two_sided_p(rate_z),
+        gap_z=gap_z,
+        gap_p=two_sided_p(gap_z)
+    )
+    audit['rate_q'] = benjamini_hochberg(audit['rate_p'].to_numpy())
+    audit['gap_q'] = benjamini_hochberg(audit['gap_p'].to_numpy())
+    audit['four_fifths'] = audit['impact_ratio'] < FOUR_FIFTHS
+    audit['flagged'] = audit['four_fifths'] | (audit['rate_q'] < SIGNIFICANCE) | (audit['gap_q'] < SIGNIFICANCE)
+    audit['n'] = audit['n'].astype(np.int64)
+    audit['promoted'] = audit['promoted'].astype(np.int64)
+    audit['predicted'] = audit['predicted'].astype(np.int64)
+    return audit.drop(columns='variance')
+
+def slice_candidates(df, exclude=AUDIT_DIMENSIONS, max_levels=MAX_SLICE_LEVELS):
+    """Low-cardinality columns that can be added as audit dimensions"""
+    outcomes = {ACTUAL_COL, PREDICTED_COL, SCORE_COL, 'box_category'}
+    return [
+        col for col in df.columns
+        if col not in exclude and col not in outcomes and df[col].nunique(dropna=False) <= max_levels
+    ]
@@ -0,0 +1,127 @@
+"""
+FILTER INDEX
+Bitmap index over the sidebar filter columns, built once at load time
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Columns the sidebar can filter on by value
+FILTER_COLUMNS = [
+    'department',
+    'role_level',
+    'education_level',
+    'promoted',
+    'box_category',
+    'employee_id',
+    'manager_id'
+]
+
+# Columns with more distinct values than this keep posting lists instead of bitmaps
+BITMAP_MAX_CARDINALITY = 256
+
+
+# ============================================================
+# FILTER INDEX
+# ============================================================
+
+class FilterIndex:
+    """Per-value bitmaps plus a sorted potential index for one dataset"""
+
+    def __init__(self, df, columns=FILTER_COLUMNS, range_column='potential'):
+        self.n_rows = len(df)
+        self.values = {}
+        self.codes = {}
+        self.bitmaps = {}
+        self.postings = {}
+        self._lookup = {}
+
+        for col in columns:
+            codes, uniques = pd.factorize(df[col], sort=True)
+            codes = codes.astype(np.int32)
+            values = np.asarray(uniques).tolist()
+
+            self.values[col] = values
+            self.codes[col] = codes
+            self._lookup[col] = {value: i for i, value in enumerate(values)}
+
+            if len(values) <= BITMAP_MAX_CARDINALITY:
+                self.bitmaps[col] = [np.packbits(codes == i) for i in range(len(values))]
+            else:
+                # Rows grouped by value: order[offsets[i]:offsets[i + 1]] holds value i
+                order = np.argsort(codes, kind='stable').astype(np.int32)
+                offsets = np.searchsorted(codes[order], np.arange(len(values) + 1))
+                self.postings[col] = (order, offsets)
+
+        # Sorted index for the range slider
+        range_values = df[range_column].to_numpy()
+        self.range_order = np.argsort(range_values, kind='stable').astype(np.int32)
+        self.range_sorted = range_values[self.range_order]
+
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def _rows_to_bits(self, rows):
+        """Pack a row-index array into a bitmap"""
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask)
+
+    def value_codes(self, col, selected):
+        """Codes of the selected values that exist in col"""
+        lookup = self._lookup[col]
+        return [lookup[v] for v in selected if v in lookup]
+
+    def value_bits(self, col, selected):
+        """Bitmap of rows whose col value is in selected"""
+        codes = self.value_codes(col, selected)
+
+        if col in self.bitmaps:
+            bits = np.zeros_like(self._all)
+            for code in codes:
+                bits |= self.bitmaps[col][code]
+            return bits
+
+        return self._rows_to_bits(self.value_rows(col, selected))
+
+    def value_rows(self, col, selected):
+        """Row indices whose col value is in selected (posting-list columns)"""
+        order, offsets = self.postings[col]
+        codes = self.value_codes(col, selected)
+        if not codes:
+            return np.empty(0, dtype=np.int32)
+        return np.concatenate([order[offsets[c]:offsets[c + 1]] for c in codes])
+
+    def range_rows(self, low, high):
+        """Row indices with low <= value <= high via binary search"""
+        # Compare at the stored precision, like the column itself would
+        low, high = self.range_sorted.dtype.type(low), self.range_sorted.dtype.type(high)
+        start = np.searchsorted(self.range_sorted, low, side='left')
+        stop = np.searchsorted(self.range_sorted, high, side='right')
+        return self.range_order[start:stop]
+
+    def select(self, conditions, value_range=None):
+        """Resolve a filter combination to one sorted row-index array
+
+        conditions maps column -> selected values (empty/None = no filter),
+        value_range is an optional (low, high) on the range column.
+        """
+        bits = self._all.copy()
+
+        for col, selected in conditions.items():
+            if selected:
+                bits &= self.value_bits(col, selected)
+
+        if value_range is not None:
+            low, high = value_range
+            if low > self.range_sorted[0] or high < self.range_sorted[-1]:
+                bits &= self._rows_to_bits(self.range_rows(low, high))
+
+        return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
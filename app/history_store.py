@@ -0,0 +1,183 @@
+"""
+SNAPSHOT HISTORY STORE
+Append-only, cycle-partitioned Parquet store of scored snapshots with 9-box comparisons
+
+The store lives in NINEBOX_HISTORY_DIR, or app/history when it is unset;
+writers (pipeline --cycle, this CLI) and the dashboard resolve it the same way.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import argparse
+import os
+import uuid
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_store import optimize_dtypes, read_csv_typed
+from scoring import BOX_LABELS
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_HISTORY_DIR = Path(__file__).parent / "history"
+
+# Hive-style partition key: history/cycle=YYYY-MM-DD/part-*.parquet
+PARTITION_KEY = 'cycle'
+
+# Columns read for a comparison (plus employee_id)
+COMPARE_COLUMNS = ['box_category', 'potential', 'department', 'role_level']
+
+
+# ============================================================
+# WRITING
+# ============================================================
+
+def history_dir(root=None):
+    """Store directory: root if given, else NINEBOX_HISTORY_DIR, else app/history"""
+    if root is not None:
+        return Path(root)
+    return Path(os.environ.get('NINEBOX_HISTORY_DIR', DEFAULT_HISTORY_DIR))
+
+def cycle_label(cycle_date):
+    """Normalize a date / ISO string to the YYYY-MM-DD partition value"""
+    if isinstance(cycle_date, str):
+        cycle_date = date.fromisoformat(cycle_date)
+    return cycle_date.isoformat()
+
+def append_snapshot(df, cycle_date, root=None):
+    """Append a scored snapshot as a new part file in its cycle partition"""
+    partition = history_dir(root) / f"{PARTITION_KEY}={cycle_label(cycle_date)}"
+    partition.mkdir(parents=True, exist_ok=True)
+
+    snapshot = optimize_dtypes(df.drop_duplicates('employee_id', keep='last'))
+
+    # Part names sort by write time so the latest part wins on read
+    part = partition / f"part-{pd.Timestamp.now('UTC').strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}.parquet"
+    snapshot.to_parquet(part, engine='pyarrow', index=False)
+    return part
+
+
+# ============================================================
+# READING
+# ============================================================
+
+def list_cycles(root=None):
+    """Sorted cycle labels present in the store"""
+    root = history_dir(root)
+    if not root.exists():
+        return []
+    return sorted(
+        p.name.split('=', 1)[1] for p in root.iterdir()
+        if p.is_dir() and p.name.startswith(f"{PARTITION_KEY}=") and any(p.glob('*.parquet'))
+    )
+
+def cycle_parts(cycle, root=None):
+    """Part files of one cycle, oldest first; doubles as a cache version stamp"""
+    return sorted((history_dir(root) / f"{PARTITION_KEY}={cycle_label(cycle)}").glob('*.parquet'))
+
+def read_cycle(cycle, columns=None, root=None):
+    """Read one cycle partition (only the requested columns), deduplicated on employee_id"""
+    import pyarrow.parquet as pq
+
+    if columns is not None:
+        columns = ['employee_id'] + [c for c in columns if c != 'employee_id']
+
+    parts = cycle_parts(cycle, root)
+    frames = [pq.read_table(part, columns=columns, memory_map=True).to_pandas() for part in parts]
+    if not frames:
+        raise FileNotFoundError(f"No snapshot stored for cycle {cycle}")
+
+    snapshot = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return snapshot.drop_duplicates('employee_id', keep='last').reset_index(drop=True)
+
+def box_code_array(box_category):
+    """Box labels -> codes indexing scoring.BOX_LABELS (-1 if unknown)"""
+    return pd.Categorical(np.asarray(box_category, dtype=object), categories=BOX_LABELS).codes
+
+
+# ============================================================
+# COMPARISON
+# ============================================================
+
+def transition_matrix(codes_before, codes_after):
+    """9x9 counts of employees moving from box (row) to box (column)"""
+    n_boxes = len(BOX_LABELS)
+    valid = (codes_before >= 0) & (codes_after >= 0)
+    flat = codes_before[valid].astype(np.int64) * n_boxes + codes_after[valid]
+    counts = np.bincount(flat, minlength=n_boxes * n_boxes).reshape(n_boxes, n_boxes)
+    return pd.DataFrame(counts, index=pd.Index(BOX_LABELS, name='from'), columns=pd.Index(BOX_LABELS, name='to'))
+
+def compare_cycles(before, after, root=None, columns=COMPARE_COLUMNS):
+    """Transition matrix and per-employee movement between two cycles"""
+    old = read_cycle(before, columns, root)
+    new = read_cycle(after, columns, root)
+
+    # Align employees present in both cycles
+    merged = old.merge(new, on='employee_id', suffixes=('_before', '_after'), sort=False)
+    codes_before = box_code_array(merged['box_category_before'])
+    codes_after = box_code_array(merged['box_category_after'])
+    valid = (codes_before >= 0) & (codes_after >= 0)
+
+    movement = pd.DataFrame({
+        'employee_id': merged['employee_id'].astype(str),
+        'box_before': merged['box_category_before'].astype(str),
+        'box_after': merged['box_category_after'].astype(str),
+        'potential_before': merged['potential_before'].to_numpy(dtype=np.float64),
+        'potential_after': merged['potential_after'].to_numpy(dtype=np.float64),
+        # Band moves: +1 = one band up, -1 = one band down
+        'potential_move': np.where(valid, codes_after // 3 - codes_before // 3, 0),
+        'performance_move': np.where(valid, codes_after % 3 - codes_before % 3, 0)
+    })
+    movement['potential_change'] = movement['potential_after'] - movement['potential_before']
+    for col in ['department', 'role_level']:
+        if f"{col}_after" in merged.columns:
+            movement[col] = merged[f"{col}_after"].astype(str).to_numpy()
+
+    return {
+        'matrix': transition_matrix(codes_before, codes_after),
+        'movement': movement,
+        'joined': len(merged),
+        'left': len(old) - len(merged),
+        'joined_new': len(new) - len(merged)
+    }
+
+def box_history(cycles, root=None):
+    """Wide employee x cycle table of box codes, reading only box_category per partition"""
+    series = []
+    for cycle in cycles:
+        snapshot = read_cycle(cycle, ['box_category'], root)
+        series.append(pd.Series(box_code_array(snapshot['box_category']), index=snapshot['employee_id'].astype(str), name=cycle_label(cycle)))
+    return pd.concat(series, axis=1).fillna(-1).astype(np.int8)
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the scored snapshot history")
+    parser.add_argument('--root', default=None, help='history store directory (default: NINEBOX_HISTORY_DIR or app/history)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    append_cmd = commands.add_parser('append', help='append a final_data CSV/Parquet as a review cycle')
+    append_cmd.add_argument('source', help='final_data.csv or final_data.parquet')
+    append_cmd.add_argument('--cycle', required=True, help='cycle date, YYYY-MM-DD')
+
+    commands.add_parser('list', help='list stored cycles')
+
+    args = parser.parse_args()
+    if args.command == 'append':
+        source = Path(args.source)
+        df = pd.read_parquet(source) if source.suffix == '.parquet' else read_csv_typed(source)
+        part = append_snapshot(df, args.cycle, args.root)
+        print(f"Appended {len(df):,} rows to {part}")
+    else:
+        for cycle in list_cycles(args.root):
+            print(cycle)
@@ -0,0 +1,58 @@
+"""
+ID SEARCH
+Prefix / typeahead lookup over employee and manager IDs
+
+IDs are held once in a sorted array; a prefix is two binary searches, so
+each keystroke returns the top-k matches without touching the full list.
+Selected IDs resolve to rows through FilterIndex posting lists.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Matches offered per keystroke
+TOP_K = 50
+
+# Sorts after every character a prefix can be followed by
+_PREFIX_END = chr(0x10FFFF)
+
+
+# ============================================================
+# ID SEARCH
+# ============================================================
+
+class IdSearch:
+    """Sorted ID array answering prefix queries with two binary searches"""
+
+    def __init__(self, ids):
+        ids = np.asarray(ids, dtype=str)
+        # Case-insensitive: search upper-cased keys, return the original IDs
+        keys = np.char.upper(ids)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.ids = ids[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def normalize(self, query):
+        """Query as a search key: trimmed and upper-cased"""
+        return (query or '').strip().upper()
+
+    def prefix_range(self, prefix):
+        """[start, stop) positions of the IDs starting with prefix"""
+        start = int(np.searchsorted(self.keys, prefix, side='left'))
+        stop = int(np.searchsorted(self.keys, prefix + _PREFIX_END, side='left'))
+        return start, stop
+
+    def matches(self, query, k=TOP_K):
+        """First k IDs (in sort order) starting with query, and the total match count"""
+        start, stop = self.prefix_range(self.normalize(query))
+        return self.ids[start:min(stop, start + k)].tolist(), stop - start
@@ -0,0 +1,276 @@
+"""
+MODEL FITTING ENGINE
+Vectorized IRLS logit fits with parallel bootstrap and k-fold validation
+
+Resamples are expressed as frequency weights over one shared-memory design
+matrix, so worker processes never copy the data. A replicate or fold whose
+fit fails (singular Hessian, perfect separation) is dropped and counted
+rather than aborting the run: bootstrap rows come back as NaN and folds with
+NaN metrics, and the validation report says how many were lost.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+MAX_ITER = 50
+TOL = 1e-8
+
+N_BOOTSTRAP = 200
+N_FOLDS = 5
+CI_LEVEL = 0.95
+
+# Bootstrap replicates handed to a worker per task
+REPLICATES_PER_TASK = 10
+
+# Employees scored per block when computing potential bands
+BAND_BLOCK_ROWS = 16384
+
+VALIDATION_FILE = "model_validation.json"
+
+
+# ============================================================
+# IRLS SOLVER
+# ============================================================
+
+def sigmoid(z):
+    """Logistic function (exp overflow on separated fits saturates to 0, as it should)"""
+    with np.errstate(over='ignore'):
+        return 1.0 / (1.0 + np.exp(-z))
+
+def fit_logit(X, y, weights=None, beta0=None, max_iter=MAX_ITER, tol=TOL):
+    """Newton/IRLS logit fit; X must include the intercept column
+
+    weights are frequency weights (bootstrap counts, or 0/1 fold masks),
+    beta0 warm-starts the solver (e.g. from the full-sample fit). Raises
+    ValueError when the fit is singular, diverges or does not converge.
+    """
+    n, p = X.shape
+    w = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    beta = np.zeros(p) if beta0 is None else np.array(beta0, dtype=np.float64)
+
+    for _ in range(max_iter):
+        mu = sigmoid(X @ beta)
+        grad = X.T @ (w * (y - mu))
+        hessian = (X * (w * mu * (1.0 - mu))[:, None]).T @ X
+        try:
+            step = np.linalg.solve(hessian, grad)
+        except np.linalg.LinAlgError:
+            raise ValueError("Singular Hessian: collinear design or perfectly separated outcome") from None
+        beta += step
+        if not np.all(np.isfinite(beta)):
+            raise ValueError("Logit fit diverged to non-finite coefficients")
+        if np.max(np.abs(step)) < tol:
+            return beta
+    raise ValueError(f"Logit fit did not converge in {max_iter} iterations; the outcome may be perfectly separated")
+
+def completed(betas):
+    """Bootstrap rows whose fit succeeded (failed replicates are NaN rows)"""
+    betas = np.asarray(betas, dtype=np.float64)
+    return betas[np.isfinite(betas).all(axis=1)]
+
+def design_matrix(df, features):
+    """Intercept plus model features as a C-contiguous float64 matrix"""
+    X = np.empty((len(df), len(features) + 1), dtype=np.float64)
+    X[:, 0] = 1.0
+    for j, feature in enumerate(features, start=1):
+        X[:, j] = df[feature].to_numpy(dtype=np.float64)
+    return X
+
+
+# ============================================================
+# SHARED MEMORY
+# ============================================================
+
+# Arrays attached in each worker process
+_shared = {}
+
+class SharedArrays:
+    """Copy arrays into named shared memory once; workers attach by name"""
+
+    def __init__(self, **arrays):
+        from multiprocessing.shared_memory import SharedMemory
+
+        self.blocks = []
+        self.spec = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            block = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+            self.blocks.append(block)
+            self.spec[name] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+
+def _attach(spec):
+    """Pool initializer: map the shared arrays into this worker"""
+    from multiprocessing.shared_memory import SharedMemory
+
+    for name, (block_name, shape, dtype) in spec.items():
+        # Workers share the parent's resource tracker, so attaching is idempotent
+        block = SharedMemory(name=block_name)
+        _shared[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+        _shared[f"_{name}_block"] = block
+
+
+# ============================================================
+# WORKER TASKS
+# ============================================================
+
+def _bootstrap_task(seeds, beta0):
+    """Fit one bootstrap replicate per seed (multinomial row counts as weights); failed fits are NaN rows"""
+    X, y = _shared['X'], _shared['y']
+    n = len(y)
+    betas = np.full((len(seeds), X.shape[1]), np.nan)
+    for i, seed in enumerate(seeds):
+        rng = np.random.default_rng(seed)
+        counts = np.bincount(rng.integers(0, n, n), minlength=n).astype(np.float64)
+        try:
+            betas[i] = fit_logit(X, y, weights=counts, beta0=beta0)
+        except ValueError:
+            pass
+    return betas
+
+def _fold_task(fold, folds, beta0, threshold, f_beta):
+    """Fit on every fold but one and score the held-out fold; a failed fit scores NaN"""
+    X, y = _shared['X'], _shared['y']
+    held_out = folds == fold
+    try:
+        beta = fit_logit(X, y, weights=(~held_out).astype(np.float64), beta0=beta0)
+    except ValueError:
+        nan = float('nan')
+        return {'fold': int(fold), 'n': int(held_out.sum()), 'precision': nan, 'recall': nan, f'f{f_beta:g}': nan}
+
+    predicted = sigmoid(X[held_out] @ beta) >= threshold
+    actual = y[held_out] == 1
+    tp = np.sum(predicted & actual)
+    precision = tp / max(predicted.sum(), 1)
+    recall = tp / max(actual.sum(), 1)
+    b2 = f_beta ** 2
+    f_score = (1 + b2) * precision * recall / max(b2 * precision + recall, 1e-12)
+    return {'fold': int(fold), 'n': int(held_out.sum()), 'precision': precision, 'recall': recall, f'f{f_beta:g}': f_score}
+
+def _detach():
+    """Drop this process's views of the shared arrays"""
+    blocks = [v for k, v in _shared.items() if k.startswith('_')]
+    _shared.clear()
+    for block in blocks:
+        block.close()
+
+def _run(tasks, spec, n_workers):
+    """Run (function, args) tasks across a process pool attached to the shared arrays"""
+    if n_workers == 1:
+        _attach(spec)
+        try:
+            return [fn(*args) for fn, args in tasks]
+        finally:
+            _detach()
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_attach, initargs=(spec,)) as pool:
+        futures = [pool.submit(fn, *args) for fn, args in tasks]
+        return [f.result() for f in futures]
+
+
+# ============================================================
+# RESAMPLING API
+# ============================================================
+
+def bootstrap_coefficients(X, y, n_boot=N_BOOTSTRAP, seed=42, n_workers=None):
+    """Full-sample fit plus n_boot warm-started bootstrap refits, as a (n_boot, p) array (NaN rows failed)"""
+    n_workers = n_workers or os.cpu_count() or 1
+    y = np.asarray(y, dtype=np.float64)
+    beta_full = fit_logit(X, y)
+
+    seeds = np.random.SeedSequence(seed).generate_state(n_boot)
+    tasks = [
+        (_bootstrap_task, (seeds[i:i + REPLICATES_PER_TASK].tolist(), beta_full))
+        for i in range(0, n_boot, REPLICATES_PER_TASK)
+    ]
+    with SharedArrays(X=X, y=y) as shared:
+        betas = np.vstack(_run(tasks, shared.spec, n_workers))
+    return beta_full, betas
+
+def coefficient_intervals(names, beta_full, betas, level=CI_LEVEL):
+    """Percentile bootstrap confidence intervals per coefficient, over the completed replicates"""
+    kept = completed(betas)
+    alpha = (1 - level) / 2
+    low, high = np.quantile(kept, [alpha, 1 - alpha], axis=0)
+    intervals = pd.DataFrame({
+        'variable': names,
+        'estimate': beta_full,
+        'boot_se': kept.std(axis=0, ddof=1),
+        'ci_low': low,
+        'ci_high': high
+    })
+    intervals.attrs['n_bootstrap'] = len(kept)
+    intervals.attrs['n_bootstrap_failed'] = len(betas) - len(kept)
+    return intervals
+
+def potential_bands(X, betas, level=CI_LEVEL, block_rows=BAND_BLOCK_ROWS):
+    """Per-employee percentile bands of predicted potential across the completed bootstrap fits"""
+    betas = completed(betas)
+    alpha = (1 - level) / 2
+    low = np.empty(len(X))
+    high = np.empty(len(X))
+    betas_t = np.ascontiguousarray(betas.T)
+    for start in range(0, len(X), block_rows):
+        block = sigmoid(X[start:start + block_rows] @ betas_t)
+        low[start:start + block_rows], high[start:start + block_rows] = np.quantile(block, [alpha, 1 - alpha], axis=1)
+    return low, high
+
+def cross_validate(X, y, n_folds=N_FOLDS, threshold=0.14, f_beta=2, seed=42, n_workers=None):
+    """k-fold out-of-sample precision, recall and F-beta at the threshold (NaN for folds that failed to fit)"""
+    n_workers = n_workers or min(n_folds, os.cpu_count() or 1)
+    y = np.asarray(y, dtype=np.float64)
+    beta_full = fit_logit(X, y)
+
+    folds = np.random.default_rng(seed).permutation(len(y)) % n_folds
+    tasks = [(_fold_task, (fold, folds, beta_full, threshold, f_beta)) for fold in range(n_folds)]
+    with SharedArrays(X=X, y=y) as shared:
+        results = _run(tasks, shared.spec, n_workers)
+    return pd.DataFrame(results)
+
+
+# ============================================================
+# VALIDATION REPORT
+# ============================================================
+
+def validation_report(intervals, cv, level=CI_LEVEL):
+    """JSON-ready summary of coefficient intervals and cross-validated metrics"""
+    metrics = [c for c in cv.columns if c not in ('fold', 'n')]
+    return {
+        'ci_level': level,
+        'n_bootstrap': int(intervals.attrs.get('n_bootstrap', 0)),
+        'n_bootstrap_failed': int(intervals.attrs.get('n_bootstrap_failed', 0)),
+        'coefficients': intervals.to_dict(orient='records'),
+        'cv_folds': cv.to_dict(orient='records'),
+        'cv_failed_folds': int(cv[metrics].isna().any(axis=1).sum()),
+        'cv_mean': {m: float(cv[m].mean()) for m in metrics}
+    }
+
+def load_validation(path):
+    """Read a validation report, or None if the pipeline has not produced one"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
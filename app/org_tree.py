@@ -0,0 +1,248 @@
+"""
+ORG TREE INDEX
+Manager hierarchy as parent-pointer arrays with Euler-tour intervals and per-subtree 9-box rollups
+
+Every employee and every manager_id becomes a node; managers who are not in
+the extract (e.g. executives above the scored population) are virtual nodes
+with no row. A preorder walk numbers the nodes so each subtree is one
+contiguous interval [tin, tout), and rows are laid out in that order, so
+"everyone under manager X" is a single slice and subtree totals are two
+prefix-sum lookups.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+
+from scoring import BOX_LABELS
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Filter-state key for "entire org under these managers"
+ORG_KEY = 'org_manager'
+
+
+# ============================================================
+# ORG TREE
+# ============================================================
+
+class OrgTree:
+    """Parent-pointer org tree over employee_id / manager_id with O(1) subtree slices"""
+
+    def __init__(self, df, id_column='employee_id', parent_column='manager_id', box_column='box_category'):
+        employee_ids = df[id_column].astype(str).to_numpy()
+        manager_ids = df[parent_column].astype(str).to_numpy()
+
+        # Nodes: every employee plus every manager referenced (hash factorize, no string sort)
+        codes, uniques = pd.factorize(np.concatenate([employee_ids, manager_ids]))
+        self.ids = np.asarray(uniques, dtype=object)
+        self.id_index = pd.Index(uniques)
+        n_nodes = len(self.ids)
+        self.row_node = codes[:len(employee_ids)].astype(np.int32)
+        self.present = np.zeros(n_nodes, dtype=bool)
+        self.present[self.row_node] = True
+
+        # Parent pointers (-1 = root); on duplicate employee rows the last wins
+        self.parent = np.full(n_nodes, -1, dtype=np.int32)
+        self.parent[self.row_node] = codes[len(employee_ids):]
+
+        self._link()
+        if len(self.unreached):
+            # Reporting loops are unreachable from any root: cut them and relink
+            self._break_cycles(self.unreached)
+            self._link()
+
+        # Rows laid out in preorder: a subtree's rows are one slice
+        self.row_order = np.argsort(self.tin[self.row_node], kind='stable').astype(np.int32)
+        rows_per_node = np.bincount(self.row_node, minlength=n_nodes)
+        row_prefix = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(rows_per_node[self.preorder], out=row_prefix[1:])
+        self.row_prefix = row_prefix
+
+        # Per-node 9-box and promotion counts, prefix-summed over preorder positions
+        box_codes = pd.Categorical(df[box_column].astype(str), categories=BOX_LABELS).codes
+        valid = box_codes >= 0
+        node_boxes = np.zeros((n_nodes, len(BOX_LABELS)), dtype=np.int64)
+        np.add.at(node_boxes, (self.row_node[valid], box_codes[valid]), 1)
+        node_promoted = np.bincount(self.row_node, weights=df['promoted'].to_numpy(dtype=np.float64), minlength=n_nodes)
+
+        self.box_prefix = np.zeros((n_nodes + 1, len(BOX_LABELS)), dtype=np.int64)
+        np.cumsum(node_boxes[self.preorder], axis=0, out=self.box_prefix[1:])
+        self.promoted_prefix = np.zeros(n_nodes + 1)
+        np.cumsum(node_promoted[self.preorder], out=self.promoted_prefix[1:])
+
+    def _link(self):
+        """Children CSR, then depth, subtree size and preorder intervals, one tree level at a time"""
+        n_nodes = len(self.parent)
+        has_parent = np.flatnonzero(self.parent >= 0)
+        self.child_nodes = has_parent[np.argsort(self.parent[has_parent], kind='stable')].astype(np.int32)
+        self.child_offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.parent[has_parent], minlength=n_nodes), out=self.child_offsets[1:])
+
+        # Breadth-first levels from the roots
+        levels = [np.flatnonzero(self.parent < 0)]
+        self.depth = np.full(n_nodes, -1, dtype=np.int32)
+        self.depth[levels[0]] = 0
+        while True:
+            children = self._children_of(levels[-1])
+            if not len(children):
+                break
+            self.depth[children] = len(levels)
+            levels.append(children)
+        self.unreached = np.flatnonzero(self.depth < 0)
+
+        # Subtree sizes, deepest level first
+        size = np.ones(n_nodes, dtype=np.int64)
+        for level in levels[:0:-1]:
+            np.add.at(size, self.parent[level], size[level])
+
+        # Preorder entry times: parent's tin + 1 + sizes of earlier siblings
+        self.tin = np.zeros(n_nodes, dtype=np.int64)
+        roots = levels[0]
+        self.tin[roots] = np.cumsum(size[roots]) - size[roots]
+        sibling_cumsum = np.concatenate([[0], np.cumsum(size[self.child_nodes])])
+        position = np.empty(n_nodes, dtype=np.int64)
+        position[self.child_nodes] = np.arange(len(self.child_nodes))
+        for level in levels[1:]:
+            parents = self.parent[level]
+            earlier = sibling_cumsum[position[level]] - sibling_cumsum[self.child_offsets[parents]]
+            self.tin[level] = self.tin[parents] + 1 + earlier
+        self.tout = self.tin + size
+
+        reached = self.depth >= 0
+        self.preorder = np.empty(int(reached.sum()), dtype=np.int32)
+        self.preorder[self.tin[reached]] = np.flatnonzero(reached)
+
+    def _children_of(self, nodes):
+        """All children of a set of nodes, via the CSR offsets"""
+        starts = self.child_offsets[nodes]
+        counts = self.child_offsets[nodes + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.array([], dtype=np.int64)
+        shift = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        return self.child_nodes[shift + np.arange(total)].astype(np.int64)
+
+    def _break_cycles(self, nodes):
+        """Make one node of every reporting loop among nodes a root"""
+        state = np.zeros(len(self.parent), dtype=np.int8)  # 0 = unseen, 1 = on current path, 2 = done
+        for start in nodes:
+            path = []
+            node = int(start)
+            while node >= 0 and state[node] == 0:
+                state[node] = 1
+                path.append(node)
+                node = int(self.parent[node])
+            if node >= 0 and state[node] == 1:
+                self.parent[node] = -1
+            state[path] = 2
+
+    # ------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------
+
+    def node(self, employee_id):
+        """Node index of an ID, or -1 if it is not in the tree"""
+        position = self.id_index.get_indexer([str(employee_id)])[0]
+        return int(position)
+
+    def managers(self):
+        """IDs of every node with at least one report, in ID order"""
+        return sorted(self.ids[np.diff(self.child_offsets) > 0].tolist())
+
+    def direct_reports(self, employee_id):
+        """IDs reporting directly to a node, in ID order"""
+        node = self.node(employee_id)
+        if node < 0:
+            return []
+        return sorted(self.ids[self.child_nodes[self.child_offsets[node]:self.child_offsets[node + 1]]].tolist())
+
+    def chain(self, employee_id):
+        """Management chain from the top of the tree down to the node"""
+        node = self.node(employee_id)
+        path = []
+        while node >= 0:
+            path.append(self.ids[node])
+            node = self.parent[node]
+        return path[::-1]
+
+    def org_size(self, employee_id):
+        """Everyone under a node, at any depth, in O(1)"""
+        node = self.node(employee_id)
+        if node < 0:
+            return 0
+        return int(self.row_prefix[self.tout[node]] - self.row_prefix[self.tin[node] + 1])
+
+    def _interval(self, node, include_self):
+        """Preorder interval of a node's subtree (optionally without the node)"""
+        return self.tin[node] + (0 if include_self else 1), self.tout[node]
+
+    def subtree_rows(self, manager_ids, include_self=False):
+        """Sorted rows of everyone under the given managers, recursively"""
+        intervals = []
+        for manager_id in manager_ids:
+            node = self.node(manager_id)
+            if node >= 0:
+                intervals.append(self._interval(node, include_self))
+        if not intervals:
+            return np.array([], dtype=np.int32)
+
+        # Nested subtrees collapse: keep intervals not covered by an earlier one
+        intervals.sort()
+        merged = []
+        for start, end in intervals:
+            if merged and start < merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+
+        rows = np.concatenate([
+            self.row_order[self.row_prefix[start]:self.row_prefix[end]] for start, end in merged
+        ])
+        return np.sort(rows)
+
+    # ------------------------------------------------------------
+    # Rollups
+    # ------------------------------------------------------------
+
+    def rollup(self, manager_ids=None, include_self=False):
+        """Per-manager subtree headcount, 9-box counts and promotion rate from prefix sums"""
+        if manager_ids is None:
+            manager_ids = self.managers()
+        nodes = self.id_index.get_indexer([str(m) for m in manager_ids])
+        nodes = nodes[nodes >= 0]
+
+        start = self.tin[nodes] + (0 if include_self else 1)
+        end = self.tout[nodes]
+        boxes = self.box_prefix[end] - self.box_prefix[start]
+        headcount = self.row_prefix[end] - self.row_prefix[start]
+        promoted = self.promoted_prefix[end] - self.promoted_prefix[start]
+
+        rollup = pd.DataFrame({
+            'manager_id': self.ids[nodes],
+            'in_data': self.present[nodes],
+            'depth': self.depth[nodes],
+            'direct_reports': (self.child_offsets[nodes + 1] - self.child_offsets[nodes]),
+            'headcount': headcount,
+            'promotion_rate': np.divide(promoted, headcount, out=np.zeros(len(nodes)), where=headcount > 0)
+        })
+        box_counts = pd.DataFrame(boxes, columns=BOX_LABELS)
+        return pd.concat([rollup, box_counts], axis=1)
+
+
+# ============================================================
+# FILTERING
+# ============================================================
+
+def select_rows(index, tree, conditions, value_range=None):
+    """FilterIndex.select plus the recursive org filter under ORG_KEY"""
+    org_managers = conditions.get(ORG_KEY)
+    rows = index.select({col: sel for col, sel in conditions.items() if col != ORG_KEY}, value_range)
+    if org_managers:
+        rows = np.intersect1d(rows, tree.subtree_rows(org_managers), assume_unique=True)
+    return rows
@@ -0,0 +1,405 @@
+"""
+HEADLESS SCORING PIPELINE
+Scriptable version of the notebook path from emp_dataset.csv to final_data.csv
+
+Stages: clean -> encode -> split -> fit -> diagnostics -> bootstrap -> validate
+-> predict -> grid -> write. The bootstrap and validate stages add per-employee
+potential bands, coefficient intervals and cross-validated recall/F2 (see
+model_fit); --bootstrap 0 skips them and publishes neither the band columns
+nor the validation report.
+Each stage output is cached on disk under a hash of its inputs and parameters,
+so a threshold or cutoff change re-runs only predict/grid/write.
+The split and fit stages use scikit-learn and statsmodels, like the notebook.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import argparse
+import hashlib
+import json
+import logging
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_store import build_store, source_fingerprint
+from diagnostics import vif, logit_influence, diagnostics_report
+from model_fit import (
+    VALIDATION_FILE, N_BOOTSTRAP, N_FOLDS,
+    design_matrix, bootstrap_coefficients, coefficient_intervals,
+    potential_bands, cross_validate, validation_report
+)
+from scoring import (
+    Q_LOW, Q_HIGH, MODEL_FILE, BAND_COLUMNS,
+    LogitScorer, export_coefficients, potential_cutoffs, classify_boxes
+)
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+REPO_DIR = Path(__file__).parent.parent
+DEFAULT_SOURCE = REPO_DIR / "data" / "emp_dataset.csv"
+DEFAULT_CACHE_DIR = REPO_DIR / ".cache" / "pipeline"
+
+# Rows per chunk when streaming the employee extract
+CHUNK_ROWS = 100_000
+
+# Extract column types, fixed so every chunk writes the same Parquet schema
+ID_COLUMNS = ['employee_id', 'manager_id', 'department', 'role_level', 'education_level']
+EXTRACT_DTYPES = {
+    **{col: 'str' for col in ID_COLUMNS},
+    'years_in_company': 'int64',
+    'years_in_role': 'int64',
+    'performance_rating': 'int64',
+    'awards': 'int64',
+    'kpis_count': 'int64',
+    'kpis_achieved_pct': 'float64',
+    'peer_review_score': 'int64',
+    'training_courses_completed': 'int64',
+    'certification_count': 'int64',
+    'mentorship_participation': 'int64',
+    'projects_delivered': 'int64',
+    'salary': 'int64',
+    'performance_intervention': 'int64',
+    'promoted': 'int64'
+}
+
+# Cleaning rules: new hires (under a year of tenure) and rows missing these columns are dropped
+MIN_TENURE_YEARS = 1
+REQUIRED_COLUMNS = ['manager_id']
+
+# Bump when the clean stage changes what it writes for the same extract and rules
+CLEAN_VERSION = 1
+
+THRESHOLD = 0.14
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+ROLE_MAPPING = {'IC1': 1, 'IC2': 2, 'IC3': 3, 'IC4': 4, 'M1': 5, 'M2': 6, 'M3': 7}
+EDU_MAPPING = {'High School': 1, 'Associates': 2, 'Other': 3, 'Bachelors': 4, 'Masters': 5, 'PhD': 6}
+
+INDEPENDENT_NUMERIC = [
+    'years_in_role',
+    'performance_rating',
+    'awards',
+    'kpis_achieved_pct',
+    'peer_review_score',
+    'training_courses_completed',
+    'certification_count',
+    'mentorship_participation',
+    'projects_delivered'
+]
+INDEPENDENT_CATEGORICAL = ['role_level_encoded', 'education_level_encoded']
+DEPENDENT_VAR = 'promoted'
+
+MODEL_FORMULA = (
+    "promoted ~ years_in_role + performance_rating + awards + "
+    "kpis_achieved_pct + peer_review_score + training_courses_completed + "
+    "certification_count + projects_delivered + role_level_encoded + "
+    "education_level_encoded"
+)
+
+DIAGNOSTICS_FILE = "model_diagnostics.json"
+
+log = logging.getLogger("pipeline")
+
+
+# ============================================================
+# STAGE CACHE
+# ============================================================
+
+def stage_key(name, upstream, params):
+    """Cache key for a stage: its name, upstream keys and parameters"""
+    payload = json.dumps({'stage': name, 'upstream': upstream, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class StageCache:
+    """On-disk cache of stage outputs (frames as Parquet, dicts as JSON)
+
+    A streamed stage is given the Parquet path to write itself, so its output
+    never has to be held in memory in pieces; it is read back once.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, force=False):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.force = force
+
+    def run(self, name, upstream, params, build, stream=False):
+        """Return (output, key) for a stage, building and storing it on a miss"""
+        key = stage_key(name, upstream, params)
+        frame_path = self.cache_dir / f"{name}-{key}.parquet"
+        json_path = self.cache_dir / f"{name}-{key}.json"
+
+        if not self.force and frame_path.exists():
+            log.info("%-11s cached  (%s)", name, key)
+            return pd.read_parquet(frame_path), key
+        if not self.force and json_path.exists():
+            log.info("%-11s cached  (%s)", name, key)
+            return json.loads(json_path.read_text()), key
+
+        start = time.perf_counter()
+        if stream:
+            # Written under a temporary name so a failed build leaves no cache entry
+            partial_path = frame_path.with_suffix('.partial')
+            build(partial_path)
+            partial_path.replace(frame_path)
+            output = pd.read_parquet(frame_path)
+        else:
+            output = build()
+            if isinstance(output, pd.DataFrame):
+                output.to_parquet(frame_path, engine='pyarrow', index=False)
+            else:
+                json_path.write_text(json.dumps(output, indent=2))
+        log.info("%-11s built   (%s) in %.2fs", name, key, time.perf_counter() - start)
+        return output, key
+
+
+# ============================================================
+# STAGES
+# ============================================================
+
+def clean_frame(df):
+    """Drop new hires and rows without a manager"""
+    df = df[df['years_in_company'] >= MIN_TENURE_YEARS]
+    return df.dropna(subset=REQUIRED_COLUMNS)
+
+def clean_stage(source, path, chunk_rows=CHUNK_ROWS):
+    """Stream the extract in chunks to a Parquet file, dropping new hires and rows without a manager"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in pd.read_csv(source, dtype=EXTRACT_DTYPES, chunksize=chunk_rows):
+            table = pa.Table.from_pandas(clean_frame(chunk), preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        raise ValueError(f"Employee extract is empty: {source}")
+
+def encode_stage(df_cleaned):
+    """Ordinal encodings for role and education level"""
+    df_encoded = df_cleaned.copy()
+    df_encoded['role_level_encoded'] = df_encoded['role_level'].map(ROLE_MAPPING)
+    df_encoded['education_level_encoded'] = df_encoded['education_level'].map(EDU_MAPPING)
+    return df_encoded
+
+def model_frame(df_encoded):
+    """Model columns in the notebook's order"""
+    return df_encoded[INDEPENDENT_NUMERIC + INDEPENDENT_CATEGORICAL + [DEPENDENT_VAR]]
+
+def split_stage(df_encoded, test_size=TEST_SIZE, random_state=RANDOM_STATE):
+    """Train/test split, returned as one frame with an is_test flag"""
+    from sklearn.model_selection import train_test_split
+
+    df_model = model_frame(df_encoded)
+    X = df_model.drop(columns=[DEPENDENT_VAR])
+    y = df_model[DEPENDENT_VAR]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=random_state)
+
+    training_data = pd.concat([y_train, X_train], axis=1).assign(is_test=False)
+    testing_data = pd.concat([y_test, X_test], axis=1).assign(is_test=True)
+    return pd.concat([training_data, testing_data])
+
+def fit_stage(split, threshold=THRESHOLD):
+    """Fit the standardized logit on the training rows and export its coefficients"""
+    from statsmodels.formula.api import logit
+
+    training_data = split[~split['is_test']].drop(columns='is_test')
+    mdl_standardized = logit(MODEL_FORMULA, data=training_data).fit(disp=0)
+    return export_coefficients(mdl_standardized.params, ROLE_MAPPING, EDU_MAPPING, threshold, path=None)
+
+def training_matrix(split, features):
+    """Intercept + feature design matrix and outcome for the training rows"""
+    training_data = split[~split['is_test']]
+    return design_matrix(training_data, features), training_data[DEPENDENT_VAR].to_numpy(dtype=np.float64)
+
+def diagnostics_stage(df_encoded, split, model):
+    """VIFs on the cleaned predictors plus leverage / Cook's distance on the training fit"""
+    features = list(model['coefficients'])
+    X, y = training_matrix(split, features)
+    beta = np.array([model['intercept']] + [model['coefficients'][f] for f in features])
+    return diagnostics_report(vif(df_encoded, INDEPENDENT_NUMERIC), logit_influence(X, y, beta))
+
+def bootstrap_stage(split, model, n_boot, n_workers=None):
+    """Bootstrap refits of the logit on the training rows, one row of coefficients per replicate"""
+    features = list(model['coefficients'])
+    X, y = training_matrix(split, features)
+    _, betas = bootstrap_coefficients(X, y, n_boot=n_boot, seed=RANDOM_STATE, n_workers=n_workers)
+    return pd.DataFrame(betas, columns=['Intercept'] + features)
+
+def validate_stage(split, model, betas, threshold, n_folds=N_FOLDS, n_workers=None):
+    """Coefficient intervals from the bootstrap plus k-fold recall/F2 on the training rows"""
+    features = list(model['coefficients'])
+    X, y = training_matrix(split, features)
+    beta_full = np.array([model['intercept']] + [model['coefficients'][f] for f in features])
+    intervals = coefficient_intervals(['Intercept'] + features, beta_full, betas.to_numpy())
+    cv = cross_validate(X, y, n_folds=n_folds, threshold=threshold, seed=RANDOM_STATE, n_workers=n_workers)
+    return validation_report(intervals, cv)
+
+def predict_stage(df_encoded, model, threshold, betas=None):
+    """Score every cleaned employee and apply the prediction threshold"""
+    scorer = LogitScorer(model)
+    X = scorer.design_matrix(df_encoded)
+    probability = scorer.score(X)
+    df_scored = df_encoded.assign(probability=probability, prediction_promoted=scorer.predict(probability, threshold).astype(np.int64))
+    if betas is not None:
+        X = np.column_stack([np.ones(len(X)), X])
+        low, high = potential_bands(X, betas[['Intercept'] + scorer.features].to_numpy())
+        df_scored = df_scored.assign(**dict(zip(BAND_COLUMNS, (low, high))))
+    return df_scored
+
+def grid_stage(df_scored, q_low=Q_LOW, q_high=Q_HIGH):
+    """9-box classification and the final_data column layout"""
+    low, high = potential_cutoffs(df_scored['probability'], q_low, q_high)
+    final_data = df_scored.assign(
+        box_category=np.asarray(classify_boxes(df_scored['performance_rating'], df_scored['probability'], low, high))
+    )
+    final_data = final_data.drop(columns=['role_level_encoded', 'education_level_encoded'])
+    final_data['potential'] = final_data['probability']
+    final_data = final_data.drop(columns='probability')
+
+    # Bootstrap bands, when present, follow the point estimate
+    bands = [col for col in BAND_COLUMNS if col in final_data.columns]
+    return final_data[[col for col in final_data.columns if col not in bands] + bands]
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+def run_pipeline(source=DEFAULT_SOURCE, threshold=THRESHOLD, q_low=Q_LOW, q_high=Q_HIGH,
+                 app_dir=None, data_dir=None, cache_dir=DEFAULT_CACHE_DIR,
+                 chunk_rows=CHUNK_ROWS, cycle=None, force=False,
+                 n_boot=N_BOOTSTRAP, n_folds=N_FOLDS, n_workers=None):
+    """Run every stage, reusing cached outputs whose inputs have not changed"""
+    cache = StageCache(cache_dir, force=force)
+    source_key = source_fingerprint(source)
+    log.info("source      %s (%s)", source, source_key['sha256'][:16])
+
+    clean_params = {
+        'dtypes': EXTRACT_DTYPES,
+        'min_tenure_years': MIN_TENURE_YEARS,
+        'required': REQUIRED_COLUMNS,
+        'version': CLEAN_VERSION
+    }
+    df_cleaned, clean_key = cache.run(
+        'clean', source_key, clean_params, lambda path: clean_stage(source, path, chunk_rows), stream=True
+    )
+    df_encoded, encode_key = cache.run(
+        'encode', clean_key, {'role': ROLE_MAPPING, 'edu': EDU_MAPPING}, lambda: encode_stage(df_cleaned)
+    )
+    split, split_key = cache.run(
+        'split', encode_key, {'test_size': TEST_SIZE, 'random_state': RANDOM_STATE}, lambda: split_stage(df_encoded)
+    )
+    model, fit_key = cache.run('fit', split_key, {'formula': MODEL_FORMULA}, lambda: fit_stage(split))
+
+    diagnostics, _ = cache.run('diagnostics', [encode_key, split_key, fit_key], {}, lambda: diagnostics_stage(df_encoded, split, model))
+    log.info("            %s influential rows (Cook's D > 4/n), high VIF: %s", diagnostics['n_influential'], diagnostics['high_vif'] or 'none')
+
+    betas, boot_key, validation = None, None, None
+    if n_boot:
+        betas, boot_key = cache.run(
+            'bootstrap', fit_key, {'n_boot': n_boot, 'seed': RANDOM_STATE},
+            lambda: bootstrap_stage(split, model, n_boot, n_workers)
+        )
+        validation, _ = cache.run(
+            'validate', boot_key, {'n_folds': n_folds, 'threshold': threshold},
+            lambda: validate_stage(split, model, betas, threshold, n_folds, n_workers)
+        )
+        failed_refits, failed_folds = validation.get('n_bootstrap_failed', 0), validation.get('cv_failed_folds', 0)
+        if failed_refits or failed_folds:
+            log.warning(
+                "            dropped %s of %s bootstrap replicates and %s of %s folds that failed to fit",
+                failed_refits, n_boot, failed_folds, n_folds
+            )
+
+    df_scored, predict_key = cache.run(
+        'predict', [encode_key, fit_key, boot_key], {'threshold': threshold},
+        lambda: predict_stage(df_encoded, model, threshold, betas)
+    )
+    final_data, _ = cache.run(
+        'grid', predict_key, {'q_low': q_low, 'q_high': q_high}, lambda: grid_stage(df_scored, q_low, q_high)
+    )
+
+    # Write stage: always runs, it is the pipeline's output
+    if data_dir is not None:
+        data_dir = Path(data_dir)
+        training_data = split[~split['is_test']].drop(columns='is_test')
+        testing_data = split[split['is_test']].drop(columns='is_test')
+        training_data.to_csv(data_dir / "train.csv", index=False)
+        testing_data.to_csv(data_dir / "test.csv", index=False)
+        final_data.to_csv(data_dir / "final_data.csv", index=False)
+        with open(data_dir / DIAGNOSTICS_FILE, 'w') as f:
+            json.dump(diagnostics, f, indent=2)
+    if app_dir is not None:
+        app_dir = Path(app_dir)
+        final_data.to_csv(app_dir / "final_data.csv", index=False)
+        build_store(app_dir / "final_data.csv", app_dir / "final_data.parquet")
+        export_coefficients(
+            {'Intercept': model['intercept'], **model['coefficients']},
+            ROLE_MAPPING, EDU_MAPPING, threshold, app_dir / MODEL_FILE,
+            q_low=q_low, q_high=q_high
+        )
+        if validation is not None:
+            with open(app_dir / VALIDATION_FILE, 'w') as f:
+                json.dump(validation, f, indent=2)
+        else:
+            # No bands were written, so an older report would describe another fit
+            (app_dir / VALIDATION_FILE).unlink(missing_ok=True)
+    if cycle is not None:
+        from history_store import append_snapshot
+        append_snapshot(final_data, cycle)
+
+    log.info("write       %s rows scored", f"{len(final_data):,}")
+    return final_data
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the promotion scoring pipeline headlessly")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help='employee extract CSV')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='prediction threshold')
+    parser.add_argument('--q-low', type=float, default=Q_LOW, help='low potential quantile')
+    parser.add_argument('--q-high', type=float, default=Q_HIGH, help='high potential quantile')
+    parser.add_argument('--app-dir', default=REPO_DIR / "app", help='dashboard directory to publish to')
+    parser.add_argument('--data-dir', default=REPO_DIR / "data", help='data directory for train/test/final CSVs')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='stage cache directory')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='rows per chunk when streaming the extract')
+    parser.add_argument('--cycle', default=None, help='also append the result to the history store for this cycle date')
+    parser.add_argument('--force', action='store_true', help='ignore cached stage outputs')
+    parser.add_argument('--bootstrap', type=int, default=N_BOOTSTRAP, help='bootstrap replicates for potential bands and coefficient intervals (0 = off)')
+    parser.add_argument('--folds', type=int, default=N_FOLDS, help='cross-validation folds when bootstrapping')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes for bootstrap / cross-validation')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    run_pipeline(
+        source=args.source,
+        threshold=args.threshold,
+        q_low=args.q_low,
+        q_high=args.q_high,
+        app_dir=args.app_dir,
+        data_dir=args.data_dir,
+        cache_dir=args.cache_dir,
+        chunk_rows=args.chunk_rows,
+        cycle=args.cycle,
+        force=args.force,
+        n_boot=args.bootstrap,
+        n_folds=args.folds,
+        n_workers=args.workers
+    )
@@ -0,0 +1,205 @@
+"""
+BACKGROUND DATA REFRESH
+Watches the published data artifacts and hot-swaps a fully built snapshot of the dashboard data
+
+A snapshot bundles one generation of final_data with everything the
+dashboard derives from it at its default scoring: filter index, aggregate
+cube, salary sketches, org tree, table sort indexes, ID search and the
+model artifacts (the coefficients are optional; without them `model` and
+`scorer` are None); the fairness audit is built on first use. A daemon
+thread polls the artifacts' size and mtime (the Parquet store only when
+it has no CSV to be rebuilt from); once a change has settled for a poll
+interval it builds the next snapshot off the request path and swaps the
+reference in one assignment.
+Reruns read `current` once and keep that snapshot to the end, so a swap
+never mixes generations, and a failed build leaves the previous snapshot
+serving.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from data_store import STORE_FILE, CSV_FILE, load_frame
+from filter_index import FilterIndex
+from agg_cube import AggregateCube
+from salary_sketch import SalarySketches
+from org_tree import OrgTree
+from id_search import IdSearch
+from table_view import TableView
+from model_fit import VALIDATION_FILE, load_validation
+from scoring import MODEL_FILE, LogitScorer, load_coefficients
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Seconds between checks of the watched artifacts
+POLL_SECONDS = float(os.environ.get('NINEBOX_REFRESH_SECONDS', 30))
+
+# Artifacts whose change triggers a rebuild (missing ones are skipped)
+WATCHED_FILES = [STORE_FILE, CSV_FILE, MODEL_FILE, VALIDATION_FILE]
+
+# Derived artifact -> its source. load_frame rebuilds a stale store from the
+# CSV, so the store is only watched when there is no CSV; otherwise that
+# rebuild would itself look like a new publish and trigger a second refresh
+DERIVED_FROM = {STORE_FILE: CSV_FILE}
+
+log = logging.getLogger("ninebox.refresh")
+
+
+# ============================================================
+# SNAPSHOT
+# ============================================================
+
+def fingerprint(data_dir, files=WATCHED_FILES):
+    """(name, size, mtime_ns) of each watched artifact that exists, skipping derived ones beside their source"""
+    data_dir = Path(data_dir)
+    stamp = []
+    for name in files:
+        if name in DERIVED_FROM and (data_dir / DERIVED_FROM[name]).exists():
+            continue
+        try:
+            stat = (data_dir / name).stat()
+        except FileNotFoundError:
+            continue
+        stamp.append((name, stat.st_size, stat.st_mtime_ns))
+    return tuple(stamp)
+
+
+class DataSnapshot:
+    """One immutable generation of the dashboard data and its indexes"""
+
+    def __init__(self, data_dir, version, stamp):
+        self.version = version
+        self.fingerprint = stamp
+        self.source = STORE_FILE if (Path(data_dir) / STORE_FILE).exists() else CSV_FILE
+
+        # Live re-scoring and what-if need the coefficients; the stored scores do not
+        model_path = Path(data_dir) / MODEL_FILE
+        self.model = load_coefficients(model_path) if model_path.exists() else None
+        self.scorer = LogitScorer(self.model) if self.model is not None else None
+        self.validation = load_validation(Path(data_dir) / VALIDATION_FILE)
+
+        self.df = load_frame(data_dir)
+        self.index = FilterIndex(self.df)
+        self.cube = AggregateCube(self.df, self.index)
+        self.sketches = SalarySketches(self.df, self.index)
+        self.org_tree = OrgTree(self.df)
+        self.table_view = TableView(self.df)
+        self.id_search = {
+            'employee_id': IdSearch(self.index.values['employee_id']),
+            'manager_id': IdSearch(self.org_tree.managers())
+        }
+        self.loaded_at = datetime.now()
+
+        # Built on first use by the pages that need them, once per snapshot
+        self._lazy = {}
+        self._lazy_lock = threading.Lock()
+
+    def _cached(self, name, build):
+        """Build an attribute of this snapshot once, on first request"""
+        with self._lazy_lock:
+            if name not in self._lazy:
+                self._lazy[name] = build()
+            return self._lazy[name]
+
+    def audit(self):
+        """Fairness audit of the stored scores over the default slice dimensions"""
+        from fairness_audit import fairness_audit
+
+        return self._cached('audit', lambda: fairness_audit(self.df))
+
+    def audit_candidates(self):
+        """Extra slice attributes the audit offers (re-scoring only changes outcome columns, never candidates)"""
+        from fairness_audit import slice_candidates
+
+        return self._cached('audit_candidates', lambda: slice_candidates(self.df))
+
+    def label(self):
+        """Version line shown to users"""
+        return f"v{self.version} · {len(self.df):,} rows from {self.source} · loaded {self.loaded_at:%Y-%m-%d %H:%M:%S}"
+
+def snapshot_key(snapshot):
+    """Cache hash for a snapshot: its version (the frames themselves are never hashed)"""
+    return snapshot.version
+
+
+# ============================================================
+# REFRESHER
+# ============================================================
+
+class DataRefresher:
+    """Serves the current snapshot and rebuilds it in a daemon thread when the artifacts change"""
+
+    def __init__(self, data_dir, poll_seconds=POLL_SECONDS):
+        self.data_dir = Path(data_dir)
+        self.poll_seconds = poll_seconds
+        self.last_error = None
+        self._pending = None
+        self._failed = None
+        self._swap_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # The first snapshot is built up front; every later one off the request path
+        stamp = fingerprint(self.data_dir)
+        self.current = DataSnapshot(self.data_dir, 1, stamp)
+
+    def start(self):
+        """Start watching in a daemon thread (idempotent)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='ninebox-refresh', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self._stop.set()
+
+    def _watch(self):
+        """Poll until stopped"""
+        while not self._stop.wait(self.poll_seconds):
+            self.check()
+
+    def check(self):
+        """One poll: rebuild and swap once a changed fingerprint has held for a full interval
+
+        Returns True when a new snapshot was swapped in.
+        """
+        stamp = fingerprint(self.data_dir)
+        if stamp == self.current.fingerprint or stamp == self._failed:
+            self._pending = None
+            return False
+        if stamp != self._pending:
+            # Changed since the last poll: the pipeline may still be writing
+            self._pending = stamp
+            return False
+        return self.rebuild(stamp)
+
+    def rebuild(self, stamp=None):
+        """Build the next snapshot and swap it in; on failure the current one keeps serving"""
+        stamp = fingerprint(self.data_dir) if stamp is None else stamp
+        with self._swap_lock:
+            start = time.perf_counter()
+            try:
+                snapshot = DataSnapshot(self.data_dir, self.current.version + 1, stamp)
+            except Exception as exc:
+                self._failed = stamp
+                self.last_error = f"{type(exc).__name__}: {exc}"
+                log.exception("refresh failed, still serving v%s", self.current.version)
+                return False
+
+            self.current = snapshot
+            self._pending = None
+            self._failed = None
+            self.last_error = None
+            log.info("refreshed to v%s in %.2fs", snapshot.version, time.perf_counter() - start)
+            return True
@@ -0,0 +1,186 @@
+"""
+SALARY SKETCHES
+Server-side salary five-number summaries from mergeable per-cell histogram sketches
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+
+from agg_cube import CUBE_DIMENSIONS
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Fixed-width bins over the global salary range; sketches merge by addition
+N_SALARY_BINS = 256
+
+# Outlier points sent to the browser at most
+MAX_OUTLIERS = 200
+
+# Tukey fence multiplier (matches Plotly's box plot)
+WHISKER_IQR = 1.5
+
+# Rows checked per step when scanning the salary order for a whisker
+SCAN_CHUNK = 1024
+
+# Selections up to this many rows get exact quartiles; binned quartiles are
+# only accurate to about one bin width, which shows on small selections
+EXACT_MAX_ROWS = 5_000
+
+
+# ============================================================
+# HELPER FUNCTIONS
+# ============================================================
+
+def histogram_quantiles(hist, edges, quantiles):
+    """Quantiles of a binned distribution, interpolating linearly inside each bin"""
+    cumulative = np.cumsum(hist)
+    total = cumulative[-1]
+    targets = np.asarray(quantiles) * total
+    bins = np.minimum(np.searchsorted(cumulative, targets, side='left'), len(hist) - 1)
+    below = np.where(bins > 0, cumulative[bins - 1], 0)
+    inside = np.maximum(hist[bins], 1)
+    fraction = np.clip((targets - below) / inside, 0.0, 1.0)
+    return edges[bins] + fraction * (edges[bins + 1] - edges[bins])
+
+def sample_outliers(values, max_points=MAX_OUTLIERS):
+    """Evenly spaced sample of at most max_points sorted outliers"""
+    values = np.sort(values)
+    if len(values) <= max_points:
+        return values
+    return values[np.linspace(0, len(values) - 1, max_points).astype(np.int64)]
+
+def exact_summary(values, max_points=MAX_OUTLIERS):
+    """Five-number summary, fences and capped outliers from raw salaries"""
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.quantile(values, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    low_limit, high_limit = q1 - WHISKER_IQR * iqr, q3 + WHISKER_IQR * iqr
+    inside = values[(values >= low_limit) & (values <= high_limit)]
+    outliers = values[(values < low_limit) | (values > high_limit)]
+    return {
+        'n': int(len(values)),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'lowerfence': float(inside.min()),
+        'upperfence': float(inside.max()),
+        'outliers': sample_outliers(outliers, max_points),
+        'n_outliers': int(len(outliers)),
+        'approximate': False
+    }
+
+
+# ============================================================
+# SALARY SKETCHES
+# ============================================================
+
+class SalarySketches:
+    """Per-cube-cell salary histograms plus a salary-sorted row order for outliers"""
+
+    def __init__(self, df, index, n_bins=N_SALARY_BINS):
+        self.index = index
+        self.salary = df['salary'].to_numpy(dtype=np.float64)
+        self.salary_order = np.argsort(self.salary, kind='stable').astype(np.int32)
+        self.salary_sorted = self.salary[self.salary_order]
+
+        self.edges = np.linspace(self.salary_sorted[0], self.salary_sorted[-1], n_bins + 1)
+        bins = np.clip(np.searchsorted(self.edges, self.salary, side='right') - 1, 0, n_bins - 1)
+
+        self.shape = tuple(len(index.values[col]) for col in CUBE_DIMENSIONS) + (n_bins,)
+        cells = np.ravel_multi_index(tuple(index.codes[col] for col in CUBE_DIMENSIONS) + (bins,), self.shape)
+        self.sketches = np.bincount(cells, minlength=int(np.prod(self.shape))).astype(np.int32).reshape(self.shape)
+
+    def covers(self, conditions, value_range=None):
+        """True when the filter state is answerable from sketches alone"""
+        if any(selected for col, selected in conditions.items() if col not in CUBE_DIMENSIONS):
+            return False
+        if value_range is not None:
+            range_sorted = self.index.range_sorted
+            low, high = value_range
+            if low > range_sorted[0] or high < range_sorted[-1]:
+                return False
+        return True
+
+    def merged(self, selected_codes):
+        """Merge the sketches of every selected cell into one histogram"""
+        sketches = self.sketches
+        for axis, col in enumerate(CUBE_DIMENSIONS):
+            if col in selected_codes:
+                sketches = sketches.take(selected_codes[col], axis=axis)
+        return sketches.reshape(-1, self.shape[-1]).sum(axis=0)
+
+    def _member(self, rows, selected_codes):
+        """Mask of rows that satisfy the selected cube-dimension codes"""
+        keep = np.ones(len(rows), dtype=bool)
+        for col, codes in selected_codes.items():
+            keep &= np.isin(self.index.codes[col][rows], codes)
+        return keep
+
+    def _first_member(self, start, stop, selected_codes):
+        """First salary position in [start, stop) (or reversed if start > stop) that passes the filter"""
+        step = 1 if start <= stop else -1
+        while start != stop:
+            end = min(start + SCAN_CHUNK, stop) if step > 0 else max(start - SCAN_CHUNK, stop)
+            positions = np.arange(start, end, step)
+            hits = np.flatnonzero(self._member(self.salary_order[positions], selected_codes))
+            if len(hits):
+                return self.salary_sorted[positions[hits[0]]]
+            start = end
+        return None
+
+    def summarize(self, conditions, value_range=None, rows=None, max_points=MAX_OUTLIERS):
+        """Salary box statistics for a filter state, without shipping raw salaries"""
+        if not self.covers(conditions, value_range):
+            if rows is None:
+                rows = self.index.select(conditions, value_range)
+            return exact_summary(self.salary[rows], max_points)
+
+        selected_codes = {
+            col: self.index.value_codes(col, conditions[col])
+            for col in CUBE_DIMENSIONS if conditions.get(col)
+        }
+        hist = self.merged(selected_codes)
+        n = int(hist.sum())
+        if n == 0:
+            return None
+        if n <= EXACT_MAX_ROWS:
+            if rows is None:
+                rows = self.index.select(conditions, value_range)
+            return exact_summary(self.salary[rows], max_points)
+
+        q1, median, q3 = histogram_quantiles(hist, self.edges, [0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        low_limit, high_limit = q1 - WHISKER_IQR * iqr, q3 + WHISKER_IQR * iqr
+
+        # Outliers sit at the ends of the global salary order: scan only those rows
+        n_low = np.searchsorted(self.salary_sorted, low_limit, side='left')
+        n_high = np.searchsorted(self.salary_sorted, high_limit, side='right')
+        low_rows = self.salary_order[:n_low]
+        high_rows = self.salary_order[n_high:]
+        low_rows = low_rows[self._member(low_rows, selected_codes)]
+        high_rows = high_rows[self._member(high_rows, selected_codes)]
+
+        # Whiskers: nearest selected salaries inside the fences
+        lower_fence = self._first_member(n_low, n_high, selected_codes)
+        upper_fence = self._first_member(n_high - 1, n_low - 1, selected_codes)
+        if lower_fence is None:
+            lower_fence, upper_fence = q1, q3
+
+        outliers = np.concatenate([self.salary[low_rows], self.salary[high_rows]])
+        return {
+            'n': n,
+            'q1': float(q1),
+            'median': float(median),
+            'q3': float(q3),
+            'lowerfence': float(lower_fence),
+            'upperfence': float(upper_fence),
+            'outliers': sample_outliers(outliers, max_points),
+            'n_outliers': int(len(outliers)),
+            'approximate': True
+        }
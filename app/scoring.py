@@ -0,0 +1,151 @@
+"""
+9-BOX SCORING
+Vectorized performance/potential banding shared by the notebook and the dashboard
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import json
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# 9-BOX LABELS
+# ============================================================
+
+# Band code 0/1/2 = Low/Moderate/High
+POTENTIAL_LEVELS = ['Low Potential', 'Moderate Potential', 'High Potential']
+PERFORMANCE_LEVELS = ['Low Performance', 'Moderate Performance', 'High Performance']
+
+# Box code = potential band * 3 + performance band
+BOX_LABELS = [f"{pot} / {perf}" for pot in POTENTIAL_LEVELS for perf in PERFORMANCE_LEVELS]
+
+# Performance rating cut points: <= 2 Low, 3 Moderate, >= 4 High
+PERFORMANCE_BINS = np.array([3, 4])
+
+# Potential quantiles used for the Low/High boundaries
+Q_LOW = 0.25
+Q_HIGH = 0.75
+
+# Per-employee bootstrap band columns added to final_data (see model_fit)
+BAND_COLUMNS = ['potential_low', 'potential_high']
+
+# Exported logit coefficients (written by the notebook)
+MODEL_FILE = "model_coefficients.json"
+
+# Rows scored per block, keeps temporaries cache-sized
+SCORE_BLOCK_ROWS = 65536
+
+
+# ============================================================
+# BANDING
+# ============================================================
+
+def potential_cutoffs(potential, q_low=Q_LOW, q_high=Q_HIGH):
+    """Return the (low, high) potential boundaries from the score quantiles"""
+    low, high = np.quantile(np.asarray(potential, dtype=np.float64), [q_low, q_high])
+    return float(low), float(high)
+
+def performance_band(performance_rating):
+    """Band performance ratings into 0/1/2 codes"""
+    return np.digitize(np.asarray(performance_rating), PERFORMANCE_BINS).astype(np.int8)
+
+def potential_band(potential, low, high):
+    """Band potential scores into 0/1/2 codes (< low, < high, >= high)"""
+    return np.digitize(np.asarray(potential), [low, high]).astype(np.int8)
+
+def crosses_cutoff(low, high, cutoffs):
+    """True where an employee's potential band spans any box cutoff"""
+    crosses = np.zeros(len(low), dtype=bool)
+    for cutoff in cutoffs:
+        crosses |= (low < cutoff) & (high >= cutoff)
+    return crosses
+
+def box_codes(performance_rating, potential, low, high):
+    """Return 9-box codes (0-8) indexing BOX_LABELS"""
+    return potential_band(potential, low, high) * 3 + performance_band(performance_rating)
+
+def classify_boxes(performance_rating, potential, low, high):
+    """Return box_category as a categorical over the nine fixed labels"""
+    codes = box_codes(performance_rating, potential, low, high)
+    return pd.Categorical.from_codes(codes, categories=BOX_LABELS)
+
+
+# ============================================================
+# MODEL COEFFICIENTS
+# ============================================================
+
+def export_coefficients(params, role_mapping, edu_mapping, threshold, path, q_low=Q_LOW, q_high=Q_HIGH):
+    """Collect fitted logit params, the encodings and the cutoffs as a small JSON artifact (written if path is given)"""
+    params = dict(params)
+    model = {
+        'intercept': float(params.pop('Intercept')),
+        'coefficients': {name: float(value) for name, value in params.items()},
+        'role_mapping': dict(role_mapping),
+        'edu_mapping': dict(edu_mapping),
+        'threshold': float(threshold),
+        'q_low': float(q_low),
+        'q_high': float(q_high)
+    }
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump(model, f, indent=2)
+    return model
+
+def load_coefficients(path):
+    """Read the coefficient artifact written by export_coefficients"""
+    with open(path) as f:
+        return json.load(f)
+
+
+class LogitScorer:
+    """Vectorized re-scoring from stored logit coefficients"""
+
+    # Encoded model features and the raw columns they come from
+    ENCODED = {'role_level_encoded': ('role_level', 'role_mapping'),
+               'education_level_encoded': ('education_level', 'edu_mapping')}
+
+    def __init__(self, model):
+        self.model = model
+        self.features = list(model['coefficients'])
+        self.beta = np.array([model['coefficients'][f] for f in self.features], dtype=np.float64)
+        self.intercept = float(model['intercept'])
+        self.threshold = float(model['threshold'])
+
+    def design_matrix(self, df):
+        """Build the (n_rows, n_features) float64 matrix once per dataset"""
+        X = np.empty((len(df), len(self.features)), dtype=np.float64)
+        for j, feature in enumerate(self.features):
+            if feature in self.ENCODED:
+                col, mapping = self.ENCODED[feature]
+                X[:, j] = df[col].map(self.model[mapping]).to_numpy(dtype=np.float64)
+            else:
+                X[:, j] = df[feature].to_numpy(dtype=np.float64)
+        return X
+
+    def logits(self, X, out=None):
+        """Linear predictor X @ beta + intercept, written into out"""
+        if out is None:
+            out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), SCORE_BLOCK_ROWS):
+            block = out[start:start + SCORE_BLOCK_ROWS]
+            np.dot(X[start:start + SCORE_BLOCK_ROWS], self.beta, out=block)
+            block += self.intercept
+        return out
+
+    def score(self, X, out=None):
+        """Promotion probabilities via an in-place sigmoid over the logits"""
+        out = self.logits(X, out=out)
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        out += 1.0
+        np.reciprocal(out, out=out)
+        return out
+
+    def predict(self, potential, threshold=None):
+        """0/1 promotion predictions at the threshold"""
+        threshold = self.threshold if threshold is None else threshold
+        return (potential >= threshold).astype(np.int8)
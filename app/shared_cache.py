@@ -0,0 +1,128 @@
+"""
+SHARED CACHE
+Process-wide LRU cache with a byte budget for figures and aggregates across sessions
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+# ============================================================
+# HELPER FUNCTIONS
+# ============================================================
+
+def _canonical(value):
+    """Normalize a filter state so equivalent states serialize identically"""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, set, frozenset)):
+        # Selection order does not change the result
+        return sorted((_canonical(v) for v in value), key=lambda v: json.dumps(v, default=str))
+    if isinstance(value, tuple):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def canonical_hash(value):
+    """Stable hash of a filter state (dicts/lists/tuples of plain values)"""
+    payload = json.dumps(_canonical(value), sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def estimate_size(value):
+    """Approximate resident bytes of a cached value"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        size = value.memory_usage(deep=True)
+        return int(size.sum()) if isinstance(value, pd.DataFrame) else int(size)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if hasattr(value, 'to_json'):
+        # Plotly figures: the serialized spec is what dominates
+        return len(value.to_json())
+    return sys.getsizeof(value)
+
+
+# ============================================================
+# SHARED CACHE
+# ============================================================
+
+class SharedCache:
+    """Thread-safe LRU keyed by (namespace, canonical hash), evicting to stay under max_bytes"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, namespace, state, factory):
+        """Return the cached value for state, building it with factory() on a miss"""
+        key = (namespace, canonical_hash(state))
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        # Build outside the lock; a concurrent miss may build the same value twice
+        value = factory()
+        nbytes = estimate_size(value)
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            if nbytes > self.max_bytes:
+                return value
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_bytes
+                self.evictions += 1
+
+        return value
+
+    def clear(self):
+        """Drop every entry (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Hit/miss counters and memory use, for sizing the budget"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
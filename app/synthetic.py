@@ -0,0 +1,226 @@
+"""
+SYNTHETIC WORKFORCE
+Scaled-up employee extracts with the schema and marginals of emp_dataset.csv
+
+A profile of the real extract drives a vectorized generator: attribute
+columns are drawn from per-role joint frequency tables, salary from per-role
+quantiles (so the role/salary staircase holds at any size), and promotions
+from the exported logit. The hierarchy keeps the extract's shape: one org
+unit per ~1,000 employees, each headed by a Director with one lead per
+managing role level, everyone reporting inside their unit's department with
+the real extract's role-to-role reporting mix.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pipeline import DEFAULT_SOURCE, REPO_DIR, clean_frame, encode_stage, predict_stage, grid_stage
+from scoring import MODEL_FILE, LogitScorer, load_coefficients
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Named extract sizes
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Columns drawn together, per role level, so their dependence survives
+JOINT_COLUMNS = [
+    ['years_in_company', 'years_in_role', 'performance_rating'],
+    ['kpis_count', 'kpis_achieved_pct'],
+    ['education_level'],
+    ['awards'],
+    ['peer_review_score'],
+    ['training_courses_completed'],
+    ['certification_count'],
+    ['mentorship_participation'],
+    ['projects_delivered'],
+    ['performance_intervention']
+]
+
+# Per-role salary quantiles, interpolated when sampling
+SALARY_QUANTILES = np.linspace(0, 1, 101)
+
+# Role level at the top of every org unit (no manager_id)
+TOP_ROLE = 'Director'
+
+ID_PREFIX = 'EMP'
+
+DEFAULT_MODEL = Path(__file__).parent / MODEL_FILE
+DEFAULT_OUT_DIR = REPO_DIR / ".cache" / "synthetic"
+
+
+# ============================================================
+# PROFILE
+# ============================================================
+
+def frequency_table(df, columns):
+    """Distinct value combinations of columns and their relative frequencies"""
+    counts = df.groupby(columns, sort=True).size()
+    return counts.index.to_frame(index=False), counts.to_numpy() / counts.sum()
+
+
+class WorkforceProfile:
+    """Marginals, per-role joint tables, salary quantiles and reporting lines of a real extract"""
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        self.dtypes = df.dtypes
+        self.n_rows = len(df)
+
+        roles = df['role_level']
+        self.role_share = roles.value_counts(normalize=True).sort_index()
+        self.department_share = df['department'].value_counts(normalize=True).sort_index()
+        self.rows_per_unit = self.n_rows / max(int((roles == TOP_ROLE).sum()), 1)
+
+        self.tables = {}
+        self.salary = {}
+        for role, group in df.groupby('role_level'):
+            self.tables[role] = [frequency_table(group, columns) for columns in JOINT_COLUMNS]
+            self.salary[role] = np.quantile(group['salary'].to_numpy(dtype=np.float64), SALARY_QUANTILES)
+
+        # Share of each role level's managers by the manager's role level
+        manager_role = df['manager_id'].map(df.set_index('employee_id')['role_level'])
+        self.reports_to = pd.crosstab(roles, manager_role, normalize='index')
+        self.lead_roles = list(self.reports_to.columns)
+        if TOP_ROLE not in self.lead_roles:
+            raise ValueError(f"no employee reports to a {TOP_ROLE}; cannot infer the org shape")
+
+        # Promotion rate outside the model's population (new hires, top of the hierarchy)
+        outside = ~df.index.isin(clean_frame(df).index)
+        self.outside_rate = float(df.loc[outside, 'promoted'].mean()) if outside.any() else 0.0
+
+def load_profile(source=DEFAULT_SOURCE):
+    """Profile the employee extract the synthetic data should resemble"""
+    return WorkforceProfile(pd.read_csv(source))
+
+
+# ============================================================
+# GENERATION
+# ============================================================
+
+def format_ids(numbers, width):
+    """Fixed-width employee IDs (EMP000123) for an integer array"""
+    return np.char.add(ID_PREFIX, np.char.zfill(numbers.astype(str), width))
+
+def _org_units(n_rows, profile, rng):
+    """Role, org unit and manager row for every generated row
+
+    Rows [0, n_units * n_leads) are the unit heads (lead_roles per unit,
+    TOP_ROLE included); the rest are staff spread over the units of their
+    department.
+    """
+    departments = profile.department_share.index.to_numpy()
+    units_per_dept = np.maximum(np.round(n_rows * profile.department_share.to_numpy() / profile.rows_per_unit), 1).astype(np.int64)
+    unit_department = np.repeat(np.arange(len(departments)), units_per_dept)
+    unit_start = np.cumsum(units_per_dept) - units_per_dept
+    n_units = len(unit_department)
+
+    n_leads = len(profile.lead_roles)
+    n_staff = n_rows - n_units * n_leads
+    if n_staff < 0:
+        raise ValueError(f"{n_rows:,} rows is too few for {n_units} org units of {n_leads} leads")
+
+    # Staff roles and departments from the marginals, unit uniform within the department
+    staff_share = profile.role_share.drop(TOP_ROLE, errors='ignore')
+    role_names = list(dict.fromkeys(profile.lead_roles + list(staff_share.index)))
+    staff_role = rng.choice(
+        [role_names.index(r) for r in staff_share.index], size=n_staff, p=staff_share.to_numpy() / staff_share.sum()
+    )
+    staff_dept = rng.choice(len(departments), size=n_staff, p=profile.department_share.to_numpy())
+    staff_unit = unit_start[staff_dept] + (rng.random(n_staff) * units_per_dept[staff_dept]).astype(np.int64)
+
+    role = np.concatenate([np.tile(np.arange(n_leads), n_units), staff_role]).astype(np.int8)
+    unit = np.concatenate([np.repeat(np.arange(n_units), n_leads), staff_unit])
+
+    # Manager: the unit's lead of a role level drawn from the real reporting mix
+    manager_row = np.full(n_rows, -1, dtype=np.int64)
+    for code, name in enumerate(role_names):
+        if name == TOP_ROLE or name not in profile.reports_to.index:
+            continue
+        rows = np.flatnonzero(role == code)
+        lead = rng.choice(n_leads, size=len(rows), p=profile.reports_to.loc[name, profile.lead_roles].to_numpy())
+        manager_row[rows] = unit[rows] * n_leads + lead
+
+    return role_names, role, departments[unit_department[unit]], manager_row
+
+def generate_workforce(n_rows, profile, model, seed=42):
+    """Synthetic extract with the profile's schema, marginals, staircase and hierarchy"""
+    rng = np.random.default_rng(seed)
+    role_names, role, department, manager_row = _org_units(n_rows, profile, rng)
+
+    columns = {}
+    for col in profile.columns:
+        columns[col] = np.empty(n_rows, dtype=object if profile.dtypes[col].kind not in 'iuf' else profile.dtypes[col])
+    salary = np.empty(n_rows, dtype=np.float64)
+
+    # Attribute tables and salary quantiles per role level
+    for code, name in enumerate(role_names):
+        rows = np.flatnonzero(role == code)
+        for values, p in profile.tables[name]:
+            pick = rng.choice(len(p), size=len(rows), p=p)
+            for col in values.columns:
+                columns[col][rows] = values[col].to_numpy()[pick]
+        salary[rows] = np.interp(rng.random(len(rows)), SALARY_QUANTILES, profile.salary[name])
+    columns['salary'] = np.round(salary).astype(profile.dtypes['salary'])
+
+    # IDs in random order, so heads are not clustered at the low numbers
+    width = max(6, len(str(n_rows)))
+    employee_ids = format_ids(rng.permutation(n_rows) + 1, width).astype(object)
+    manager_ids = np.full(n_rows, None, dtype=object)
+    has_manager = manager_row >= 0
+    manager_ids[has_manager] = employee_ids[manager_row[has_manager]]
+
+    columns['employee_id'] = employee_ids
+    columns['manager_id'] = manager_ids
+    columns['department'] = department.astype(object)
+    columns['role_level'] = np.array(role_names, dtype=object)[role]
+    columns['promoted'] = np.zeros(n_rows, dtype=profile.dtypes['promoted'])
+    df = pd.DataFrame(columns, columns=profile.columns)
+
+    # Promotions: the logit inside its population, the observed rate outside it
+    scored = clean_frame(df)
+    scored = scored[scored['role_level'].isin(model['role_mapping'])]
+    p = np.full(n_rows, profile.outside_rate)
+    scorer = LogitScorer(model)
+    p[scored.index.to_numpy()] = scorer.score(scorer.design_matrix(scored))
+    df['promoted'] = (rng.random(n_rows) < p).astype(profile.dtypes['promoted'])
+
+    return df.iloc[rng.permutation(n_rows)].reset_index(drop=True)
+
+def score_workforce(df_raw, model, threshold=None):
+    """Clean, encode, score and grid an extract in memory: a final_data frame"""
+    df_encoded = encode_stage(clean_frame(df_raw).reset_index(drop=True))
+    threshold = model['threshold'] if threshold is None else threshold
+    return grid_stage(predict_stage(df_encoded, model, threshold), model['q_low'], model['q_high'])
+
+def size_rows(size):
+    """Row count for a named size ('1m') or a plain integer string"""
+    return SIZES[size.lower()] if size.lower() in SIZES else int(size.replace('_', ''))
+
+
+# ============================================================
+# COMMAND LINE
+# ============================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic employee extract shaped like emp_dataset.csv")
+    parser.add_argument('size', help=f"rows to generate: {', '.join(SIZES)} or an integer")
+    parser.add_argument('--source', default=DEFAULT_SOURCE, help='real extract to profile')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='coefficient artifact used to draw promotions')
+    parser.add_argument('--seed', type=int, default=42, help='random seed')
+    parser.add_argument('--out', default=None, help='output CSV (default .cache/synthetic/emp_dataset_<size>.csv)')
+    args = parser.parse_args()
+
+    out = Path(args.out) if args.out else DEFAULT_OUT_DIR / f"emp_dataset_{args.size}.csv"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    df = generate_workforce(size_rows(args.size), load_profile(args.source), load_coefficients(args.model), args.seed)
+    df.to_csv(out, index=False)
+    print(f"Wrote {len(df):,} rows to {out}")
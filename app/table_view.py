@@ -0,0 +1,124 @@
+"""
+EMPLOYEE TABLE VIEW
+Paginated, pre-sorted view over the "Detailed Employee Data" table
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+
+from scoring import BAND_COLUMNS
+
+
+# ============================================================
+# DISPLAY METADATA
+# ============================================================
+
+# Columns shown in the table, in display order
+DISPLAY_COLUMNS = [
+    'employee_id',
+    'promoted',
+    'prediction_promoted',
+    'manager_id',
+    'department',
+    'role_level',
+    'education_level',
+    'years_in_company',
+    'years_in_role',
+    'performance_rating',
+    'awards',
+    'kpis_count',
+    'kpis_achieved_pct',
+    'peer_review_score',
+    'training_courses_completed',
+    'certification_count',
+    'mentorship_participation',
+    'projects_delivered',
+    'salary',
+    'performance_intervention',
+    'box_category',
+    'potential'
+]
+
+# Header labels, applied as column config rather than a rename
+COLUMN_LABELS = {
+    'employee_id': 'Employee ID',
+    'manager_id' : 'Manager ID',
+    'department': 'Department',
+    'role_level': 'Role Level',
+    'education_level': 'Education',
+    'years_in_company' : 'Company Tenure',
+    'years_in_role' : 'Role Tenure',
+    'performance_rating': 'Performance',
+    'potential': 'Potential Score',
+    'awards': 'Awards',
+    'kpis_count' : 'KPIs Ct',
+    'kpis_achieved_pct': "KPIs Achieved",
+    'peer_review_score' : 'Peer Score',
+    'training_courses_completed' : 'Training Courses',
+    'certification_count' : 'Certifications',
+    'mentorship_participation' : 'Mentorship',
+    'projects_delivered' : 'Projects',
+    'salary': 'Salary',
+    'box_category': '9-Box Category',
+    'promoted': 'Actually Promoted',
+    'prediction_promoted': 'Model Prediction',
+    'potential_low': 'Potential (95% Low)',
+    'potential_high': 'Potential (95% High)'
+}
+
+# 0/1 columns displayed as No/Yes
+YES_NO_COLUMNS = ['promoted', 'prediction_promoted']
+YES_NO = {0: 'No', 1: 'Yes'}
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+# ============================================================
+# TABLE VIEW
+# ============================================================
+
+def yes_no(value):
+    """Format a 0/1 flag as No/Yes"""
+    return YES_NO.get(value, value)
+
+def display_columns(df):
+    """Display columns plus the bootstrap potential bands when the data has them"""
+    return DISPLAY_COLUMNS + [col for col in BAND_COLUMNS if col in df.columns]
+
+
+class TableView:
+    """Per-column argsort indexes so any filtered page can be cut without sorting"""
+
+    def __init__(self, df, columns=None):
+        self.df = df
+        self.columns = display_columns(df) if columns is None else columns
+        self.n_rows = len(df)
+
+        # Global sort order per column, categoricals by category order
+        self.sort_orders = {
+            col: df[col].argsort(kind='stable').to_numpy().astype(np.int32)
+            for col in self.columns
+        }
+
+    def ordered_rows(self, rows, sort_by=None, ascending=True):
+        """Filtered rows in display order"""
+        if sort_by is None:
+            return rows if ascending else rows[::-1]
+
+        # Walk the precomputed global order and keep the filtered rows
+        order = self.sort_orders[sort_by]
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        ordered = order[mask[order]]
+        return ordered if ascending else ordered[::-1]
+
+    def page(self, rows, page=0, page_size=PAGE_SIZES[1], sort_by=None, ascending=True):
+        """Display frame for one page, with Yes/No and header labels as presentation metadata"""
+        ordered = self.ordered_rows(rows, sort_by, ascending)
+        page_rows = ordered[page * page_size:(page + 1) * page_size]
+
+        frame = self.df.take(page_rows)[self.columns]
+        styler = frame.style.format({col: yes_no for col in YES_NO_COLUMNS if col in self.columns})
+        return styler, {col: COLUMN_LABELS.get(col, col) for col in self.columns}
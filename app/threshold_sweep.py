@@ -0,0 +1,150 @@
+"""
+THRESHOLD SWEEP
+One-pass confusion-matrix curves and operating-point selection for the promotion model
+
+Scores are sorted once; cumulative sums of the outcomes give TP/FP at every
+distinct threshold (predict promoted when probability >= threshold). Each
+curve starts with a threshold=inf row where nobody is flagged.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Recall-weighted F-score used to pick the notebook's 0.14 cutoff
+F_BETA = 2
+
+# Default utility per outcome: a missed promotable employee costs more
+# than reviewing one who is not ready
+UTILITY_WEIGHTS = {'tp': 1.0, 'fp': -0.25, 'fn': -1.0, 'tn': 0.0}
+
+OBJECTIVES = ['f_beta', 'utility', 'recall', 'precision']
+
+
+# ============================================================
+# CONFUSION CURVES
+# ============================================================
+
+def _run_ends(values):
+    """Index of the last element of each run of equal values"""
+    return np.append(np.flatnonzero(values[1:] != values[:-1]), len(values) - 1)
+
+def confusion_curve(scores, labels):
+    """TP/FP/FN/TN at every distinct threshold, thresholds descending"""
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels).astype(np.int64)
+
+    order = np.argsort(-scores, kind='stable')
+    scores, labels = scores[order], labels[order]
+    ends = _run_ends(scores) if len(scores) else np.array([], dtype=np.int64)
+
+    tp = np.append(0, np.cumsum(labels)[ends])
+    fp = np.append(0, ends + 1) - tp
+    positives = int(labels.sum())
+    negatives = len(labels) - positives
+    return pd.DataFrame({
+        'threshold': np.append(np.inf, scores[ends]),
+        'tp': tp,
+        'fp': fp,
+        'fn': positives - tp,
+        'tn': negatives - fp
+    })
+
+def segment_curves(scores, labels, segments):
+    """confusion_curve per segment in one sort: (segment, -score) order, cumsums reset per segment"""
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels).astype(np.int64)
+    segments = pd.Categorical(segments)
+    codes = segments.codes
+
+    order = np.lexsort((-scores, codes))
+    scores, labels, codes = scores[order], labels[order], codes[order]
+    if not len(scores):
+        return pd.DataFrame(columns=['segment', 'threshold', 'tp', 'fp', 'fn', 'tn'])
+
+    # Segment boundaries and per-segment totals
+    seg_ends = _run_ends(codes)
+    seg_starts = np.append(0, seg_ends[:-1] + 1)
+    cum_labels = np.cumsum(labels)
+    seg_pos = cum_labels[seg_ends] - np.append(0, cum_labels[seg_ends[:-1]])
+    seg_size = seg_ends - seg_starts + 1
+
+    # Threshold runs end where the score or the segment changes
+    ends = np.flatnonzero((scores[1:] != scores[:-1]) | (codes[1:] != codes[:-1]))
+    ends = np.append(ends, len(scores) - 1)
+    seg = np.searchsorted(seg_ends, ends)
+
+    tp = cum_labels[ends] - np.where(seg_starts[seg] > 0, cum_labels[seg_starts[seg] - 1], 0)
+    fp = (ends - seg_starts[seg] + 1) - tp
+
+    # One threshold=inf row ahead of each segment's run
+    n_seg = len(seg_ends)
+    seg = np.concatenate([np.arange(n_seg), seg])
+    position = np.concatenate([seg_starts - 0.5, ends])
+    order = np.argsort(position, kind='stable')
+    seg = seg[order]
+    tp = np.concatenate([np.zeros(n_seg, dtype=np.int64), tp])[order]
+    fp = np.concatenate([np.zeros(n_seg, dtype=np.int64), fp])[order]
+    thresholds = np.concatenate([np.full(n_seg, np.inf), scores[ends]])[order]
+
+    return pd.DataFrame({
+        'segment': segments.categories[codes[seg_ends[seg]]],
+        'threshold': thresholds,
+        'tp': tp,
+        'fp': fp,
+        'fn': seg_pos[seg] - tp,
+        'tn': (seg_size[seg] - seg_pos[seg]) - fp
+    })
+
+
+# ============================================================
+# METRICS
+# ============================================================
+
+def curve_metrics(curve, beta=F_BETA, weights=UTILITY_WEIGHTS):
+    """Add precision, recall, F-beta and utility columns to a confusion curve"""
+    tp, fp, fn, tn = (curve[c].to_numpy(dtype=np.float64) for c in ['tp', 'fp', 'fn', 'tn'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = np.where(tp + fn > 0, tp / (tp + fn), 0.0)
+        b2 = beta ** 2
+        denom = b2 * precision + recall
+        f_beta = np.where(denom > 0, (1 + b2) * precision * recall / denom, 0.0)
+    utility = weights['tp'] * tp + weights['fp'] * fp + weights['fn'] * fn + weights['tn'] * tn
+    return curve.assign(
+        precision=precision,
+        recall=recall,
+        f_beta=f_beta,
+        utility=utility,
+        predicted_rate=(tp + fp) / np.maximum(tp + fp + fn + tn, 1)
+    )
+
+def metrics_at(curve, threshold):
+    """Curve row in effect at a threshold (the lowest distinct threshold >= it)"""
+    thresholds = curve['threshold'].to_numpy()
+    # Thresholds are descending from inf: the last one >= threshold applies
+    position = np.searchsorted(-thresholds, -threshold, side='right') - 1
+    return curve.iloc[position]
+
+def best_threshold(curve, objective='f_beta'):
+    """Curve row that maximizes the objective (highest threshold on ties)"""
+    return curve.iloc[int(np.argmax(curve[objective].to_numpy()))]
+
+def segment_metrics_at(curves, threshold):
+    """metrics_at for every segment of a segment_curves frame"""
+    return pd.DataFrame([
+        metrics_at(curve, threshold)
+        for _, curve in curves.groupby('segment', observed=True, sort=True)
+    ]).reset_index(drop=True)
+
+def segment_operating_points(curves, objective='f_beta'):
+    """Best threshold per segment from segment_curves + curve_metrics output"""
+    best = curves.groupby('segment', observed=True, sort=True)[objective].idxmax()
+    return curves.loc[best.to_numpy()].reset_index(drop=True)
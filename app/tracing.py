@@ -0,0 +1,374 @@
+"""
+HOT-PATH TRACING
+Per-rerun stage spans for the dashboard, exported as structured logs, OpenMetrics and an admin panel
+
+NINEBOX_TRACE turns tracing on with a comma-separated list of sinks:
+'log' (one JSON line per rerun on the ninebox.trace logger), 'metrics'
+(OpenMetrics text served on NINEBOX_METRICS_HOST:NINEBOX_METRICS_PORT) and
+'panel' (a per-rerun flame summary in the sidebar, shown only when the URL
+carries ?admin=<NINEBOX_ADMIN_TOKEN>). With NINEBOX_TRACE unset, span()
+returns one shared no-op object and traced() leaves functions undecorated,
+so the hot path pays a global lookup per stage.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import functools
+import hmac
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+SINKS = {sink.strip() for sink in os.environ.get('NINEBOX_TRACE', '').split(',') if sink.strip()}
+ENABLED = bool(SINKS)
+
+METRICS_HOST = os.environ.get('NINEBOX_METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.environ.get('NINEBOX_METRICS_PORT', 9464))
+METRIC_PREFIX = 'ninebox'
+
+# Upper bounds (seconds) of the trace-duration histogram
+DURATION_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+ADMIN_TOKEN = os.environ.get('NINEBOX_ADMIN_TOKEN')
+
+# Structured log destination for the 'log' sink (stderr if unset)
+LOG_FILE = os.environ.get('NINEBOX_TRACE_LOG')
+
+# Span attributes summed into the metrics
+COUNTED_ATTRS = ['rows_in', 'rows_out', 'bytes']
+
+log = logging.getLogger("ninebox.trace")
+if 'log' in SINKS and not log.handlers:
+    _handler = logging.FileHandler(LOG_FILE) if LOG_FILE else logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+
+# ============================================================
+# SPANS
+# ============================================================
+
+class Span:
+    """One timed stage of a trace; attributes given as callables are evaluated on exit"""
+
+    __slots__ = ('trace', 'name', 'attrs', 'depth', 'start', 'seconds')
+
+    def __init__(self, trace, name, attrs):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.depth = 0
+        self.start = 0.0
+        self.seconds = 0.0
+
+    def set(self, **attrs):
+        """Attach attributes (rows_out, bytes, cache, ...) to the span"""
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        self.depth = len(self.trace.stack)
+        self.trace.stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.seconds = time.perf_counter() - self.start
+        self.trace.stack.pop()
+        for key, value in self.attrs.items():
+            if callable(value):
+                self.attrs[key] = value()
+        return False
+
+
+class _NullSpan:
+    """Shared stand-in when tracing is off or no trace is active"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+
+class Trace:
+    """Spans recorded during one script rerun (or one deferred download), in start order"""
+
+    def __init__(self, label):
+        self.label = label
+        self.spans = []
+        self.stack = []
+        self.start = time.perf_counter()
+        self.seconds = 0.0
+
+    def to_dict(self):
+        """JSON-ready record of the trace"""
+        return {
+            'trace': self.label,
+            'seconds': round(self.seconds, 6),
+            'spans': [
+                {
+                    'name': s.name, 'depth': s.depth, 'start': round(s.start - self.start, 6), 'seconds': round(s.seconds, 6),
+                    **{key: value for key, value in s.attrs.items() if value is not None}
+                }
+                for s in self.spans
+            ]
+        }
+
+# Streamlit runs each rerun on its own thread
+_local = threading.local()
+
+def current_trace():
+    """Trace collecting spans on this thread, or None"""
+    return getattr(_local, 'trace', None)
+
+def last_trace():
+    """Most recent finished trace on this thread (the rerun that just ran)"""
+    return getattr(_local, 'last', None)
+
+def span(name, **attrs):
+    """Context manager timing a stage of the current trace"""
+    if not ENABLED:
+        return _NULL_SPAN
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return _NULL_SPAN
+    new_span = Span(trace, name, attrs)
+    trace.spans.append(new_span)
+    return new_span
+
+@contextmanager
+def rerun(label='rerun'):
+    """Collect the spans of one script run, then hand the trace to the enabled sinks"""
+    if not ENABLED:
+        yield None
+        return
+    trace = Trace(label)
+    _local.trace = trace
+    try:
+        yield trace
+    finally:
+        trace.seconds = time.perf_counter() - trace.start
+        _local.trace = None
+        _local.last = trace
+        if 'metrics' in SINKS:
+            METRICS.record(trace)
+        if 'log' in SINKS:
+            log.info(json.dumps(trace.to_dict(), default=str))
+
+def traced(name):
+    """Decorator timing a function as a span (the function itself when tracing is off)
+
+    Called outside any rerun (e.g. a deferred download), the call gets a
+    trace of its own.
+    """
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_trace() is None:
+                with rerun(name), span(name):
+                    return fn(*args, **kwargs)
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def fragment(name):
+    """st.fragment whose body is traced as name
+
+    A fragment rerun skips the script around it, and with it the rerun()
+    trace, so the body then records a trace of its own; on a full rerun it is
+    a span of the enclosing trace.
+    """
+    def decorate(fn):
+        import streamlit as st
+
+        return st.fragment(traced(name)(fn))
+    return decorate
+
+def cache_lookup(cache, namespace, state, factory, rows_in=None, rows_out=None):
+    """SharedCache.get_or_create as a span tagged hit or miss
+
+    rows_out, if given, is a function of the value returning its row count.
+    """
+    if not ENABLED:
+        return cache.get_or_create(namespace, state, factory)
+    built = []
+    def build():
+        built.append(True)
+        return factory()
+    with span(namespace, rows_in=rows_in) as lookup:
+        value = cache.get_or_create(namespace, state, build)
+        lookup.set(cache='miss' if built else 'hit')
+        if rows_out is not None:
+            lookup.set(rows_out=rows_out(value))
+    return value
+
+
+# ============================================================
+# PAYLOAD SIZES
+# ============================================================
+
+def figure_bytes(fig):
+    """Size of a Plotly figure's JSON spec, what st.plotly_chart ships"""
+    return len(fig.to_json())
+
+def frame_bytes(df):
+    """Arrow size of a frame, what st.dataframe ships"""
+    import pyarrow as pa
+
+    return pa.Table.from_pandas(df, preserve_index=False).nbytes
+
+
+# ============================================================
+# FLAME SUMMARY
+# ============================================================
+
+def flame_frame(trace):
+    """One row per span with start, total and self time (total minus child spans)"""
+    spans = trace.spans
+    self_seconds = [s.seconds for s in spans]
+    open_spans = []
+    for i, s in enumerate(spans):
+        while open_spans and spans[open_spans[-1]].depth >= s.depth:
+            open_spans.pop()
+        if open_spans:
+            self_seconds[open_spans[-1]] -= s.seconds
+        open_spans.append(i)
+
+    return pd.DataFrame({
+        'stage': [s.name for s in spans],
+        'depth': [s.depth for s in spans],
+        'start_ms': [(s.start - trace.start) * 1000 for s in spans],
+        'ms': [s.seconds * 1000 for s in spans],
+        'self_ms': np.asarray(self_seconds, dtype=np.float64) * 1000,
+        'share': [s.seconds / trace.seconds if trace.seconds else 0.0 for s in spans],
+        'rows_in': [s.attrs.get('rows_in') for s in spans],
+        'rows_out': [s.attrs.get('rows_out') for s in spans],
+        'bytes': [s.attrs.get('bytes') for s in spans],
+        'cache': [s.attrs.get('cache') for s in spans]
+    })
+
+def admin_allowed(supplied_token):
+    """True when the admin token is configured and matches"""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(str(supplied_token or ''), ADMIN_TOKEN)
+
+
+# ============================================================
+# OPENMETRICS
+# ============================================================
+
+def _escape(value):
+    """Label value escaping for the text exposition format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+    """Process-wide span totals and trace-duration histograms, rendered as OpenMetrics text"""
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = list(buckets)
+        self.stages = {}
+        self.traces = {}
+        self._lock = threading.Lock()
+
+    def record(self, trace):
+        """Fold a finished trace into the totals"""
+        with self._lock:
+            counts, total = self.traces.setdefault(trace.label, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[int(np.searchsorted(self.buckets, trace.seconds, side='left'))] += 1
+            total[0] += trace.seconds
+
+            for s in trace.spans:
+                stage = self.stages.setdefault(s.name, {'calls': 0, 'seconds': 0.0, 'hit': 0, 'miss': 0, **{a: 0 for a in COUNTED_ATTRS}})
+                stage['calls'] += 1
+                stage['seconds'] += s.seconds
+                for attr in COUNTED_ATTRS:
+                    if s.attrs.get(attr) is not None:
+                        stage[attr] += int(s.attrs[attr])
+                if s.attrs.get('cache') in ('hit', 'miss'):
+                    stage[s.attrs['cache']] += 1
+
+    def render(self):
+        """OpenMetrics text exposition of every metric family"""
+        p = METRIC_PREFIX
+        with self._lock:
+            lines = [f"# TYPE {p}_trace_seconds histogram", f"# UNIT {p}_trace_seconds seconds",
+                     f"# HELP {p}_trace_seconds Wall time of dashboard reruns and deferred downloads."]
+            for label, (counts, total) in sorted(self.traces.items()):
+                cumulative = np.cumsum(counts)
+                for bound, count in zip(self.buckets + ['+Inf'], cumulative):
+                    lines.append(f'{p}_trace_seconds_bucket{{trace="{_escape(label)}",le="{bound}"}} {count}')
+                lines.append(f'{p}_trace_seconds_count{{trace="{_escape(label)}"}} {cumulative[-1]}')
+                lines.append(f'{p}_trace_seconds_sum{{trace="{_escape(label)}"}} {total[0]:.6f}')
+
+            families = [
+                ('stage_seconds', 'seconds', 'Wall time spent in each stage.', lambda s: [('', f"{s['seconds']:.6f}")]),
+                ('stage_calls', None, 'Times each stage ran.', lambda s: [('', s['calls'])]),
+                ('stage_rows', None, 'Rows into and out of each stage.', lambda s: [(',direction="in"', s['rows_in']), (',direction="out"', s['rows_out'])]),
+                ('stage_bytes', 'bytes', 'Bytes serialized to the browser by each stage.', lambda s: [('', s['bytes'])]),
+                ('cache_lookups', None, 'Shared-cache lookups per stage by result.', lambda s: [(',result="hit"', s['hit']), (',result="miss"', s['miss'])])
+            ]
+            for family, unit, help_text, samples in families:
+                lines.append(f"# TYPE {p}_{family} counter")
+                if unit:
+                    lines.append(f"# UNIT {p}_{family} {unit}")
+                lines.append(f"# HELP {p}_{family} {help_text}")
+                for name, stage in sorted(self.stages.items()):
+                    for labels, value in samples(stage):
+                        lines.append(f'{p}_{family}_total{{stage="{_escape(name)}"{labels}}} {value}')
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+METRICS = MetricsRegistry()
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT, registry=METRICS):
+    """Serve registry.render() at /metrics from a daemon thread; None if the port is taken"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/openmetrics-text; version=1.0.0; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as exc:
+        log.warning("metrics server not started on %s:%s: %s", host, port, exc)
+        return None
+    threading.Thread(target=server.serve_forever, name='ninebox-metrics', daemon=True).start()
+    return server
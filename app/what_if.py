@@ -0,0 +1,201 @@
+"""
+WHAT-IF SIMULATION
+Batch re-scoring of a cohort under development-intervention scenarios
+
+A scenario adds deltas to model features (e.g. +2 training courses, +1
+certification) for every employee in a cohort. The logit model is linear, so
+a feature whose shifted values stay inside the observed range moves every
+logit by the same delta * beta; only features that would leave the range are
+clipped per employee. Scenarios are processed in blocks against the one
+shared design matrix and baseline logits (the DataFrame is never copied),
+bucketed on the logit scale against potential cutoffs fixed from the
+baseline population, and counted into one 9x9 box-transition matrix each.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from scoring import BOX_LABELS, potential_cutoffs, performance_band
+
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+# Features a development plan can move, offered first in the dashboard
+DEVELOPMENT_FEATURES = [
+    'training_courses_completed',
+    'certification_count',
+    'projects_delivered',
+    'awards',
+    'peer_review_score',
+    'kpis_achieved_pct',
+    'performance_rating'
+]
+
+# Feature whose change also moves the performance axis of the grid
+RATING_FEATURE = 'performance_rating'
+
+# Scenario x employee cells evaluated per block, bounds the temporaries
+BLOCK_CELLS = 1 << 22
+
+# Most scenarios one batch may hold
+MAX_SCENARIOS = 100_000
+
+N_BOXES = len(BOX_LABELS)
+
+
+# ============================================================
+# SCENARIOS
+# ============================================================
+
+def scenario_grid(ranges):
+    """Every combination of per-feature deltas, as scenario dicts
+
+    ranges maps feature -> iterable of deltas, e.g.
+    {'training_courses_completed': range(0, 5), 'certification_count': [0, 1]}
+    """
+    features = list(ranges)
+    return [dict(zip(features, deltas)) for deltas in itertools.product(*(list(ranges[f]) for f in features))]
+
+def transition_frame(counts):
+    """Label a 9x9 count array like history_store.transition_matrix"""
+    return pd.DataFrame(counts, index=pd.Index(BOX_LABELS, name='from'), columns=pd.Index(BOX_LABELS, name='to'))
+
+
+# ============================================================
+# SIMULATOR
+# ============================================================
+
+def _logit(p):
+    """Inverse sigmoid"""
+    return float(np.log(p) - np.log1p(-p))
+
+class WhatIfSimulator:
+    """Shared design matrix, baseline logits and fixed cutoffs for batches of what-if scenarios"""
+
+    def __init__(self, scorer, X, performance_rating, q_low, q_high):
+        self.features = scorer.features
+        self.beta = scorer.beta
+        self.X = X
+        self.base_logits = scorer.logits(X)
+
+        # Cutoffs come from the baseline population and stay put under every scenario;
+        # the sigmoid is monotone, so banding happens on the logit scale
+        potential = scorer.score(X)
+        self.cutoffs = potential_cutoffs(potential, q_low, q_high)
+        self.logit_cutoffs = [_logit(c) for c in self.cutoffs]
+        self.logit_threshold = _logit(scorer.threshold)
+
+        # Shifted features are clipped to the range seen in the data
+        self.lower = X.min(axis=0)
+        self.upper = X.max(axis=0)
+
+        self.rating = np.asarray(performance_rating, dtype=np.float64)
+        self.rating_column = self.features.index(RATING_FEATURE) if RATING_FEATURE in self.features else None
+        self.base_codes = (np.digitize(self.base_logits, self.logit_cutoffs) * 3 + performance_band(self.rating)).astype(np.int64)
+
+    def adjustable(self):
+        """Model features a scenario may shift, development features first"""
+        raw = [f for f in self.features if not f.endswith('_encoded')]
+        return [f for f in DEVELOPMENT_FEATURES if f in raw] + [f for f in raw if f not in DEVELOPMENT_FEATURES]
+
+    def delta_matrix(self, scenarios):
+        """(n_scenarios, n_features) deltas from a list of {feature: delta} dicts"""
+        if len(scenarios) > MAX_SCENARIOS:
+            raise ValueError(f"{len(scenarios):,} scenarios exceed the batch limit of {MAX_SCENARIOS:,}")
+        column = {feature: j for j, feature in enumerate(self.features)}
+        deltas = np.zeros((len(scenarios), len(self.features)), dtype=np.float64)
+        for s, scenario in enumerate(scenarios):
+            for feature, delta in scenario.items():
+                if feature not in column:
+                    raise ValueError(f"Unknown model feature: {feature}")
+                deltas[s, column[feature]] = delta
+        return deltas
+
+    def simulate(self, rows, scenarios):
+        """Box transitions, predicted promotions and mean potential of the cohort under each scenario
+
+        rows are cohort row indices into the design matrix; scenarios is a
+        list of {feature: delta} dicts or an (n_scenarios, n_features) array.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        deltas = scenarios if isinstance(scenarios, np.ndarray) else self.delta_matrix(scenarios)
+        n_scenarios, n_rows = len(deltas), len(rows)
+
+        base = self.base_logits[rows]
+        before = self.base_codes[rows]
+        base_perf = before % 3
+
+        # Features whose shifted values stay in range move every logit equally
+        active = np.flatnonzero(np.any(deltas != 0, axis=0))
+        clipped = []
+        for j in active:
+            values = self.X[rows, j]
+            if n_rows and (values.max() + deltas[:, j].max() > self.upper[j] or values.min() + deltas[:, j].min() < self.lower[j]):
+                clipped.append(j)
+        linear = np.setdiff1d(active, clipped)
+        if self.rating_column is not None and self.rating_column in active and self.rating_column not in clipped:
+            clipped.append(self.rating_column)
+            linear = linear[linear != self.rating_column]
+        shift = deltas[:, linear] @ self.beta[linear]
+        cohort_values = {j: self.X[rows, j] for j in clipped}
+
+        transitions = np.zeros((n_scenarios, N_BOXES, N_BOXES), dtype=np.int64)
+        predicted = np.zeros(n_scenarios, dtype=np.int64)
+        mean_potential = np.zeros(n_scenarios, dtype=np.float64)
+        block = max(1, BLOCK_CELLS // max(n_rows, 1))
+        for start in range(0, n_scenarios, block):
+            stop = min(start + block, n_scenarios)
+            logits = base[None, :] + shift[start:stop, None]
+            perf = base_perf
+            for j in clipped:
+                values = cohort_values[j]
+                change = np.clip(values[None, :] + deltas[start:stop, j, None], self.lower[j], self.upper[j]) - values
+                logits += change * self.beta[j]
+                if j == self.rating_column:
+                    perf = performance_band(self.rating[rows] + change)
+
+            after = np.digitize(logits, self.logit_cutoffs) * 3 + perf
+            keys = (np.arange(stop - start)[:, None] * N_BOXES + before) * N_BOXES + after
+            transitions[start:stop] = np.bincount(keys.ravel(), minlength=(stop - start) * N_BOXES * N_BOXES).reshape(-1, N_BOXES, N_BOXES)
+            predicted[start:stop] = (logits >= self.logit_threshold).sum(axis=1)
+            np.negative(logits, out=logits)
+            np.exp(logits, out=logits)
+            logits += 1.0
+            np.reciprocal(logits, out=logits)
+            mean_potential[start:stop] = logits.mean(axis=1) if n_rows else np.nan
+
+        return {
+            'features': self.features,
+            'deltas': deltas,
+            'cohort': n_rows,
+            'before': np.bincount(before, minlength=N_BOXES),
+            'transitions': transitions,
+            'predicted': predicted,
+            'mean_potential': mean_potential
+        }
+
+def scenario_summary(result):
+    """One row per scenario: its deltas and how many of the cohort move between potential bands"""
+    transitions = result['transitions']
+    potential_from = np.arange(N_BOXES) // 3
+    into_high = transitions[:, potential_from < 2][:, :, potential_from == 2].sum(axis=(1, 2))
+    out_of_high = transitions[:, potential_from == 2][:, :, potential_from < 2].sum(axis=(1, 2))
+    staying = np.trace(transitions, axis1=1, axis2=2)
+
+    deltas = result['deltas']
+    used = np.flatnonzero(np.any(deltas != 0, axis=0))
+    summary = pd.DataFrame({result['features'][j]: deltas[:, j] for j in used})
+    summary['high_potential'] = transitions[:, :, potential_from == 2].sum(axis=(1, 2))
+    summary['into_high_potential'] = into_high
+    summary['out_of_high_potential'] = out_of_high
+    summary['changed_box'] = result['cohort'] - staying
+    summary['predicted_promotable'] = result['predicted']
+    summary['mean_potential'] = result['mean_potential']
+    return summary
@@ -0,0 +1,96 @@
+"""
+TEST FIXTURES
+Shared data for the numeric checks against statsmodels, scikit-learn and the notebook outputs
+
+The app modules import each other by bare name (they run from app/), so
+app/ is put on sys.path here.
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_DIR = Path(__file__).parent.parent
+APP_DIR = REPO_DIR / "app"
+DATA_DIR = REPO_DIR / "data"
+sys.path.insert(0, str(APP_DIR))
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+@pytest.fixture(scope='session')
+def training_data():
+    """The notebook's training split"""
+    return pd.read_csv(DATA_DIR / "train.csv")
+
+@pytest.fixture(scope='session')
+def model_features():
+    """Model features in the exported coefficient order"""
+    from scoring import MODEL_FILE, load_coefficients
+
+    return list(load_coefficients(APP_DIR / MODEL_FILE)['coefficients'])
+
+@pytest.fixture(scope='session')
+def pipeline_output(tmp_path_factory):
+    """final_data from a headless pipeline run over the notebook's extract (fresh stage cache)"""
+    from pipeline import run_pipeline
+
+    return run_pipeline(cache_dir=tmp_path_factory.mktemp('stage_cache'))
+
+@pytest.fixture(scope='session')
+def scored():
+    """Stored potentials and outcomes of every employee"""
+    final_data = pd.read_csv(APP_DIR / "final_data.csv")
+    return final_data['potential'].to_numpy(), final_data['promoted'].to_numpy()
+
+@pytest.fixture(scope='session')
+def final_data():
+    """The scored dataset the dashboard serves"""
+    return pd.read_csv(APP_DIR / "final_data.csv")
+
+@pytest.fixture
+def tied_scores():
+    """Scores with many ties and their outcomes, the hard case for a one-pass sweep"""
+    rng = np.random.default_rng(7)
+    scores = np.round(rng.random(2000), 2)
+    labels = (rng.random(2000) < scores).astype(np.int64)
+    return scores, labels
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def random_filter_state(df, rng, columns, potential_range=True):
+    """A random sidebar state: a few values per column (or none) and maybe a potential range"""
+    conditions = {}
+    for col in columns:
+        values = df[col].unique()
+        if rng.random() < 0.5:
+            conditions[col] = list(rng.choice(values, size=rng.integers(1, min(len(values), 4) + 1), replace=False))
+        else:
+            conditions[col] = []
+    value_range = None
+    if potential_range and rng.random() < 0.7:
+        # Stored potentials as bounds, so the inclusive edges are exercised
+        low, high = np.sort(rng.choice(df['potential'].to_numpy(), size=2))
+        value_range = (low, high)
+    return conditions, value_range
+
+def filter_mask(df, conditions, value_range=None):
+    """The same filter state applied with pandas"""
+    mask = pd.Series(True, index=df.index)
+    for col, selected in conditions.items():
+        if selected:
+            mask &= df[col].isin(selected)
+    if value_range is not None:
+        mask &= df['potential'].between(*value_range)
+    return mask.to_numpy()
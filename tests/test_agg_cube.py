@@ -0,0 +1,64 @@
+"""
+AGGREGATE CUBE TESTS
+Cube summaries, including partial edge buckets and ID fallbacks, against pandas groupby
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .conftest import random_filter_state, filter_mask
+from filter_index import FilterIndex
+from agg_cube import CUBE_DIMENSIONS, MEASURES, AggregateCube
+
+
+@pytest.fixture(scope='module')
+def cube(final_data):
+    return AggregateCube(final_data, FilterIndex(final_data))
+
+def expected_summary(df, box_values):
+    """Per-box measures of a filtered frame, every box present"""
+    grouped = df.groupby('box_category').agg(
+        count=('promoted', 'size'),
+        promoted=('promoted', 'sum'),
+        potential_sum=('potential', 'sum'),
+        performance_sum=('performance_rating', 'sum')
+    )
+    return grouped.reindex(pd.Index(box_values, name='box_category'), fill_value=0)[MEASURES]
+
+def assert_summary_equal(summary, expected):
+    np.testing.assert_array_equal(summary[['count', 'promoted']], expected[['count', 'promoted']])
+    np.testing.assert_allclose(summary[['potential_sum', 'performance_sum']], expected[['potential_sum', 'performance_sum']], rtol=1e-10)
+
+@pytest.mark.parametrize('seed', range(30))
+def test_summarize_matches_groupby(final_data, cube, seed):
+    rng = np.random.default_rng(seed)
+    conditions, value_range = random_filter_state(final_data, rng, CUBE_DIMENSIONS)
+
+    summary = cube.summarize(conditions, value_range)
+    expected = expected_summary(final_data[filter_mask(final_data, conditions, value_range)], cube.box_values)
+    assert_summary_equal(summary, expected)
+
+def test_range_on_bucket_edges_matches_groupby(final_data, cube):
+    # Bounds exactly on bucket edges, and a range inside a single bucket
+    for low, high in [(cube.edges[3], cube.edges[10]), (cube.edges[0], cube.edges[-1]), (cube.edges[5], cube.edges[5] + 1e-4)]:
+        summary = cube.summarize({}, (low, high))
+        expected = expected_summary(final_data[filter_mask(final_data, {}, (low, high))], cube.box_values)
+        assert_summary_equal(summary, expected)
+
+def test_id_filters_fall_back_to_rows(final_data, cube):
+    ids = list(final_data['employee_id'].iloc[::7])
+    conditions = {'department': list(final_data['department'].unique()[:3]), 'employee_id': ids}
+    value_range = tuple(final_data['potential'].quantile([0.2, 0.8]))
+
+    summary = cube.summarize(conditions, value_range)
+    expected = expected_summary(final_data[filter_mask(final_data, conditions, value_range)], cube.box_values)
+    assert_summary_equal(summary, expected)
+
+def test_cube_totals_cover_every_row(final_data, cube):
+    summary = cube.summarize({})
+    assert summary['count'].sum() == len(final_data)
+    assert summary['promoted'].sum() == final_data['promoted'].sum()
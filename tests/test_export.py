@@ -0,0 +1,66 @@
+"""
+EXPORT TESTS
+Chunked CSV / gzip / Parquet exports against a single-shot pandas export
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import gzip
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from export import format_chunk, export_rows, summary_stats_frame
+from filter_index import FilterIndex
+from agg_cube import AggregateCube
+
+
+@pytest.fixture(scope='module')
+def rows(final_data):
+    # Unsorted and not a multiple of the chunk size
+    return np.random.default_rng(3).choice(len(final_data), size=2345, replace=False)
+
+@pytest.fixture(scope='module')
+def expected(final_data, rows):
+    return format_chunk(final_data, rows)
+
+def test_csv_matches_single_write(final_data, rows, expected):
+    data = export_rows(final_data, rows, 'CSV', chunk_rows=500).getvalue()
+    assert data.decode('utf-8') == expected.to_csv(index=False)
+
+def test_gzip_matches_single_write(final_data, rows, expected):
+    data = export_rows(final_data, rows, 'CSV (gzip)', chunk_rows=500).getvalue()
+    assert gzip.decompress(data).decode('utf-8') == expected.to_csv(index=False)
+
+def test_parquet_round_trips(final_data, rows, expected):
+    pytest.importorskip('pyarrow')
+
+    data = export_rows(final_data, rows, 'Parquet', chunk_rows=500)
+    pd.testing.assert_frame_equal(pd.read_parquet(data), expected.reset_index(drop=True))
+
+def test_empty_selection_writes_the_header(final_data, expected):
+    data = export_rows(final_data, np.empty(0, dtype=np.int64), 'CSV').getvalue()
+    assert data.decode('utf-8').splitlines() == [','.join(expected.columns)]
+
+def test_unknown_format_is_rejected(final_data, rows):
+    with pytest.raises(ValueError):
+        export_rows(final_data, rows, 'XLSX')
+
+def test_summary_matches_groupby(final_data):
+    cube = AggregateCube(final_data, FilterIndex(final_data))
+    summary = summary_stats_frame(cube.summarize({'department': ['Sales', 'Engineering']}))
+
+    subset = final_data[final_data['department'].isin(['Sales', 'Engineering'])]
+    grouped = subset.groupby('box_category').agg(
+        count=('promoted', 'size'),
+        promoted=('promoted', 'sum'),
+        potential=('potential', 'mean'),
+        performance=('performance_rating', 'mean')
+    )
+    summary = summary.set_index('Category').loc[grouped.index]
+    np.testing.assert_array_equal(summary['Count'], grouped['count'])
+    np.testing.assert_array_equal(summary['Promoted'], grouped['promoted'])
+    np.testing.assert_allclose(summary['Avg Potential'], grouped['potential'])
+    np.testing.assert_allclose(summary['Avg Performance'], grouped['performance'])
@@ -0,0 +1,71 @@
+"""
+FAIRNESS AUDIT TESTS
+Benjamini-Hochberg, the slice rate test and the regrouped sums against direct computation
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .conftest import APP_DIR
+from fairness_audit import AUDIT_DIMENSIONS, ALL, fairness_audit, benjamini_hochberg, two_sided_p
+
+
+@pytest.fixture(scope='module')
+def final_data():
+    return pd.read_csv(APP_DIR / "final_data.csv")
+
+@pytest.fixture(scope='module')
+def audit(final_data):
+    return fairness_audit(final_data)
+
+def test_benjamini_hochberg_matches_statsmodels():
+    multitest = pytest.importorskip('statsmodels.stats.multitest')
+
+    p = np.random.default_rng(2).random(500) ** 3
+    p[::50] = np.nan
+    valid = ~np.isnan(p)
+    q = benjamini_hochberg(p)
+
+    _, expected, _, _ = multitest.multipletests(p[valid], method='fdr_bh')
+    np.testing.assert_allclose(q[valid], expected)
+    assert np.isnan(q[~valid]).all()
+
+def test_rate_test_matches_chi_square(final_data, audit):
+    stats = pytest.importorskip('scipy.stats')
+
+    # The notebook's 2x2 chi-square (no continuity correction) equals z^2
+    for department in final_data['department'].unique()[:3]:
+        row = audit[(audit['grouping'] == 'department') & (audit['department'] == department)].iloc[0]
+        in_slice = final_data['department'] == department
+        table = pd.crosstab(in_slice, final_data['promoted'])
+        chi2, p, _, _ = stats.chi2_contingency(table, correction=False)
+        assert row['rate_z'] ** 2 == pytest.approx(chi2)
+        assert row['rate_p'] == pytest.approx(p)
+
+def test_slice_sums_match_groupby(final_data, audit):
+    pair = audit[audit['grouping'] == 'department × role_level']
+    expected = final_data.groupby(['department', 'role_level']).agg(
+        n=('promoted', 'size'), promoted=('promoted', 'sum'), predicted=('prediction_promoted', 'sum'), expected=('potential', 'sum')
+    ).reset_index()
+
+    merged = pair.merge(expected, on=['department', 'role_level'], suffixes=('', '_expected'))
+    assert len(merged) == len(expected) == len(pair)
+    assert (pair['education_level'] == ALL).all()
+    for col in ['n', 'promoted', 'predicted', 'expected']:
+        np.testing.assert_allclose(merged[col], merged[f"{col}_expected"])
+
+def test_every_grouping_set_covers_everyone(final_data, audit):
+    totals = audit.groupby('grouping')['n'].sum()
+    assert len(totals) == 2 ** len(AUDIT_DIMENSIONS) - 1
+    assert (totals == len(final_data)).all()
+
+def test_two_sided_p():
+    stats = pytest.importorskip('scipy.stats')
+
+    z = np.array([-3.0, -1.0, 0.0, 0.5, 2.5, np.nan])
+    np.testing.assert_allclose(two_sided_p(z)[:-1], 2 * stats.norm.sf(np.abs(z[:-1])))
+    assert np.isnan(two_sided_p(z)[-1])
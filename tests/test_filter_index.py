@@ -0,0 +1,54 @@
+"""
+FILTER INDEX TESTS
+Bitmap and posting-list selections against pandas boolean masks
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pytest
+
+from .conftest import random_filter_state, filter_mask
+from filter_index import FILTER_COLUMNS, BITMAP_MAX_CARDINALITY, FilterIndex
+
+
+@pytest.fixture(scope='module')
+def index(final_data):
+    return FilterIndex(final_data)
+
+def test_high_cardinality_columns_use_posting_lists(index):
+    assert 'employee_id' in index.postings
+    assert all(len(index.values[col]) <= BITMAP_MAX_CARDINALITY for col in index.bitmaps)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_select_matches_pandas(final_data, index, seed):
+    rng = np.random.default_rng(seed)
+    conditions, value_range = random_filter_state(final_data, rng, FILTER_COLUMNS[:5])
+    if seed % 2:
+        # Keep the ID filter's selection non-empty by drawing IDs from the rows left
+        kept = final_data[filter_mask(final_data, conditions)]
+        if len(kept):
+            conditions['employee_id'] = list(rng.choice(kept['employee_id'].to_numpy(), size=min(len(kept), 50), replace=False))
+
+    rows = index.select(conditions, value_range)
+    np.testing.assert_array_equal(rows, np.flatnonzero(filter_mask(final_data, conditions, value_range)))
+
+def test_empty_selection_means_no_filter(final_data, index):
+    rows = index.select({col: [] for col in FILTER_COLUMNS})
+    np.testing.assert_array_equal(rows, np.arange(len(final_data)))
+
+def test_unknown_values_select_nothing(index):
+    assert len(index.select({'department': ['No Such Department']})) == 0
+    assert len(index.select({'employee_id': ['EMP-MISSING']})) == 0
+
+def test_range_bounds_are_inclusive(final_data, index):
+    potential = np.sort(final_data['potential'].to_numpy())
+    low, high = potential[100], potential[200]
+    rows = index.range_rows(low, high)
+    assert len(rows) == ((final_data['potential'] >= low) & (final_data['potential'] <= high)).sum()
+
+def test_full_range_selects_everything(final_data, index):
+    potential = final_data['potential']
+    rows = index.select({}, (potential.min(), potential.max()))
+    assert len(rows) == len(final_data)
@@ -0,0 +1,103 @@
+"""
+HISTORY STORE TESTS
+Cycle partitions, latest-part-wins reads and 9-box transitions against pandas merges
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from history_store import (
+    append_snapshot, list_cycles, read_cycle, compare_cycles, box_history, history_dir, cycle_label
+)
+from scoring import BOX_LABELS
+
+
+@pytest.fixture(scope='module')
+def cycles(final_data, tmp_path_factory):
+    """Two stored cycles: the second drops some employees, adds others and moves a third of the boxes"""
+    pytest.importorskip('pyarrow')
+
+    root = tmp_path_factory.mktemp('history')
+    rng = np.random.default_rng(9)
+    before = final_data.iloc[:6000].copy()
+    after = final_data.iloc[500:7000].copy()
+    moved = rng.random(len(after)) < 0.33
+    after.loc[moved, 'box_category'] = rng.choice(BOX_LABELS, size=moved.sum())
+    after['potential'] = after['potential'] + rng.normal(0, 0.01, size=len(after))
+
+    append_snapshot(before, '2024-01-01', root)
+    append_snapshot(after, '2025-01-01', root)
+    return root, before, after
+
+def test_history_dir_resolution(tmp_path, monkeypatch):
+    monkeypatch.setenv('NINEBOX_HISTORY_DIR', str(tmp_path))
+    assert history_dir() == tmp_path
+    assert history_dir(tmp_path / 'other') == tmp_path / 'other'
+
+def test_cycles_are_listed_in_order(cycles):
+    root, _, _ = cycles
+    assert list_cycles(root) == ['2024-01-01', '2025-01-01']
+    assert cycle_label('2025-01-01') == '2025-01-01'
+
+def test_read_cycle_round_trips(cycles):
+    root, before, _ = cycles
+    stored = read_cycle('2024-01-01', ['box_category', 'potential'], root)
+    assert list(stored.columns) == ['employee_id', 'box_category', 'potential']
+    np.testing.assert_array_equal(stored['employee_id'].astype(str), before['employee_id'])
+    np.testing.assert_array_equal(stored['box_category'].astype(str), before['box_category'])
+    np.testing.assert_allclose(stored['potential'], before['potential'], rtol=1e-6)
+
+def test_latest_part_wins(final_data, tmp_path):
+    pytest.importorskip('pyarrow')
+
+    first = final_data.iloc[:100]
+    append_snapshot(first, '2024-06-30', tmp_path)
+    correction = first.iloc[:10].assign(box_category=BOX_LABELS[0])
+    append_snapshot(correction, '2024-06-30', tmp_path)
+
+    stored = read_cycle('2024-06-30', ['box_category'], tmp_path).set_index('employee_id')['box_category'].astype(str)
+    expected = first.set_index('employee_id')['box_category'].copy()
+    expected.iloc[:10] = BOX_LABELS[0]
+    assert len(stored) == 100
+    assert (stored.loc[expected.index] == expected).all()
+
+def test_missing_cycle_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        read_cycle('2020-01-01', root=tmp_path)
+
+def test_transitions_match_crosstab(cycles):
+    root, before, after = cycles
+    comparison = compare_cycles('2024-01-01', '2025-01-01', root)
+
+    merged = before.merge(after, on='employee_id', suffixes=('_before', '_after'))
+    expected = pd.crosstab(
+        pd.Categorical(merged['box_category_before'], categories=BOX_LABELS),
+        pd.Categorical(merged['box_category_after'], categories=BOX_LABELS),
+        dropna=False
+    )
+    np.testing.assert_array_equal(comparison['matrix'].to_numpy(), expected.to_numpy())
+    assert comparison['joined'] == len(merged)
+    assert comparison['left'] == len(before) - len(merged)
+    assert comparison['joined_new'] == len(after) - len(merged)
+
+    # Band moves from the label positions in BOX_LABELS
+    codes_before = merged['box_category_before'].map(BOX_LABELS.index).to_numpy()
+    codes_after = merged['box_category_after'].map(BOX_LABELS.index).to_numpy()
+    movement = comparison['movement'].set_index('employee_id').loc[merged['employee_id']]
+    np.testing.assert_array_equal(movement['potential_move'], codes_after // 3 - codes_before // 3)
+    np.testing.assert_array_equal(movement['performance_move'], codes_after % 3 - codes_before % 3)
+
+def test_box_history_matches_pivot(cycles):
+    root, before, after = cycles
+    history = box_history(['2024-01-01', '2025-01-01'], root)
+
+    assert len(history) == len(set(before['employee_id']) | set(after['employee_id']))
+    for label, frame in [('2024-01-01', before), ('2025-01-01', after)]:
+        codes = history.loc[frame['employee_id'], label].to_numpy()
+        np.testing.assert_array_equal(codes, frame['box_category'].map(BOX_LABELS.index).to_numpy())
+    absent = history.index.difference(pd.Index(after['employee_id']))
+    assert (history.loc[absent, '2025-01-01'] == -1).all()
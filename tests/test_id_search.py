@@ -0,0 +1,48 @@
+"""
+ID SEARCH TESTS
+Prefix matches against a brute-force startswith scan
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pytest
+
+from id_search import TOP_K, IdSearch
+
+
+def brute_force(ids, query):
+    """Every ID starting with the trimmed, case-folded query, in key order"""
+    key = query.strip().upper()
+    return sorted((i for i in ids if i.upper().startswith(key)), key=str.upper)
+
+@pytest.fixture(scope='module')
+def employee_ids(final_data):
+    return final_data['employee_id'].astype(str).tolist()
+
+@pytest.mark.parametrize('query', ['', 'E', 'emp', 'EMP00', 'EMP0091', ' emp0045 ', 'EMP009999', 'XYZ'])
+def test_matches_equal_brute_force(employee_ids, query):
+    search = IdSearch(employee_ids)
+    expected = brute_force(employee_ids, query)
+    found, total = search.matches(query)
+    assert total == len(expected)
+    assert found == expected[:TOP_K]
+
+def test_random_prefixes(employee_ids):
+    search = IdSearch(employee_ids)
+    rng = np.random.default_rng(13)
+    for employee_id in rng.choice(employee_ids, size=50):
+        query = employee_id[:rng.integers(1, len(employee_id) + 1)].lower()
+        expected = brute_force(employee_ids, query)
+        found, total = search.matches(query, k=10)
+        assert (found, total) == (expected[:10], len(expected))
+
+def test_mixed_case_and_unicode_ids():
+    ids = ['abc-1', 'ABC-2', 'Abd', 'émile', 'Émile-2', 'zz', 'ZZÿ']
+    search = IdSearch(ids)
+    for query in ['ab', 'ABC', 'é', 'É', 'z', 'zz', 'q', None]:
+        expected = brute_force(ids, query or '')
+        found, total = search.matches(query)
+        assert (found, total) == (expected, len(expected))
+    assert len(search) == len(ids)
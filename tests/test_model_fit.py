@@ -0,0 +1,119 @@
+"""
+IRLS SOLVER TESTS
+model_fit.fit_logit against statsmodels and against row replication
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pytest
+
+from model_fit import (
+    fit_logit, design_matrix, bootstrap_coefficients, coefficient_intervals,
+    cross_validate, potential_bands, validation_report
+)
+from scoring import crosses_cutoff
+
+
+def test_fit_matches_statsmodels(training_data, model_features):
+    sm = pytest.importorskip('statsmodels.api')
+
+    X = design_matrix(training_data, model_features)
+    y = training_data['promoted'].to_numpy(dtype=np.float64)
+    expected = sm.Logit(y, X).fit(disp=0)
+
+    beta = fit_logit(X, y)
+    np.testing.assert_allclose(beta, expected.params, rtol=1e-6, atol=1e-9)
+
+def test_frequency_weights_match_replicated_rows(training_data, model_features):
+    X = design_matrix(training_data, model_features)
+    y = training_data['promoted'].to_numpy(dtype=np.float64)
+    rng = np.random.default_rng(0)
+    counts = np.bincount(rng.integers(0, len(y), len(y)), minlength=len(y))
+
+    weighted = fit_logit(X, y, weights=counts.astype(np.float64))
+    replicated = fit_logit(np.repeat(X, counts, axis=0), np.repeat(y, counts))
+    np.testing.assert_allclose(weighted, replicated, rtol=1e-8, atol=1e-10)
+
+def test_warm_start_reaches_the_same_fit(training_data, model_features):
+    X = design_matrix(training_data, model_features)
+    y = training_data['promoted'].to_numpy(dtype=np.float64)
+    beta = fit_logit(X, y)
+    # Started from a half-sample fit, as the bootstrap starts from the full-sample fit
+    half_sample = fit_logit(X[::2], y[::2])
+    np.testing.assert_allclose(fit_logit(X, y, beta0=half_sample), beta, rtol=1e-8, atol=1e-10)
+
+def test_cross_validation_matches_sklearn_folds(training_data, model_features):
+    pytest.importorskip('sklearn')
+    from sklearn.metrics import precision_score, recall_score, fbeta_score
+
+    X = design_matrix(training_data, model_features)
+    y = training_data['promoted'].to_numpy(dtype=np.float64)
+    cv = cross_validate(X, y, n_folds=3, threshold=0.14, seed=1, n_workers=1)
+
+    # Refit each fold directly and score it with scikit-learn
+    folds = np.random.default_rng(1).permutation(len(y)) % 3
+    for fold in range(3):
+        held_out = folds == fold
+        beta = fit_logit(X[~held_out], y[~held_out])
+        predicted = (1.0 / (1.0 + np.exp(-(X[held_out] @ beta))) >= 0.14).astype(int)
+        actual = y[held_out].astype(int)
+        row = cv.iloc[fold]
+        assert row['precision'] == pytest.approx(precision_score(actual, predicted, zero_division=0))
+        assert row['recall'] == pytest.approx(recall_score(actual, predicted, zero_division=0))
+        assert row['f2'] == pytest.approx(fbeta_score(actual, predicted, beta=2, zero_division=0))
+
+def test_bands_bracket_the_replicate_scores():
+    rng = np.random.default_rng(3)
+    X = np.column_stack([np.ones(50), rng.normal(size=(50, 2))])
+    betas = rng.normal(scale=0.3, size=(400, 3))
+    low, high = potential_bands(X, betas, block_rows=7)
+
+    scores = 1.0 / (1.0 + np.exp(-(X @ betas.T)))
+    np.testing.assert_allclose(low, np.quantile(scores, 0.025, axis=1))
+    np.testing.assert_allclose(high, np.quantile(scores, 0.975, axis=1))
+    assert crosses_cutoff(low, high, [np.median(scores)]).any()
+
+@pytest.fixture
+def nearly_separated():
+    """A rare flag with one negative: resamples or folds missing either outcome among its rows are separated"""
+    rng = np.random.default_rng(8)
+    n = 200
+    x = rng.normal(size=n)
+    y = (rng.random(n) < 1 / (1 + np.exp(-x))).astype(np.float64)
+    flag = np.zeros(n)
+    flag[:4] = 1
+    y[:4] = [1, 1, 1, 0]
+    return np.column_stack([np.ones(n), x, flag]), y
+
+def test_separated_fit_raises(nearly_separated):
+    X, y = nearly_separated
+    keep = np.arange(len(y)) != 3
+    with pytest.raises(ValueError):
+        fit_logit(X[keep], y[keep])
+
+def test_failed_replicates_are_dropped_and_counted(nearly_separated):
+    X, y = nearly_separated
+    beta_full, betas = bootstrap_coefficients(X, y, n_boot=60, seed=0, n_workers=1)
+    failed = np.isnan(betas).any(axis=1)
+
+    # Exactly the resamples whose flagged rows are all one outcome fail to fit
+    n = len(y)
+    seeds = np.random.SeedSequence(0).generate_state(60)
+    counts = [np.bincount(np.random.default_rng(s).integers(0, n, n), minlength=n) for s in seeds]
+    separated = [c[3] == 0 or c[:3].sum() == 0 for c in counts]
+    np.testing.assert_array_equal(failed, separated)
+    assert 0 < failed.sum() < len(betas)
+
+    intervals = coefficient_intervals(['Intercept', 'x', 'flag'], beta_full, betas)
+    assert np.isfinite(intervals[['boot_se', 'ci_low', 'ci_high']].to_numpy()).all()
+    low, high = potential_bands(X, betas)
+    np.testing.assert_allclose(low, np.quantile(1 / (1 + np.exp(-(X @ betas[~failed].T))), 0.025, axis=1))
+
+    cv = cross_validate(X, y, n_folds=5, seed=0, n_workers=1)
+    report = validation_report(intervals, cv)
+    assert report['n_bootstrap'] == (~failed).sum()
+    assert report['n_bootstrap_failed'] == failed.sum()
+    assert report['cv_failed_folds'] == 1
+    assert np.isfinite(report['cv_mean']['recall'])
@@ -0,0 +1,100 @@
+"""
+ORG TREE TESTS
+Subtree slices, rollups and management chains against a brute-force walk of the reporting lines
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_index import FilterIndex
+from org_tree import ORG_KEY, OrgTree, select_rows
+from scoring import BOX_LABELS
+
+
+def descendant_rows(df, manager_id):
+    """Rows of everyone under manager_id, by breadth-first search over the reporting lines"""
+    reports = defaultdict(list)
+    for row, parent in enumerate(df['manager_id'].astype(str)):
+        reports[parent].append(row)
+    ids = df['employee_id'].astype(str).to_numpy()
+    rows, frontier, seen = [], [str(manager_id)], {str(manager_id)}
+    while frontier:
+        children = [r for m in frontier for r in reports.get(m, []) if ids[r] not in seen]
+        seen.update(ids[r] for r in children)
+        rows.extend(children)
+        frontier = [ids[r] for r in children]
+    return np.sort(np.array(rows, dtype=np.int64))
+
+@pytest.fixture(scope='module')
+def deep_org():
+    """Random deep hierarchy: a virtual executive, 2,000 employees and a two-person reporting loop"""
+    rng = np.random.default_rng(21)
+    n = 2000
+    ids = [f"E{i:05d}" for i in range(n)]
+    managers = ['CEO'] + [ids[rng.integers(max(0, i - 50), i)] for i in range(1, n)]
+    managers[n - 1], managers[n - 2] = ids[n - 2], ids[n - 1]
+    return pd.DataFrame({
+        'employee_id': ids,
+        'manager_id': managers,
+        'box_category': rng.choice(BOX_LABELS, size=n),
+        'promoted': rng.integers(0, 2, size=n)
+    })
+
+@pytest.fixture(scope='module', params=['final_data', 'deep_org'])
+def org(request):
+    df = request.getfixturevalue(request.param)
+    return df, OrgTree(df)
+
+def test_subtree_rows_match_search(org):
+    df, tree = org
+    for manager_id in tree.managers()[:40]:
+        np.testing.assert_array_equal(tree.subtree_rows([manager_id]), descendant_rows(df, manager_id))
+        assert tree.org_size(manager_id) == len(descendant_rows(df, manager_id))
+
+def test_overlapping_managers_are_unioned(org):
+    df, tree = org
+    managers = tree.managers()[:5]
+    expected = np.unique(np.concatenate([descendant_rows(df, m) for m in managers]))
+    np.testing.assert_array_equal(tree.subtree_rows(managers), expected)
+
+def test_rollup_matches_groupby(org):
+    df, tree = org
+    rollup = tree.rollup().set_index('manager_id')
+    for manager_id in tree.managers()[:40]:
+        sub = df.iloc[descendant_rows(df, manager_id)]
+        row = rollup.loc[manager_id]
+        assert row['headcount'] == len(sub)
+        assert row['promotion_rate'] == pytest.approx(sub['promoted'].mean() if len(sub) else 0.0)
+        counts = sub['box_category'].value_counts().reindex(BOX_LABELS, fill_value=0)
+        np.testing.assert_array_equal(row[BOX_LABELS].to_numpy(dtype=np.int64), counts.to_numpy())
+        assert row['direct_reports'] == len(tree.direct_reports(manager_id))
+
+def test_chain_follows_manager_ids(org):
+    df, tree = org
+    parent = dict(zip(df['employee_id'].astype(str), df['manager_id'].astype(str)))
+    for employee_id in df['employee_id'].astype(str).iloc[::97]:
+        chain = tree.chain(employee_id)
+        assert chain[-1] == employee_id
+        for above, below in zip(chain[:-1], chain[1:]):
+            assert parent[below] == above
+
+def test_reporting_loop_is_cut(deep_org):
+    tree = OrgTree(deep_org)
+    assert len(tree.unreached) == 0
+    assert len(tree.preorder) == len(tree.ids)
+
+def test_org_filter_intersects_the_index(final_data):
+    tree = OrgTree(final_data)
+    index = FilterIndex(final_data)
+    manager_id = tree.managers()[0]
+    conditions = {'department': ['Sales', 'Engineering'], ORG_KEY: [manager_id]}
+
+    rows = select_rows(index, tree, conditions)
+    expected = np.intersect1d(descendant_rows(final_data, manager_id), np.flatnonzero(final_data['department'].isin(['Sales', 'Engineering'])))
+    np.testing.assert_array_equal(rows, expected)
@@ -0,0 +1,80 @@
+"""
+PIPELINE / NOTEBOOK PARITY TESTS
+The headless pipeline reproduces the notebook's published outputs from the same extract
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .conftest import APP_DIR, DATA_DIR
+import pipeline
+from pipeline import clean_stage, clean_frame, encode_stage, split_stage, fit_stage, run_pipeline, DEFAULT_SOURCE, DEPENDENT_VAR
+from model_fit import VALIDATION_FILE
+from scoring import MODEL_FILE, BAND_COLUMNS, load_coefficients
+
+
+@pytest.fixture(scope='module')
+def notebook_output():
+    return pd.read_csv(DATA_DIR / "final_data.csv")
+
+@pytest.fixture(scope='module')
+def split():
+    df_cleaned = clean_frame(pd.read_csv(DEFAULT_SOURCE))
+    return split_stage(encode_stage(df_cleaned))
+
+def test_final_data_matches_notebook(pipeline_output, notebook_output):
+    assert list(pipeline_output.columns) == list(notebook_output.columns)
+    assert len(pipeline_output) == len(notebook_output)
+
+    np.testing.assert_array_equal(pipeline_output['employee_id'].astype(str), notebook_output['employee_id'])
+    np.testing.assert_allclose(pipeline_output['potential'], notebook_output['potential'], rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(pipeline_output['prediction_promoted'], notebook_output['prediction_promoted'])
+    np.testing.assert_array_equal(pipeline_output['box_category'].astype(str), notebook_output['box_category'])
+    for col in BAND_COLUMNS:
+        np.testing.assert_allclose(pipeline_output[col], notebook_output[col], rtol=0, atol=1e-12)
+
+def test_every_producer_writes_the_same_columns(notebook_output):
+    published = pd.read_csv(APP_DIR / "final_data.csv", nrows=0)
+    assert list(published.columns) == list(notebook_output.columns)
+    assert set(BAND_COLUMNS) <= set(published.columns)
+    assert (APP_DIR / VALIDATION_FILE).exists()
+
+def test_split_matches_notebook(split):
+    for name, is_test in [("train.csv", False), ("test.csv", True)]:
+        notebook = pd.read_csv(DATA_DIR / name)
+        rows = split[split['is_test'] == is_test].drop(columns='is_test')
+        pd.testing.assert_frame_equal(rows.reset_index(drop=True), notebook, check_dtype=False)
+
+def test_coefficients_match_published_model(split):
+    pytest.importorskip('statsmodels')
+
+    model = fit_stage(split)
+    published = load_coefficients(APP_DIR / MODEL_FILE)
+    assert model['intercept'] == pytest.approx(published['intercept'], rel=1e-9)
+    assert list(model['coefficients']) == list(published['coefficients'])
+    for name, value in model['coefficients'].items():
+        assert value == pytest.approx(published['coefficients'][name], rel=1e-9, abs=1e-12)
+
+def test_streamed_clean_matches_one_read(tmp_path):
+    path = tmp_path / "clean.parquet"
+    clean_stage(DEFAULT_SOURCE, path, chunk_rows=997)
+
+    streamed = pd.read_parquet(path)
+    expected = clean_frame(pd.read_csv(DEFAULT_SOURCE)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+    assert streamed[DEPENDENT_VAR].sum() == expected[DEPENDENT_VAR].sum()
+
+@pytest.mark.parametrize('setting, value', [
+    ('CLEAN_VERSION', 2),
+    ('MIN_TENURE_YEARS', 2),
+    ('EXTRACT_DTYPES', {**pipeline.EXTRACT_DTYPES, 'salary': 'float64'})
+])
+def test_clean_cache_key_tracks_its_inputs(tmp_path, monkeypatch, setting, value):
+    run_pipeline(cache_dir=tmp_path, n_boot=0)
+    monkeypatch.setattr(pipeline, setting, value)
+    run_pipeline(cache_dir=tmp_path, n_boot=0)
+    assert len(list(tmp_path.glob('clean-*.parquet'))) == 2
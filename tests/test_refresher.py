@@ -0,0 +1,98 @@
+"""
+REFRESHER TESTS
+Change detection, settle-then-swap, failed builds and the store/CSV pair on a copy of the artifacts
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from .conftest import APP_DIR
+from data_store import STORE_FILE, CSV_FILE
+from model_fit import VALIDATION_FILE
+from refresher import DataRefresher, fingerprint
+from scoring import MODEL_FILE
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Private copy of the published artifacts"""
+    pytest.importorskip('pyarrow')
+
+    for name in [STORE_FILE, CSV_FILE, MODEL_FILE, VALIDATION_FILE]:
+        shutil.copy(APP_DIR / name, tmp_path / name)
+    return tmp_path
+
+def publish(data_dir, df):
+    """Overwrite the CSV the way a pipeline run would"""
+    df.to_csv(data_dir / CSV_FILE, index=False)
+
+def settle(refresher, polls=4):
+    """Poll a few times, returning how many polls swapped in a snapshot"""
+    return sum(refresher.check() for _ in range(polls))
+
+def test_unchanged_artifacts_never_rebuild(data_dir):
+    refresher = DataRefresher(data_dir, poll_seconds=0)
+    assert settle(refresher) == 0
+    assert refresher.current.version == 1
+
+def test_change_swaps_once_after_settling(data_dir, final_data):
+    refresher = DataRefresher(data_dir, poll_seconds=0)
+    publish(data_dir, final_data.iloc[:-25])
+
+    # The first poll only notes the change; the next one rebuilds
+    assert not refresher.check()
+    assert refresher.check()
+    assert refresher.current.version == 2
+    assert len(refresher.current.df) == len(final_data) - 25
+
+    # Rebuilding the stale store on load must not count as another publish
+    assert settle(refresher) == 0
+    assert refresher.current.version == 2
+
+def test_snapshot_matches_the_published_rows(data_dir, final_data):
+    refresher = DataRefresher(data_dir, poll_seconds=0)
+    subset = final_data[final_data['department'] != 'Sales']
+    publish(data_dir, subset)
+    settle(refresher)
+
+    snapshot = refresher.current
+    np.testing.assert_array_equal(snapshot.df['employee_id'].astype(str), subset['employee_id'])
+    summary = snapshot.cube.summarize({})
+    expected = subset['box_category'].value_counts()
+    assert (summary['count'][expected.index] == expected).all()
+    assert 'Sales' not in snapshot.index.values['department']
+
+def test_failed_build_keeps_serving(data_dir, final_data):
+    refresher = DataRefresher(data_dir, poll_seconds=0)
+    (data_dir / CSV_FILE).write_text("employee_id\nEMP1\n")
+
+    assert settle(refresher) == 0
+    assert refresher.current.version == 1
+    assert len(refresher.current.df) == len(final_data)
+    assert refresher.last_error
+
+    # Repairing the file clears the error on the next swap
+    publish(data_dir, final_data)
+    assert settle(refresher) == 1
+    assert refresher.last_error is None
+
+def test_model_is_optional(data_dir):
+    (data_dir / MODEL_FILE).unlink()
+    snapshot = DataRefresher(data_dir, poll_seconds=0).current
+    assert snapshot.model is None and snapshot.scorer is None
+
+def test_store_is_watched_only_without_its_csv(data_dir, final_data):
+    assert STORE_FILE not in [name for name, _, _ in fingerprint(data_dir)]
+
+    (data_dir / CSV_FILE).unlink()
+    refresher = DataRefresher(data_dir, poll_seconds=0)
+    assert refresher.current.source == STORE_FILE
+    pd.read_parquet(data_dir / STORE_FILE).iloc[:10].to_parquet(data_dir / STORE_FILE, index=False)
+    assert settle(refresher) == 1
+    assert len(refresher.current.df) == 10
@@ -0,0 +1,84 @@
+"""
+SALARY SKETCH TESTS
+Merged-histogram salary summaries against numpy quantiles and brute-force fences
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pytest
+
+import salary_sketch
+from .conftest import random_filter_state, filter_mask
+from agg_cube import CUBE_DIMENSIONS
+from filter_index import FilterIndex
+from salary_sketch import WHISKER_IQR, SalarySketches, exact_summary
+
+
+@pytest.fixture(scope='module')
+def sketches(final_data):
+    return SalarySketches(final_data, FilterIndex(final_data))
+
+def brute_force_box(values, q1, q3):
+    """Whiskers and outlier count for given quartiles, by direct scan"""
+    iqr = q3 - q1
+    low_limit, high_limit = q1 - WHISKER_IQR * iqr, q3 + WHISKER_IQR * iqr
+    inside = values[(values >= low_limit) & (values <= high_limit)]
+    return inside.min(), inside.max(), int(((values < low_limit) | (values > high_limit)).sum())
+
+def test_exact_summary_matches_numpy():
+    values = np.random.default_rng(4).lognormal(11, 0.4, size=3001)
+    summary = exact_summary(values)
+    np.testing.assert_allclose([summary['q1'], summary['median'], summary['q3']], np.quantile(values, [0.25, 0.5, 0.75]))
+    lower, upper, n_outliers = brute_force_box(values, summary['q1'], summary['q3'])
+    assert (summary['lowerfence'], summary['upperfence'], summary['n_outliers']) == (lower, upper, n_outliers)
+
+@pytest.mark.parametrize('seed', range(10))
+def test_small_selections_are_exact(final_data, sketches, seed):
+    conditions, value_range = random_filter_state(final_data, np.random.default_rng(seed), CUBE_DIMENSIONS)
+    values = final_data.loc[filter_mask(final_data, conditions, value_range), 'salary'].to_numpy(dtype=np.float64)
+    if not 0 < len(values) <= salary_sketch.EXACT_MAX_ROWS:
+        pytest.skip("selection outside the exact-summary size")
+
+    summary = sketches.summarize(conditions, value_range)
+    expected = exact_summary(values)
+    assert not summary['approximate']
+    for key in ['n', 'q1', 'median', 'q3', 'lowerfence', 'upperfence', 'n_outliers']:
+        assert summary[key] == pytest.approx(expected[key])
+
+@pytest.mark.parametrize('seed', range(10))
+def test_sketch_summary_is_within_a_bin(final_data, sketches, seed, monkeypatch):
+    # Force the sketch path on every covered selection
+    monkeypatch.setattr(salary_sketch, 'EXACT_MAX_ROWS', 0)
+    conditions, _ = random_filter_state(final_data, np.random.default_rng(seed), CUBE_DIMENSIONS, potential_range=False)
+    values = final_data.loc[filter_mask(final_data, conditions), 'salary'].to_numpy(dtype=np.float64)
+    if len(values) == 0:
+        assert sketches.summarize(conditions) is None
+        return
+
+    summary = sketches.summarize(conditions)
+    assert summary['approximate'] and summary['n'] == len(values)
+
+    # Each binned quartile lies within one bin of the order statistics around it
+    bin_width = sketches.edges[1] - sketches.edges[0]
+    values = np.sort(values)
+    for q, approx in zip([0.25, 0.5, 0.75], [summary['q1'], summary['median'], summary['q3']]):
+        below = values[max(int(np.floor(q * len(values))) - 1, 0)]
+        above = values[min(int(np.ceil(q * len(values))), len(values) - 1)]
+        assert below - bin_width <= approx <= above + bin_width
+
+    # Whiskers and outliers are exact given the sketch's quartiles
+    lower, upper, n_outliers = brute_force_box(values, summary['q1'], summary['q3'])
+    assert (summary['lowerfence'], summary['upperfence'], summary['n_outliers']) == (lower, upper, n_outliers)
+
+def test_whole_population_uses_the_sketches(final_data, sketches):
+    assert len(final_data) > salary_sketch.EXACT_MAX_ROWS
+    summary = sketches.summarize({})
+    assert summary['approximate'] and summary['n'] == len(final_data)
+
+def test_id_filters_fall_back_to_exact(final_data, sketches):
+    ids = list(final_data['employee_id'].iloc[:500])
+    summary = sketches.summarize({'employee_id': ids})
+    assert not summary['approximate']
+    assert summary['median'] == np.median(final_data['salary'].iloc[:500])
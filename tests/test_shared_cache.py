@@ -0,0 +1,90 @@
+"""
+SHARED CACHE TESTS
+Canonical state hashing and byte-budgeted LRU eviction against a reference model
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from shared_cache import SharedCache, canonical_hash, estimate_size
+
+
+def test_equivalent_states_hash_alike():
+    a = {'department': ['Sales', 'HR'], 'range': (0.1, 0.9), 'ids': {'E2', 'E1'}}
+    b = {'ids': ['E1', 'E2'], 'range': (np.float64(0.1), 0.9), 'department': ['HR', 'Sales']}
+    assert canonical_hash(a) == canonical_hash(b)
+
+def test_different_states_hash_apart():
+    assert canonical_hash({'range': (0.1, 0.9)}) != canonical_hash({'range': (0.9, 0.1)})
+    assert canonical_hash({'department': ['Sales']}) != canonical_hash({'department': ['HR']})
+    assert canonical_hash({'promoted': [1]}) != canonical_hash({'promoted': ['1']})
+
+def test_lru_matches_reference_model():
+    # Arrays of varying size under a small budget; replay against an OrderedDict LRU
+    rng = np.random.default_rng(11)
+    sizes = {k: int(rng.integers(1, 40)) * 1000 for k in range(30)}
+    max_bytes = 100_000
+    cache = SharedCache(max_bytes=max_bytes)
+    reference, reference_bytes = OrderedDict(), 0
+    hits = misses = 0
+
+    for key in rng.integers(0, 30, size=2000):
+        key = int(key)
+        built = []
+        cache.get_or_create('arrays', {'key': key}, lambda: built.append(key) or np.zeros(sizes[key], dtype=np.uint8))
+
+        if key in reference:
+            reference.move_to_end(key)
+            hits += 1
+            assert not built
+        else:
+            misses += 1
+            assert built == [key]
+            reference[key] = sizes[key]
+            reference_bytes += sizes[key]
+            while reference_bytes > max_bytes:
+                _, evicted = reference.popitem(last=False)
+                reference_bytes -= evicted
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (hits, misses)
+    assert stats['bytes'] == reference_bytes <= max_bytes
+    assert stats['entries'] == len(reference)
+
+def test_namespaces_do_not_collide():
+    cache = SharedCache()
+    assert cache.get_or_create('a', {'x': 1}, lambda: 'first') == 'first'
+    assert cache.get_or_create('b', {'x': 1}, lambda: 'second') == 'second'
+
+def test_oversized_values_are_returned_but_not_kept():
+    cache = SharedCache(max_bytes=1000)
+    value = cache.get_or_create('big', {}, lambda: np.zeros(5000, dtype=np.uint8))
+    assert len(value) == 5000
+    assert cache.stats()['entries'] == 0
+
+def test_estimate_size_of_frames_and_arrays(final_data):
+    assert estimate_size(np.zeros(1000)) == 8000
+    assert estimate_size(final_data) == final_data.memory_usage(deep=True).sum()
+
+def test_concurrent_lookups_keep_the_accounting_consistent():
+    cache = SharedCache(max_bytes=50_000)
+
+    def worker(seed):
+        rng = np.random.default_rng(seed)
+        for key in rng.integers(0, 20, size=500):
+            cache.get_or_create('arrays', int(key), lambda: np.zeros(4000, dtype=np.uint8))
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert stats['hits'] + stats['misses'] == 8 * 500
+    assert stats['bytes'] == 4000 * stats['entries'] <= 50_000
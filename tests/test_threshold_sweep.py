@@ -0,0 +1,76 @@
+"""
+THRESHOLD SWEEP TESTS
+threshold_sweep curves against scikit-learn's ROC / precision-recall curves and scores
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from threshold_sweep import (
+    confusion_curve, segment_curves, curve_metrics, metrics_at, best_threshold, segment_metrics_at
+)
+
+metrics = pytest.importorskip('sklearn.metrics')
+
+
+@pytest.fixture(params=['scored', 'tied_scores'])
+def scores_and_labels(request):
+    return request.getfixturevalue(request.param)
+
+def test_curve_matches_roc_curve(scores_and_labels):
+    scores, labels = scores_and_labels
+    fpr, tpr, thresholds = metrics.roc_curve(labels, scores, drop_intermediate=False)
+    curve = confusion_curve(scores, labels)
+
+    # Both start with an inf threshold where nobody is flagged
+    np.testing.assert_array_equal(curve['threshold'], thresholds)
+    np.testing.assert_allclose(curve['tp'] / labels.sum(), tpr)
+    np.testing.assert_allclose(curve['fp'] / (len(labels) - labels.sum()), fpr)
+    assert (curve['tp'] + curve['fp'] + curve['fn'] + curve['tn'] == len(labels)).all()
+
+def test_precision_recall_match_sklearn(scores_and_labels):
+    scores, labels = scores_and_labels
+    precision, recall, thresholds = metrics.precision_recall_curve(labels, scores)
+    curve = curve_metrics(confusion_curve(scores, labels))
+
+    for p, r, t in zip(precision, recall, thresholds):
+        row = metrics_at(curve, t)
+        assert row['precision'] == pytest.approx(p)
+        assert row['recall'] == pytest.approx(r)
+
+@pytest.mark.parametrize('threshold', [0.05, 0.14, 0.3, 0.5])
+def test_metrics_at_matches_scores_at_threshold(scored, threshold):
+    scores, labels = scored
+    predicted = (scores >= threshold).astype(int)
+    row = metrics_at(curve_metrics(confusion_curve(scores, labels), beta=2), threshold)
+
+    assert row['precision'] == pytest.approx(metrics.precision_score(labels, predicted, zero_division=0))
+    assert row['recall'] == pytest.approx(metrics.recall_score(labels, predicted, zero_division=0))
+    assert row['f_beta'] == pytest.approx(metrics.fbeta_score(labels, predicted, beta=2, zero_division=0))
+
+def test_best_threshold_is_the_brute_force_optimum(tied_scores):
+    scores, labels = tied_scores
+    best = best_threshold(curve_metrics(confusion_curve(scores, labels), beta=2))
+
+    candidates = np.unique(scores)
+    f2 = [metrics.fbeta_score(labels, (scores >= t).astype(int), beta=2, zero_division=0) for t in candidates]
+    assert best['f_beta'] == pytest.approx(max(f2))
+
+def test_segment_curves_match_per_segment_curves(tied_scores):
+    scores, labels = tied_scores
+    segments = np.random.default_rng(11).choice(['Sales', 'HR', 'Engineering'], len(scores))
+    curves = segment_curves(scores, labels, segments)
+
+    for segment, curve in curves.groupby('segment', observed=True):
+        mask = segments == segment
+        expected = confusion_curve(scores[mask], labels[mask])
+        pd.testing.assert_frame_equal(curve.drop(columns='segment').reset_index(drop=True), expected, check_dtype=False)
+
+    at = segment_metrics_at(curve_metrics(curves), 0.5)
+    for _, row in at.iterrows():
+        mask = segments == row['segment']
+        assert row['recall'] == pytest.approx(metrics.recall_score(labels[mask], (scores[mask] >= 0.5).astype(int)))
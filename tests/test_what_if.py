@@ -0,0 +1,81 @@
+"""
+WHAT-IF TESTS
+Batched scenario transitions against re-scoring a modified copy of the cohort, one scenario at a time
+
+Author: Tanya Gampert, PHR, CAPM
+"""
+
+
+import numpy as np
+import pytest
+
+import what_if
+from .conftest import APP_DIR
+from scoring import MODEL_FILE, LogitScorer, load_coefficients, performance_band, potential_band
+from what_if import N_BOXES, WhatIfSimulator, scenario_grid, scenario_summary
+
+
+@pytest.fixture(scope='module')
+def model():
+    return load_coefficients(APP_DIR / MODEL_FILE)
+
+@pytest.fixture(scope='module')
+def simulator(final_data, model):
+    scorer = LogitScorer(model)
+    return WhatIfSimulator(scorer, scorer.design_matrix(final_data), final_data['performance_rating'], model['q_low'], model['q_high'])
+
+def rescore(simulator, model, rating, rows, scenario):
+    """Transitions, predictions and mean potential from a shifted, clipped copy of the cohort"""
+    scorer = LogitScorer(model)
+    X = simulator.X[rows].copy()
+    for feature, delta in scenario.items():
+        j = scorer.features.index(feature)
+        X[:, j] = np.clip(X[:, j] + delta, simulator.lower[j], simulator.upper[j])
+    potential = scorer.score(X)
+
+    new_rating = rating[rows].astype(np.float64)
+    if 'performance_rating' in scorer.features:
+        j = scorer.features.index('performance_rating')
+        new_rating = new_rating + X[:, j] - simulator.X[rows, j]
+    before = simulator.base_codes[rows]
+    after = potential_band(potential, *simulator.cutoffs) * 3 + performance_band(new_rating)
+
+    transitions = np.zeros((N_BOXES, N_BOXES), dtype=np.int64)
+    np.add.at(transitions, (before, after), 1)
+    return transitions, int((potential >= scorer.threshold).sum()), potential.mean()
+
+@pytest.mark.parametrize('ranges', [
+    {'training_courses_completed': range(0, 4), 'certification_count': [0, 1, 2]},
+    {'performance_rating': [-1, 0, 1, 2], 'awards': [0, 1]},
+    {'kpis_achieved_pct': [-20, 0, 25, 60], 'peer_review_score': [0, 3]}
+])
+def test_simulation_matches_rescoring(final_data, model, simulator, ranges):
+    rows = np.flatnonzero(final_data['department'].isin(['Sales', 'Engineering']).to_numpy())
+    scenarios = scenario_grid(ranges)
+    result = simulator.simulate(rows, scenarios)
+
+    rating = final_data['performance_rating'].to_numpy()
+    for s, scenario in enumerate(scenarios):
+        transitions, predicted, mean_potential = rescore(simulator, model, rating, rows, scenario)
+        np.testing.assert_array_equal(result['transitions'][s], transitions)
+        assert result['predicted'][s] == predicted
+        assert result['mean_potential'][s] == pytest.approx(mean_potential)
+
+def test_zero_scenario_keeps_every_box(final_data, simulator):
+    rows = np.arange(len(final_data))
+    result = simulator.simulate(rows, [{}])
+    np.testing.assert_array_equal(np.diag(result['transitions'][0]), result['before'])
+    assert scenario_summary(result)['changed_box'].iloc[0] == 0
+
+def test_blocks_do_not_change_results(final_data, simulator, monkeypatch):
+    rows = np.arange(0, len(final_data), 3)
+    scenarios = scenario_grid({'training_courses_completed': range(0, 6), 'projects_delivered': range(0, 4)})
+    whole = simulator.simulate(rows, scenarios)
+    monkeypatch.setattr(what_if, 'BLOCK_CELLS', len(rows) * 5)
+    blocked = simulator.simulate(rows, scenarios)
+    np.testing.assert_array_equal(whole['transitions'], blocked['transitions'])
+    np.testing.assert_array_equal(whole['predicted'], blocked['predicted'])
+
+def test_unknown_feature_is_rejected(simulator):
+    with pytest.raises(ValueError):
+        simulator.delta_matrix([{'no_such_feature': 1}])